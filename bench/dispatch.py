@@ -0,0 +1,115 @@
+"""
+검색 요청 직접 호출 경로(graph/dispatch.py) 검증 / 측정
+
+  python -m bench.dispatch overhead [--rows 50] [--iterations 2000]
+    - DB 없이 검색 노드를 고정 결과(rows개 행)를 돌려주는 함수로 바꿔 LangGraph 실행과 직접 호출의 요청당 시간 비교
+  BENCH_DB_URL=... python -m bench.dispatch parity [--requests 200]
+    - bench.fakes + 벤치마크 DB로 같은 검색 요청을 workflow.ainvoke / run_search 로 각각 실행하여 결과 비교
+    - 하나라도 다르면 종료 코드 1
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _stub_nodes(rows: int):
+    from graph.chat_graph import NODES
+    result = [
+        {"id": i, "company": "회사", "title": "제목", "location": "서울시 강남구", "hourly_wage": 12000,
+         "work_days": ["토", "일"], "start_time": "09:00", "end_time": "18:00", "category": "외식/음료",
+         "gender": "무관", "age": ["20대"], "description": "설명 " * 50, "deadline": "2026-12-31", "status": "ACTIVE"}
+        for i in range(rows)
+    ]
+
+    async def search(state):
+        state.result = result
+        state.reply = f"{rows}개"
+        return state
+
+    nodes = dict(NODES)
+    nodes["sql_search"] = nodes["hybrid_search"] = search
+    return nodes
+
+
+async def overhead(rows: int, iterations: int):
+    from graph.chat_graph import ChatState, build_workflow
+    from graph.dispatch import run_search
+
+    nodes = _stub_nodes(rows)
+    graph = build_workflow(nodes)
+    payload = {"text": "", "search": True, "condition": {"place": "서울시 강남구"}}
+
+    async def timed(fn):
+        for _ in range(min(100, iterations)): # 워밍업
+            await fn(ChatState(**payload))
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await fn(ChatState(**payload))
+        return (time.perf_counter() - started) / iterations * 1e6
+
+    langgraph_us = await timed(graph.ainvoke)
+    direct_us = await timed(lambda state: run_search(state, nodes))
+    print(f"결과 {rows}행, {iterations}회")
+    print(f"LangGraph : {langgraph_us:8.1f} us/요청")
+    print(f"직접 호출 : {direct_us:8.1f} us/요청")
+    print(f"절감      : {langgraph_us - direct_us:8.1f} us/요청 ({(1 - direct_us / langgraph_us) * 100:.0f}%)")
+
+
+async def parity(requests: int, seed: int) -> bool:
+    from common_fastapi.shared.db import init_db_pool, close_db_pool
+    from bench import fakes
+    from bench.load import make_request
+    from graph.chat_graph import ChatState, workflow
+    from graph.dispatch import run_search, state_dict
+
+    fakes.install(0.0, 0.0, 0.0)
+    await init_db_pool()
+    rng = random.Random(seed)
+    mismatches = 0
+    try:
+        for i in range(requests):
+            payload = make_request(rng, rng.choice(["sql", "hybrid"]), "jhgan")
+            expected = await workflow.ainvoke(ChatState(**payload))
+            actual = state_dict(await run_search(ChatState(**payload)))
+            diff = [key for key in expected if expected.get(key) != actual.get(key)]
+            if diff:
+                mismatches += 1
+                print(f"불일치 #{i} {payload['condition']} : {diff}")
+    finally:
+        await close_db_pool()
+    print(f"{requests}건 중 불일치 {mismatches}건")
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    overhead_parser = sub.add_parser("overhead")
+    overhead_parser.add_argument("--rows", type=int, default=50)
+    overhead_parser.add_argument("--iterations", type=int, default=2000)
+    parity_parser = sub.add_parser("parity")
+    parity_parser.add_argument("--requests", type=int, default=200)
+    parity_parser.add_argument("--seed", type=int, default=42)
+    parity_parser.add_argument("--db-url", default=os.getenv("BENCH_DB_URL"))
+    args = parser.parse_args()
+
+    if args.command == "overhead":
+        asyncio.run(overhead(args.rows, args.iterations))
+        return
+    if not args.db_url:
+        parser.error("--db-url 또는 BENCH_DB_URL 필요 (운영 DB_URL은 사용하지 않음)")
+    os.environ["DB_URL"] = args.db_url
+    os.environ["SQL_CACHE_ENABLED"] = "false" # 두 경로 모두 실제로 조회하도록
+    if not asyncio.run(parity(args.requests, args.seed)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+벤치마크용 로컬 대체 클라이언트 (OpenAI API, jhgan 모델 없이 실행)
+- 결과는 입력에 대해 항상 같음 (결정적), 지연시간은 설정값만큼 sleep
+- 임베딩 : 단어마다 해시로 고정한 난수 벡터의 합 → 같은 단어를 공유하는 문장끼리 유사도가 높음
+  gen_data.py도 같은 함수로 jobs1 임베딩을 만들므로 hybrid_search 결과가 실제처럼 나옴
+- LLM : rule_extract로 조건을 뽑고 지역/추가 조건은 간단한 규칙으로 채운 JSON 응답
+
+install(...) 로 async_llm, model_registry, OpenAI 임베딩 클라이언트를 교체
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+from graph.nodes.rule_extract import extract_conditions
+
+PLACES = {
+    "강남": "서울시 강남구", "서초": "서울시 서초구", "마포": "서울시 마포구", "송파": "서울시 송파구",
+    "수원": "경기도 수원시", "성남": "경기도 성남시", "광명": "경기도 광명시", "해운대": "부산시 해운대구",
+    "대전": "대전시", "제주": "제주도",
+}
+REQUIREMENT_HINTS = ("자격증", "면허", "경험", "경력", "가능한", "우대")
+
+
+@lru_cache(maxsize=50000)
+def _word_vector(word: str, dims: int) -> np.ndarray:
+    seed = int.from_bytes(hashlib.md5(word.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(dims).astype(np.float32)
+
+
+def fake_vector(text: str, dims: int) -> np.ndarray:
+    """단어 벡터 합을 정규화한 임베딩 (같은 단어가 많을수록 코사인 유사도가 높음)"""
+    words = re.findall(r"\w+", (text or "").lower()) or [""]
+    vector = np.sum([_word_vector(word, dims) for word in words], axis=0)
+    return vector / max(float(np.linalg.norm(vector)), 1e-9)
+
+
+def fake_condition(text: str) -> Dict[str, Any]:
+    """classify_input 응답과 같은 형식의 JSON (결정적)"""
+    condition, _ = extract_conditions(text)
+    for keyword, place in PLACES.items():
+        if keyword in text:
+            condition["place"] = place
+            break
+    requirements = [part.strip() for part in re.split(r"[,.]", text) if any(h in part for h in REQUIREMENT_HINTS)]
+    if requirements:
+        condition["requirements"] = ", ".join(requirements)
+    keys = ["gender", "age", "place", "work_days", "start_time", "end_time", "hourly_wage", "category", "requirements"]
+    return {
+        "job_related": bool(condition) or any(w in text for w in ("알바", "일자리", "아르바이트")),
+        "condition": {key: condition.get(key) for key in keys},
+    }
+
+
+def _user_text(messages: List[Dict[str, Any]]) -> str:
+    content = messages[-1]["content"]
+    match = re.search(r'사용자 입력: "(.*)"', content, re.S)
+    return match.group(1) if match else content
+
+
+class _FakeCompletions:
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def create(self, model: str, messages: List[Dict[str, Any]], **kwargs):
+        await asyncio.sleep(self.latency)
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        content = json.dumps(fake_condition(_user_text(messages)), ensure_ascii=False)
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_chars // 2,
+            completion_tokens=len(content) // 2,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=len(messages[0]["content"]) // 2 if len(messages) > 1 else 0),
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+
+class FakeAsyncOpenAI:
+    """AsyncOpenAI 대체 (chat.completions.create만 사용)"""
+
+    def __init__(self, latency: float = 0.3):
+        self.chat = SimpleNamespace(completions=_FakeCompletions(latency))
+
+
+class FakeLLMClient:
+    """common_fastapi LLMClient 대체 (동기 chat)"""
+
+    def __init__(self, latency: float = 0.3):
+        self.latency = latency
+
+    def chat(self, messages: List[Dict[str, Any]]) -> str:
+        time.sleep(self.latency)
+        return json.dumps(fake_condition(_user_text(messages)), ensure_ascii=False)
+
+
+class _FakeEmbeddings:
+
+    def __init__(self, latency: float, dims: int):
+        self.latency = latency
+        self.dims = dims
+
+    def create(self, model: str, input: Union[str, List[str]]):
+        time.sleep(self.latency)
+        texts = [input] if isinstance(input, str) else list(input)
+        return SimpleNamespace(data=[
+            SimpleNamespace(embedding=fake_vector(text, self.dims).tolist(), index=i) for i, text in enumerate(texts)
+        ])
+
+
+class FakeEmbedClient:
+    """OpenAI 임베딩 클라이언트(_client_embed) 대체 (1536차원)"""
+
+    def __init__(self, latency: float = 0.05, dims: int = 1536):
+        self.embeddings = _FakeEmbeddings(latency, dims)
+
+
+class _FakeSentenceModel:
+
+    def __init__(self, latency: float, dims: int):
+        self.latency = latency
+        self.dims = dims
+
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True, show_progress_bar: bool = False):
+        time.sleep(self.latency) # 배치 1회 추론 시간
+        return np.stack([fake_vector(text, self.dims) for text in texts])
+
+
+class FakeEmbedderKo:
+    """EmbedderKo 대체 (768차원, model.encode 배치 지원)"""
+
+    def __init__(self, latency: float = 0.02, dims: int = 768):
+        self.model = _FakeSentenceModel(latency, dims)
+
+    def create_embedding(self, text: str) -> List[float]:
+        return self.model.encode([text])[0].tolist()
+
+
+def install(llm_latency: float = 0.3, embed_latency: float = 0.02, openai_embed_latency: float = 0.05):
+    """앱 싱글톤의 외부 의존 클라이언트를 대체 클라이언트로 교체"""
+    import service.embed_jobs as embed_jobs
+    import service.embedding as embedding
+    from service.llm_async import async_llm
+    from service.models import model_registry
+
+    async_llm._client = FakeAsyncOpenAI(llm_latency)
+    async_llm._sync_llm = FakeLLMClient(llm_latency)
+    model_registry._embedder_768 = FakeEmbedderKo(embed_latency)
+    embed_client = FakeEmbedClient(openai_embed_latency)
+    embedding._client_embed = embed_client
+    embed_jobs._client_embed = embed_client
@@ -0,0 +1,141 @@
+"""
+벤치마크용 합성 jobs1 데이터 생성 (운영 DB 사용 금지 - BENCH_DB_URL 또는 --db-url 로 별도 DB 지정)
+
+  python -m bench.gen_data --rows 100000 [--seed 42] [--dims 768,1536] [--reset]
+
+1) bench/schema.sql 로 category, jobs1 기본 테이블 생성 (--reset 이면 jobs1 비우고 다시 생성)
+2) 카테고리/지역/업무 단어 목록으로 행을 만들고 bench.fakes.fake_vector 로 임베딩 계산, COPY로 적재
+3) sql/*.sql 마이그레이션을 순서대로 적용 (인덱스는 적재 후에 만들어야 빠름) + 임베딩 원문 해시 채움 + ANALYZE
+같은 --seed 면 항상 같은 데이터
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench.fakes import fake_vector, _word_vector  # noqa: E402
+
+CATEGORIES = {
+    "외식/음료": (["카페 바리스타", "홀 서빙", "주방 보조", "배달 전문점 포장"], ["바리스타 자격증", "음료 제조 경험", "위생 교육 이수", "서빙 경험"]),
+    "유통/판매": (["편의점 스태프", "마트 진열", "의류 매장 판매", "물류센터 분류"], ["포스 사용 경험", "재고 관리 경험", "고객 응대 경험", "지게차 운전 가능"]),
+    "문화/여가/생활": (["수영장 안전요원", "헬스장 트레이너", "영화관 매표", "PC방 관리"], ["수영 강사 자격증", "인명구조 자격증", "생활체육지도사", "레저 강습 경험"]),
+    "IT/인터넷": (["웹 퍼블리싱", "쇼핑몰 관리", "데이터 입력", "앱 테스트"], ["파이썬 개발 경험", "HTML CSS 가능", "엑셀 능숙", "포토샵 가능"]),
+    "사무/회계": (["사무 보조", "회계 보조", "콜센터 상담", "문서 정리"], ["엑셀 가능", "전산회계 자격증", "타자 300타 이상", "상담 경력"]),
+    "운전/배달": (["배달 라이더", "택배 상하차", "학원 차량 운전", "대리 운전"], ["운전 면허증", "1종 보통 면허", "오토바이 면허", "지역 지리에 밝은 분"]),
+    "교육/강사": (["초등 수학 과외", "영어 회화 강사", "학원 조교", "방과후 코딩 강사"], ["교원 자격증", "영어 회화 가능", "과외 경험", "코딩 교육 경험"]),
+    "의료/돌봄": (["요양보호사", "병원 접수", "아이 돌봄", "반려동물 돌봄"], ["요양보호사 자격증", "간호조무사 자격증", "보육교사 자격증", "돌봄 경험"]),
+}
+LOCATIONS = [
+    "서울특별시 강남구 역삼동", "서울특별시 서초구 서초동", "서울특별시 마포구 합정동", "서울특별시 송파구 잠실동",
+    "경기도 수원시 영통구 매탄동", "경기도 성남시 분당구 정자동", "경기도 광명시 철산동", "부산광역시 해운대구 우동",
+    "대전광역시 유성구 봉명동", "제주특별자치도 제주시 연동",
+]
+COMPANIES = ["스타", "그린", "한빛", "미래", "하늘", "바다", "새봄", "누리", "다온", "가람"]
+SUFFIXES = ["상사", "마트", "카페", "센터", "학원", "병원", "물류", "스포츠"]
+SHIFTS = [("09:00", "14:00"), ("14:00", "18:00"), ("09:00", "18:00"), ("18:00", "22:00"), ("07:00", "11:00")]
+DAYS = [["월", "화", "수", "목", "금"], ["토", "일"], ["월", "수", "금"], ["화", "목"], ["월", "화", "수", "목", "금", "토"]]
+AGES = [["20대"], ["20대", "30대"], ["30대", "40대"], ["40대", "50대"], ["20대", "30대", "40대", "50대"]]
+COLUMNS = [
+    "company", "title", "location", "hourly_wage", "work_days", "start_time", "end_time", "category", "gender",
+    "age", "description", "qualifications", "deadline", "status", "created_at",
+]
+
+
+def generate_rows(rng: np.random.Generator, count: int, dims, start_time: datetime):
+    """count개 행 (dims에 포함된 차원만 임베딩 계산)"""
+    names = list(CATEGORIES)
+    rows = []
+    for i in range(count):
+        category = names[rng.integers(len(names))]
+        titles, skills = CATEGORIES[category]
+        title = titles[rng.integers(len(titles))]
+        picked = [skills[j] for j in rng.choice(len(skills), size=2, replace=False)]
+        start, end = SHIFTS[rng.integers(len(SHIFTS))]
+        company = f"{COMPANIES[rng.integers(len(COMPANIES))]}{SUFFIXES[rng.integers(len(SUFFIXES))]}"
+        description = f"{title} 업무를 함께할 분을 찾습니다. {picked[0]} 우대합니다."
+        qualifications = ", ".join(picked)
+        record = [
+            company, title, LOCATIONS[rng.integers(len(LOCATIONS))], int(rng.integers(99, 200)) * 100,
+            DAYS[rng.integers(len(DAYS))], start, end, category, ["무관", "남성", "여성"][rng.integers(3)],
+            AGES[rng.integers(len(AGES))], description, qualifications,
+            date.today() + timedelta(days=int(rng.integers(1, 60))),
+            "ACTIVE" if rng.random() < 0.9 else "CLOSED",
+            start_time - timedelta(seconds=int(rng.integers(0, 90 * 24 * 3600))),
+        ]
+        text = " ".join([company, title, description, qualifications]) # jobs1_embed_text와 같은 원문
+        for dim in dims:
+            record.append(fake_vector(text, dim))
+        rows.append(tuple(record))
+    return rows
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dims", default="768,1536", help="임베딩을 채울 차원 (예: 768 또는 768,1536)")
+    parser.add_argument("--reset", action="store_true", help="jobs1, category 삭제 후 다시 생성")
+    parser.add_argument("--db-url", default=os.getenv("BENCH_DB_URL"))
+    args = parser.parse_args()
+    if not args.db_url:
+        parser.error("--db-url 또는 BENCH_DB_URL 필요 (운영 DB_URL은 사용하지 않음)")
+
+    import asyncpg
+    from pgvector.asyncpg import register_vector
+
+    dims = [int(d) for d in args.dims.split(",") if d]
+    rng = np.random.default_rng(args.seed)
+    conn = await asyncpg.connect(args.db_url)
+    try:
+        if args.reset:
+            await conn.execute("DROP TABLE IF EXISTS public.jobs1, public.category CASCADE")
+        await conn.execute((ROOT / "bench" / "schema.sql").read_text(encoding="utf-8"))
+        await register_vector(conn)
+
+        if not await conn.fetchval("SELECT count(*) FROM public.category"):
+            await conn.executemany(
+                "INSERT INTO public.category (kind, depth, nm, seq) VALUES ('01', 1, $1, $2)",
+                [(name, seq) for seq, name in enumerate(CATEGORIES)],
+            )
+
+        for dim in dims: # 단어 벡터 캐시 미리 채움
+            for titles, skills in CATEGORIES.values():
+                for word in " ".join(titles + skills).split():
+                    _word_vector(word, dim)
+
+        columns = COLUMNS + [f"embedding{dim}" for dim in dims]
+        started = time.perf_counter()
+        now = datetime.now()
+        for offset in range(0, args.rows, args.batch):
+            rows = generate_rows(rng, min(args.batch, args.rows - offset), dims, now)
+            await conn.copy_records_to_table("jobs1", schema_name="public", records=rows, columns=columns)
+            done = offset + len(rows)
+            print(f"적재 {done}/{args.rows} ({done / (time.perf_counter() - started):.0f} rows/s)")
+
+        for path in sorted((ROOT / "sql").glob("*.sql")): # /admin/migrate 와 같은 순서
+            step = time.perf_counter()
+            await conn.execute(path.read_text(encoding="utf-8"))
+            print(f"마이그레이션 {path.name} ({time.perf_counter() - step:.1f}s)")
+        for dim in dims: # 재임베딩 대상에서 빠지도록 원문 해시 채움
+            await conn.execute(
+                f"UPDATE public.jobs1 SET embedding{dim}_hash = "
+                f"md5(public.jobs1_embed_text(company, title, description, qualifications)) "
+                f"WHERE embedding{dim} IS NOT NULL"
+            )
+        await conn.execute("ANALYZE public.jobs1")
+        print(f"완료 : {args.rows}행, {time.perf_counter() - started:.1f}s")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+"""
+/chat 그래프 부하 테스트 (프로세스 내부에서 workflow 실행, 외부 API 없이 bench.fakes 사용)
+
+  BENCH_DB_URL=postgresql://.../bench python -m bench.load --duration 30 --concurrency 16 \
+      --mix classify=0.4,sql=0.4,hybrid=0.2 --llm-latency 0.3 --out bench_result.json [--baseline base.json]
+
+- 요청 종류 : classify(search=False, 조건 추출), sql(search=True, requirements 없음), hybrid(search=True, requirements 있음)
+- workflow.astream(stream_mode="updates")로 노드가 끝날 때마다 시간을 재서 노드별 지연시간 집계 (node:이름)
+  요청 전체는 path:종류 로 집계
+- --baseline 결과보다 p95가 --max-regression 이상 느려지면 종료 코드 1 (배포 전 회귀 확인용)
+- 결과 캐시/미리 조회는 측정을 왜곡하므로 기본으로 끔 (--with-cache 로 켬)
+같은 --seed 면 같은 요청 순서 (동시 실행 순서는 달라질 수 있음)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+CLASSIFY_TEXTS = [
+    "강남에 사는 35세 남자입니다",
+    "주말 오전 알바 구해요",
+    "수원에서 시급 12000원 이상 일자리 찾아요",
+    "해운대 근처 카페 알바, 바리스타 자격증 있어요",
+    "평일 09:00-18:00 사무 보조 일자리",
+    "운전 면허증 있고 배달 경험 있어요",
+    "오늘 날씨 어때?",
+    "20대 여자, 마포 주말 알바, 포토샵 가능한 일",
+]
+SQL_CONDITIONS = [
+    {"place": "서울시 강남구"},
+    {"place": "경기도 수원시", "work_days": "토일"},
+    {"category": "외식/음료", "hourly_wage": "11000"},
+    {"place": "부산시 해운대구", "start_time": "09:00", "end_time": "14:00"},
+    {"gender": "여성", "age": "20대", "place": "서울시 마포구"},
+    {},
+]
+REQUIREMENTS = ["바리스타 자격증", "운전 면허증", "수영 강사 자격증", "엑셀 가능", "요양보호사 자격증", "영어 회화 가능"]
+
+
+def _parse_mix(text: str):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def make_request(rng: random.Random, kind: str, model: str):
+    """요청 종류별 ChatState 입력값"""
+    if kind == "classify":
+        return {"userid": f"bench{rng.randrange(1000)}", "text": rng.choice(CLASSIFY_TEXTS), "search": False}
+    condition = dict(rng.choice(SQL_CONDITIONS))
+    if kind == "hybrid":
+        condition["requirements"] = rng.choice(REQUIREMENTS)
+    return {"userid": f"bench{rng.randrange(1000)}", "text": "", "search": True, "condition": condition,
+            "embeddingModel": model, "similarityThreshold": 0.3}
+
+
+async def run(args):
+    from common_fastapi.shared.db import init_db_pool, close_db_pool
+    from bench import fakes
+    from bench.report import Recorder, format_table, compare
+    from graph.chat_graph import workflow, ChatState
+    from service.refdata import refdata
+    from service.statements import statement_registry
+
+    if not args.real_clients:
+        fakes.install(args.llm_latency, args.embed_latency, args.openai_embed_latency)
+
+    pool = await init_db_pool()
+    await refdata.load()
+    await statement_registry.warm(pool)
+
+    mix = _parse_mix(args.mix)
+    kinds, weights = list(mix), list(mix.values())
+    rng = random.Random(args.seed)
+    recorder = Recorder()
+    measuring = False
+
+    async def one(kind: str, payload):
+        state = ChatState(**payload)
+        started = previous = time.perf_counter()
+        try:
+            async for update in workflow.astream(state, stream_mode="updates"):
+                now = time.perf_counter()
+                if measuring:
+                    for node in update:
+                        recorder.add(f"node:{node}", now - previous)
+                previous = now
+            if measuring:
+                recorder.add(f"path:{kind}", time.perf_counter() - started)
+        except Exception:
+            if measuring:
+                recorder.error(f"path:{kind}")
+
+    async def worker(deadline: float):
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            await one(kind, make_request(rng, kind, args.model))
+
+    try:
+        if args.warmup > 0:
+            print(f"워밍업 {args.warmup}s ...")
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(worker(deadline) for _ in range(args.concurrency)))
+        measuring = True
+        print(f"측정 {args.duration}s (동시 {args.concurrency}, mix {mix}) ...")
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(worker(deadline) for _ in range(args.concurrency)))
+        duration = time.perf_counter() - started
+    finally:
+        await close_db_pool()
+
+    summary = recorder.summary(duration)
+    total = sum(row["count"] for name, row in summary.items() if name.startswith("path:"))
+    print(format_table(summary))
+    print(f"전체 RPS : {total / duration:.1f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "duration": duration, "summary": summary}, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        regressions = compare(summary, args.baseline, args.max_regression)
+        for line in regressions:
+            print(f"회귀 : {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default="classify=0.4,sql=0.4,hybrid=0.2")
+    parser.add_argument("--model", default="jhgan", choices=["jhgan", "openai"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="jhgan 배치 1회 추론 시간(초)")
+    parser.add_argument("--openai-embed-latency", type=float, default=0.05)
+    parser.add_argument("--real-clients", action="store_true", help="대체 클라이언트 대신 실제 OpenAI/jhgan 사용")
+    parser.add_argument("--with-cache", action="store_true", help="sql 결과 캐시, 쿼리 임베딩 캐시 사용")
+    parser.add_argument("--db-url", default=os.getenv("BENCH_DB_URL"))
+    parser.add_argument("--out")
+    parser.add_argument("--baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+    if not args.db_url:
+        parser.error("--db-url 또는 BENCH_DB_URL 필요 (운영 DB_URL은 사용하지 않음)")
+
+    # 설정 모듈을 import 하기 전에 환경 변수 지정 (service.config는 import 시점에 읽음)
+    os.environ["DB_URL"] = args.db_url
+    if not args.with_cache:
+        os.environ["SQL_CACHE_ENABLED"] = "false"
+        os.environ["EMBED_CACHE_TTL"] = "0.000001"  # 즉시 만료 (0은 만료 없음)
+        os.environ["EMBED_CACHE_DISK_PATH"] = ""
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
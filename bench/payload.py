@@ -0,0 +1,69 @@
+"""
+검색 결과 응답 크기 / 직렬화 시간 비교 (DB 없이)
+
+  python -m bench.payload [--rows 50] [--description-chars 600] [--iterations 2000]
+    - 전체 필드 행(description 전체, status) + jsonable_encoder + json.dumps (기존 /chat 응답 경로)
+    - 카드 필드 행(graph/nodes/job_card.py, RESULT_DESCRIPTION_CHARS) + service.json_response.dumps
+    - 응답 bytes와 요청당 직렬화 시간 출력
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _rows(rows: int, description_chars: int):
+    description = ("주말 오전 매장 관리와 고객 응대를 함께할 분을 찾습니다. " * 40)[:description_chars]
+    return [
+        {"id": i, "company": "회사", "title": "카페 바리스타 구합니다", "location": "서울시 강남구 역삼동", "hourly_wage": 12000,
+         "work_days": ["토", "일"], "start_time": "09:00", "end_time": "18:00", "category": "외식/음료",
+         "gender": "무관", "age": ["20대", "30대"], "description": description, "deadline": date(2026, 12, 31),
+         "status": "ACTIVE", "similarity": 0.5123}
+        for i in range(rows)
+    ]
+
+
+def _timed(fn, iterations: int) -> float:
+    for _ in range(min(100, iterations)): # 워밍업
+        fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--description-chars", type=int, default=600)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from graph.nodes.job_card import row_to_card
+    from service.config import settings
+    from service.json_response import dumps, orjson
+
+    rows = _rows(args.rows, args.description_chars)
+    full = [{**row, "deadline": row["deadline"].isoformat()} for row in rows]
+    cards = [row_to_card(row, row["similarity"]) for row in rows]
+
+    def before():
+        return json.dumps(jsonable_encoder({"result": full}), ensure_ascii=False).encode("utf-8")
+
+    def after():
+        return dumps({"result": [row_to_card(row, row["similarity"]) for row in rows]})
+
+    print(f"결과 {args.rows}행, description {args.description_chars}자 → 카드 {settings.RESULT_DESCRIPTION_CHARS}자, "
+          f"{'orjson' if orjson is not None else 'json'}")
+    print(f"기존 : {len(before()):8d} bytes {_timed(before, args.iterations):8.1f} us/요청")
+    print(f"카드 : {len(dumps({'result': cards})):8d} bytes {_timed(after, args.iterations):8.1f} us/요청")
+
+
+if __name__ == "__main__":
+    main()
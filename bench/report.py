@@ -0,0 +1,65 @@
+"""
+벤치마크 결과 집계 : 구간(노드/경로)별 RPS, p50/p95/p99 와 기준 결과 대비 회귀 검사
+"""
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class Recorder:
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)  # 이름 -> 지연시간(초) 목록
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def add(self, name: str, seconds: float):
+        self.samples[name].append(seconds)
+
+    def error(self, name: str):
+        self.errors[name] += 1
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        rows = {}
+        for name in sorted(self.samples):
+            values = np.array(self.samples[name]) * 1000
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            rows[name] = {
+                "count": len(values),
+                "rps": round(len(values) / duration, 2) if duration else 0.0,
+                "mean_ms": round(float(values.mean()), 2),
+                "p50_ms": round(float(p50), 2),
+                "p95_ms": round(float(p95), 2),
+                "p99_ms": round(float(p99), 2),
+                "errors": self.errors.get(name, 0),
+            }
+        return rows
+
+
+def format_table(summary: Dict[str, Any]) -> str:
+    header = f"{'name':<28}{'count':>8}{'rps':>9}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>6}"
+    lines = [header, "-" * len(header)]
+    for name, row in summary.items():
+        lines.append(
+            f"{name:<28}{row['count']:>8}{row['rps']:>9.1f}{row['mean_ms']:>9.1f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['errors']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def compare(summary: Dict[str, Any], baseline_path: str, max_regression: float, min_ms: float = 1.0) -> List[str]:
+    """
+    기준 결과(JSON)보다 p95가 max_regression 비율 이상 느려진 항목 목록
+    (기준 p95가 min_ms 미만인 구간은 측정 오차가 커서 제외)
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["summary"]
+    regressions = []
+    for name, row in summary.items():
+        base: Optional[Dict[str, Any]] = baseline.get(name)
+        if not base or base["p95_ms"] < min_ms:
+            continue
+        if row["p95_ms"] > base["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {row['p95_ms']}ms")
+    return regressions
@@ -0,0 +1,120 @@
+"""
+하이브리드 검색 prefilter 모드(구조화 조건 후보 + NumPy 유사도), 벡터 인덱스 복제본(VECTOR_REPLICA) 검증 / 측정
+
+  python -m bench.rerank speed [--candidates 500] [--dims 768] [--iterations 200]
+    - DB 없이 vector_send 형식의 후보 벡터를 만들어 service.vector_rerank.rank 처리 시간 측정
+  BENCH_DB_URL=... python -m bench.rerank parity [--requests 200]
+    - bench.fakes + 벤치마크 DB로 같은 요청을 HYBRID_PREFILTER 켬/끔(exact)으로 실행하여 결과 id 순서 비교
+    - 임계값 경계에서 유사도 끝자리 차이로 생기는 불일치는 따로 집계 (그 외 불일치가 있으면 종료 코드 1)
+  BENCH_DB_URL=... python -m bench.rerank parity --mode replica [--replica-dtype float16]
+    - 복제본(임시 디렉터리에 스냅샷 생성) 검색과 exact 검색 비교 (float16은 경계 허용 오차를 1e-3으로)
+"""
+import argparse
+import asyncio
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+BOUNDARY_EPSILON = 1e-5
+
+
+def speed(candidates: int, dims: int, iterations: int):
+    import numpy as np
+    from service import vector_rerank
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((candidates, dims)).astype(">f4")
+    header = struct.pack(">hh", dims, 0)
+    rows = [{"id": i, "title": "제목", "vector": header + vectors[i].tobytes()} for i in range(candidates)]
+    query = rng.standard_normal(dims).astype(np.float32).tolist()
+
+    vector_rerank.rank(rows, query, dims, 0.0, 51)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        vector_rerank.rank(rows, query, dims, 0.0, 51)
+    elapsed = (time.perf_counter() - started) / iterations
+    print(f"후보 {candidates}개 x {dims}차원 : {elapsed * 1000:.2f} ms/요청")
+
+
+async def parity(requests: int, seed: int, mode: str, epsilon: float) -> bool:
+    from common_fastapi.shared.db import init_db_pool, close_db_pool
+    from bench import fakes
+    from bench.load import make_request
+    from graph.chat_graph import ChatState
+    from graph.nodes.hybrid_search import hybrid_search
+    from service.config import settings
+    from service.vector_replica import vector_replica
+
+    fakes.install(0.0, 0.0, 0.0)
+    await init_db_pool()
+    if mode == "replica":
+        await vector_replica.rebuild()
+    rng = random.Random(seed)
+    mismatches = boundary = 0
+    try:
+        for i in range(requests):
+            payload = make_request(rng, "hybrid", "jhgan")
+            payload["withCount"] = True
+            settings.HYBRID_PREFILTER = False
+            replicas, vector_replica.replicas = vector_replica.replicas, {}
+            expected = await hybrid_search(ChatState(**payload))
+            vector_replica.replicas = replicas
+            settings.HYBRID_PREFILTER = mode == "prefilter"
+            actual = await hybrid_search(ChatState(**payload))
+            if [row["id"] for row in expected.result] == [row["id"] for row in actual.result]:
+                continue
+            similarities = [row["similarity"] for row in expected.result + actual.result]
+            threshold = payload["similarityThreshold"]
+            if any(abs(s - threshold) < epsilon for s in similarities):
+                boundary += 1
+                continue
+            mismatches += 1
+            print(f"불일치 #{i} {payload['condition']}")
+    finally:
+        await close_db_pool()
+    print(f"{requests}건 중 불일치 {mismatches}건 (임계값 경계 {boundary}건)")
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    speed_parser = sub.add_parser("speed")
+    speed_parser.add_argument("--candidates", type=int, default=500)
+    speed_parser.add_argument("--dims", type=int, default=768)
+    speed_parser.add_argument("--iterations", type=int, default=200)
+    parity_parser = sub.add_parser("parity")
+    parity_parser.add_argument("--requests", type=int, default=200)
+    parity_parser.add_argument("--seed", type=int, default=42)
+    parity_parser.add_argument("--db-url", default=os.getenv("BENCH_DB_URL"))
+    parity_parser.add_argument("--mode", default="prefilter", choices=["prefilter", "replica"])
+    parity_parser.add_argument("--replica-dtype", default="float16", choices=["float16", "float32"])
+    args = parser.parse_args()
+
+    if args.command == "speed":
+        speed(args.candidates, args.dims, args.iterations)
+        return
+    if not args.db_url:
+        parser.error("--db-url 또는 BENCH_DB_URL 필요 (운영 DB_URL은 사용하지 않음)")
+    os.environ["DB_URL"] = args.db_url
+    os.environ["HYBRID_SEARCH_MODE"] = "exact"
+    os.environ["VECTOR_STORAGE"] = "vector"
+    epsilon = BOUNDARY_EPSILON
+    if args.mode == "replica":
+        os.environ["VECTOR_REPLICA"] = "embedding768"
+        os.environ["VECTOR_REPLICA_PATH"] = tempfile.mkdtemp(prefix="vector_replica_")
+        os.environ["VECTOR_REPLICA_DTYPE"] = args.replica_dtype
+        epsilon = 1e-3 if args.replica_dtype == "float16" else BOUNDARY_EPSILON
+    if not asyncio.run(parity(args.requests, args.seed, args.mode, epsilon)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+-- 벤치마크용 기본 테이블 (운영 DB가 아닌 별도 DB에서만 사용)
+-- 이 저장소의 sql/ 마이그레이션이 전제하는 jobs1, category 컬럼만 정의 : 나머지 컬럼/인덱스/트리거는 gen_data.py가 sql/*.sql을 적용해서 만듦
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE TABLE IF NOT EXISTS public.category (
+    id serial PRIMARY KEY,
+    kind varchar(2) NOT NULL,
+    depth int NOT NULL,
+    nm varchar(50) NOT NULL,
+    seq int NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS public.jobs1 (
+    id serial PRIMARY KEY,
+    company varchar(100),
+    title varchar(200),
+    location varchar(200),
+    hourly_wage int,
+    work_days varchar[],
+    start_time varchar(5),
+    end_time varchar(5),
+    category varchar(50),
+    gender varchar(10),
+    age varchar[],
+    description text,
+    qualifications text,
+    deadline date,
+    status varchar(20) NOT NULL DEFAULT 'ACTIVE',
+    created_at timestamp NOT NULL DEFAULT now(),
+    embedding768 vector(768),
+    embedding1536 vector(1536)
+);
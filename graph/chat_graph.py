@@ -7,6 +7,7 @@ from graph.nodes.classify_input import classify_input
 from graph.nodes.decide_search_type import decide_search_type
 from graph.nodes.sql_search import sql_search
 from graph.nodes.hybrid_search import hybrid_search
+from service.metrics import timed_node
 
 DEFAULT_CONDITION = {
     "gender": None,
@@ -27,38 +28,58 @@ class ChatState(BaseModel):
     search: bool = False
     embeddingModel: Optional[str] = "jhgan"  # "jhgan" (768) or "openai" (1536)
     similarityThreshold: Optional[float] = 0.4  # 벡터 유사도 임계값
+    cursor: Optional[str] = None  # 검색 결과 다음 페이지 커서 (이전 응답의 next_cursor)
+    pageSize: Optional[int] = None  # 검색 결과 페이지 크기 (없으면 PAGE_SIZE_DEFAULT)
+    withCount: bool = False  # 예상 전체 건수(EXPLAIN 기반) 포함 여부
     job_related: Optional[bool] = None
     result: Optional[List[Dict[str, Any]]] = []
     reply: Optional[str] = None
+    nextCursor: Optional[str] = None  # 다음 페이지가 없으면 None
+    totalEstimate: Optional[int] = None
 
-graph = StateGraph(ChatState)
+# 노드마다 처리 시간/처리 중 수/예외 수 메트릭 기록 (service/metrics.py)
+NODES = {
+    "check_search": timed_node("check_search", check_search),
+    "classify_input": timed_node("classify_input", classify_input),
+    "decide_search_type": timed_node("decide_search_type", decide_search_type),
+    "sql_search": timed_node("sql_search", sql_search),
+    "hybrid_search": timed_node("hybrid_search", hybrid_search),
+}
+
+# 분기 조건 (graph/dispatch.py의 직접 호출 경로와 공유)
+def route_check_search(s):
+    return "decide_search_type" if s.search else "classify_input"
+
+def route_search_type(s):
+    return "hybrid_search" if s.condition.get("requirements") else "sql_search"
+
+def build_workflow(nodes=NODES):
+    graph = StateGraph(ChatState)
+    for name, node in nodes.items():
+        graph.add_node(name, node)
 
-graph.add_node("check_search", check_search)
-graph.add_node("classify_input", classify_input)
-graph.add_node("decide_search_type", decide_search_type)
-graph.add_node("sql_search", sql_search)
-graph.add_node("hybrid_search", hybrid_search)
+    # 분기 트리 : 사용자의 선택에 따라 아래와 같이 분기처리됨
+    # 1) check_search (false) > classify_input (일자리 관련이면 LLM으로 조건 추출) > END
+    #    check_search (false) > classify_input (일자리 관련 아니면) > END (일자리 관련 채팅하라고 안내)
+    # 2) check_search (true) > decide_search_type (requirements 없으면) > sql_search > END
+    #    check_search (true) > decide_search_type (requirements 있으면) > hybrid_search > END (일반sql검색+vector검색)
 
-# 분기 트리 : 사용자의 선택에 따라 아래와 같이 분기처리됨
-# 1) check_search (false) > classify_input (일자리 관련이면 LLM으로 조건 추출) > END
-#    check_search (false) > classify_input (일자리 관련 아니면) > END (일자리 관련 채팅하라고 안내)
-# 2) check_search (true) > decide_search_type (requirements 없으면) > sql_search > END
-#    check_search (true) > decide_search_type (requirements 있으면) > hybrid_search > END (일반sql검색+vector검색)
+    graph.set_entry_point("check_search")
 
-graph.set_entry_point("check_search")
+    graph.add_conditional_edges("check_search",
+        route_check_search,
+        {"decide_search_type": "decide_search_type", "classify_input": "classify_input"},
+    )
 
-graph.add_conditional_edges("check_search",
-    lambda s: "decide_search_type" if s.search else "classify_input",
-    {"decide_search_type": "decide_search_type", "classify_input": "classify_input"},
-)
+    graph.add_conditional_edges("decide_search_type",
+        route_search_type,
+        {"hybrid_search": "hybrid_search", "sql_search": "sql_search"},
+    )
 
-graph.add_conditional_edges("decide_search_type",
-    lambda s: "hybrid_search" if s.condition.get("requirements") else "sql_search",
-    {"hybrid_search": "hybrid_search", "sql_search": "sql_search"},
-)
+    graph.add_edge("classify_input", END) # classify_input에서 바로 END (조건 추출까지 완료)
+    graph.add_edge("hybrid_search", END)
+    graph.add_edge("sql_search", END)
 
-graph.add_edge("classify_input", END) # classify_input에서 바로 END (조건 추출까지 완료)
-graph.add_edge("hybrid_search", END)
-graph.add_edge("sql_search", END)
+    return graph.compile()
 
-workflow = graph.compile()
+workflow = build_workflow()
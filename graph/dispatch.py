@@ -0,0 +1,38 @@
+"""
+검색 요청 직접 호출 경로 (LangGraph 런타임 생략)
+- search=True 경로의 check_search, decide_search_type은 상태를 바꾸지 않는 노드인데
+  LangGraph로 실행하면 노드 경계마다 ChatState(검색 결과 행 포함) 검증/복사가 일어남
+- 같은 분기 함수(route_check_search, route_search_type)와 같은 노드(메트릭 래퍼 포함)를 순서대로 직접 호출
+- 조건 추출(search=False) 경로는 그대로 workflow.ainvoke 사용
+- 결과 일치 확인과 절감 시간 측정 : python -m bench.dispatch
+"""
+import inspect
+from typing import Any, Dict
+from service.config import settings
+from graph.chat_graph import ChatState, NODES, workflow, route_check_search, route_search_type
+
+
+async def _call(node, state):
+    result = node(state)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def run_search(state: ChatState, nodes=NODES) -> ChatState:
+    """check_search > decide_search_type > sql_search/hybrid_search 를 직접 호출 (state를 그대로 수정)"""
+    state = await _call(nodes["check_search"], state)
+    state = await _call(nodes["decide_search_type"], state)
+    return await _call(nodes[route_search_type(state)], state)
+
+
+def state_dict(state: ChatState) -> Dict[str, Any]:
+    """workflow.ainvoke 결과와 같은 형태 (필드 이름 -> 값, 복사 없음)"""
+    return {name: getattr(state, name) for name in ChatState.model_fields}
+
+
+async def run_chat(state: ChatState) -> Dict[str, Any]:
+    """/chat 실행 : 검색 요청은 직접 호출(GRAPH_DIRECT_DISPATCH), 나머지는 LangGraph"""
+    if settings.GRAPH_DIRECT_DISPATCH and route_check_search(state) == "decide_search_type":
+        return state_dict(await run_search(state))
+    return await workflow.ainvoke(state)
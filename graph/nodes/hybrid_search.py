@@ -1,147 +1,507 @@
-from common_fastapi.shared.db import get_db_connection
+import asyncio
 from common_fastapi.shared.logger import logger
-from common_fastapi.ai.embed_jhgan import EmbedderKo
-from common_fastapi.ai.embed_openai import _client_embed
-from .search_conditions import validate_time_conditions, build_where_conditions
+from service.config import settings
+from service.metrics import db_connection, stage_timer
+from service.embedding import embed_query, EMBEDDING_FIELDS
+from service import vector_rerank
+from service.vector_replica import vector_replica
+from service.statements import statement_registry
+from .search_conditions import (
+    validate_time_conditions, build_where_conditions, condition_shape, shape_label, HOT_CONDITIONS
+)
+from .pagination import page_size, decode_cursor, encode_cursor, split_page, estimate_count
+from .job_card import card_columns, row_to_card
 
-# 768차원 임베딩 모델 (jhgan/ko-sroberta-multitask)
-embedder_768 = None
-# 1536차원 임베딩 모델 (OpenAI text-embedding-3-small)
-# _client_embed는 common_fastapi에서 가져옴
 
-def get_embedder_768():
-    """768차원 임베딩 모델 싱글톤"""
-    global embedder_768
-    if embedder_768 is None:
-        embedder_768 = EmbedderKo()
-    return embedder_768
+SET_LOCAL_SQL = "SELECT set_config($1, $2, true)"
+EF_SEARCH_MAX = 1000  # pgvector hnsw.ef_search 최대값
+REPLICA_HIT_SLACK = 10  # 복제본 반영이 늦어 이미 ACTIVE가 아닌 행을 빼도 페이지가 차도록 더 뽑는 수
 
+# 복제본(service/vector_replica.py)이 고른 id의 행 조회 (점수 계산 없이 기본 키 조회만)
+ROWS_BY_ID_SQL = f"""
+    SELECT {card_columns()}
+      FROM public.jobs1
+     WHERE id = ANY($1::bigint[]) AND status = 'ACTIVE'
+"""
 
-async def hybrid_search(state):
+
+def _exact_query(embedding_field, condition, after=None):
     """
-    하이브리드 검색: 일반 SQL 검색 + 벡터 유사도 검색
-    - requirements 필드를 벡터 임베딩하여 유사도 검색
-    - sql_search의 WHERE 조건을 재사용하고, 벡터 검색 조건을 추가
+    exact 모드 : 조건에 맞는 모든 ACTIVE 행의 거리를 계산
+    파라미터 : $1 임베딩 벡터, $2 유사도 임계값, $3 조회 건수(LIMIT), $4~ 공통 WHERE 조건, 마지막에 키셋 커서
+    """
+    query = f"""
+        SELECT {card_columns()},
+               1 - ({embedding_field} <=> $1::vector) AS similarity
+          FROM public.jobs1
+         WHERE status = 'ACTIVE'
+    """
+
+    # 공통 WHERE 조건 생성 (초기 param_count는 3, 임베딩 벡터 $1, 임계값 $2, LIMIT $3)
+    where_clause, condition_params, param_count = build_where_conditions(condition, initial_param_count=3)
+    query += where_clause
+
+    # 9. 벡터 유사도 조건 (임계값)
+    query += f" AND (1 - ({embedding_field} <=> $1::vector)) >= $2"
+
+    # 키셋 커서 : 이전 페이지 마지막 행 (similarity, id) 다음부터
+    if after is not None:
+        query += f" AND (1 - ({embedding_field} <=> $1::vector), id) < (${param_count + 1}::float8, ${param_count + 2})"
+        condition_params += [after[0], after[1]]
+
+    # 유사도 높은 순 정렬 (동일 유사도는 id 역순)
+    query += " ORDER BY similarity DESC, id DESC LIMIT $3"
+    return query, condition_params
+
+
+def _count_query(embedding_field, condition):
+    """예상 건수 조회용 : $1 임베딩 벡터, $2 유사도 임계값, $3~ 공통 WHERE 조건"""
+    where_clause, condition_params, _ = build_where_conditions(condition, initial_param_count=2)
+    query = f"""
+        SELECT id FROM public.jobs1
+         WHERE status = 'ACTIVE'{where_clause}
+           AND (1 - ({embedding_field} <=> $1::vector)) >= $2
+    """
+    return query, condition_params
+
+
+def _coarse_distance(embedding_field, storage):
+    """
+    1단계 후보 추출 거리 식 (VECTOR_STORAGE별 HNSW 인덱스 컬럼 - sql/004, sql/008)
+    - vector : 원본 (코사인), halfvec : float16 사본 (코사인), bit : 이진 양자화 사본 (해밍)
+    """
+    dims = embedding_field.replace("embedding", "")
+    if storage == "halfvec":
+        return f"{embedding_field}_half <=> $1::vector::halfvec({dims})"
+    if storage == "bit":
+        return f"{embedding_field}_bit <~> binary_quantize($1::vector)::bit({dims})"
+    return f"{embedding_field} <=> $1::vector"
+
+
+def _ann_query(embedding_field, condition, after=None, storage="vector"):
+    """
+    ann 모드 : 1단계에서 HNSW 인덱스로 가까운 후보 K개를 뽑고 (ORDER BY 거리 LIMIT K)
+    2단계에서 후보에만 공통 WHERE 조건과 임계값을 적용
+    양자화 저장(halfvec, bit)이면 1단계는 사본 인덱스로 후보만 뽑고, 2단계에서 원본 벡터로 유사도를 다시 계산(rerank)
+    파라미터 : $1 임베딩 벡터, $2 유사도 임계값, $3 후보 수 K, $4 조회 건수(LIMIT), $5~ 공통 WHERE 조건, 마지막에 키셋 커서
+    """
+    distance = _coarse_distance(embedding_field, storage)
+    if storage == "vector": # 1단계 거리가 곧 정확한 거리
+        candidate_columns, similarity = f"id, {distance} AS distance", "1 - c.distance"
+    else:
+        candidate_columns, similarity = "id", f"1 - (j.{embedding_field} <=> $1::vector)"
+    query = f"""
+        WITH candidates AS MATERIALIZED (
+            SELECT {candidate_columns}
+              FROM public.jobs1
+             WHERE status = 'ACTIVE'
+             ORDER BY {distance}
+             LIMIT $3
+        )
+        SELECT {card_columns("j.id")},
+               {similarity} AS similarity,
+               (SELECT count(*) FROM candidates) AS candidate_count
+          FROM candidates c
+          JOIN public.jobs1 j ON j.id = c.id
+         WHERE {similarity} >= $2
+    """
+
+    where_clause, condition_params, param_count = build_where_conditions(condition, initial_param_count=4)
+    query += where_clause
+    if after is not None:
+        query += f" AND ({similarity}, j.id) < (${param_count + 1}::float8, ${param_count + 2})"
+        condition_params += [after[0], after[1]]
+    query += " ORDER BY similarity DESC, j.id DESC LIMIT $4"
+    return query, condition_params
+
+
+def _prefilter_query(embedding_field, condition):
+    """
+    prefilter 모드 : 구조화 조건만으로 후보 행과 원본 벡터(vector_send 바이너리)를 조회
+    유사도 계산/임계값/정렬은 service.vector_rerank에서 처리 (임베딩 생성과 동시에 조회)
+    파라미터 : $1 최대 후보 수 + 1 (LIMIT, 넘치면 pgvector 검색으로 전환), $2~ 공통 WHERE 조건
+    """
+    where_clause, condition_params, _ = build_where_conditions(condition, initial_param_count=1)
+    query = f"""
+        SELECT {card_columns()},
+               vector_send({embedding_field}) AS vector
+          FROM public.jobs1
+         WHERE status = 'ACTIVE' AND {embedding_field} IS NOT NULL{where_clause}
+         LIMIT $1
+    """
+    return query, condition_params
+
+
+def _use_ann():
+    """양자화 저장 모드는 사본 인덱스를 써야 의미가 있으므로 항상 2단계(ann) 검색"""
+    return settings.HYBRID_SEARCH_MODE == "ann" or settings.VECTOR_STORAGE != "vector"
+
+
+def _max_candidates():
+    """
+    인덱스가 실제로 돌려줄 수 있는 후보 수 상한
+    iterative scan이 없으면 HNSW 인덱스 스캔은 ef_search개 정도까지만 반환하므로 ef_search 최대값으로 제한
+    """
+    if settings.HNSW_ITERATIVE_SCAN:
+        return settings.ANN_MAX_CANDIDATES
+    return min(settings.ANN_MAX_CANDIDATES, EF_SEARCH_MAX)
+
+
+def _ann_mode():
+    return "ann" if settings.VECTOR_STORAGE == "vector" else f"ann_{settings.VECTOR_STORAGE}"
+
+
+def _statement_name(mode, embedding_field, condition, after=None):
+    """문장 캐시 통계용 쿼리 형태 이름 (임계값은 파라미터이므로 형태에 포함되지 않음)"""
+    return f"hybrid_{mode}:{embedding_field}:{shape_label(condition_shape(condition))}" + (":next" if after is not None else "")
+
+
+async def _fetch_exact(conn, embedding_field, condition, embedding, similarity_threshold, limit, after):
+    query, condition_params = _exact_query(embedding_field, condition, after)
+    return await statement_registry.fetch(
+        conn, _statement_name("exact", embedding_field, condition, after),
+        query, embedding, similarity_threshold, limit, *condition_params
+    )
+
+
+async def _fetch_ann(conn, embedding_field, condition, embedding, similarity_threshold, limit, after):
+    """후보 K개로 결과가 부족하면 K를 늘려서 다시 조회 (최대 _max_candidates())"""
+    storage = settings.VECTOR_STORAGE
+    query, condition_params = _ann_query(embedding_field, condition, after, storage)
+    name = _statement_name(_ann_mode(), embedding_field, condition, after)
+    max_k = _max_candidates()
+    k = min(settings.ANN_CANDIDATES, max_k)
+    if storage != "vector": # 양자화 거리로 뽑은 후보는 순위가 조금 틀리므로 더 많이 뽑아서 rerank (인덱스 상한 안에서)
+        k = min(settings.ANN_CANDIDATES * settings.VECTOR_RERANK_FACTOR, max_k)
+    while True:
+        async with conn.transaction(): # set_config(..., true)는 SET LOCAL과 같이 트랜잭션 안에서만 유효
+            # 값을 파라미터로 넘겨 K가 달라도 같은 문장 사용
+            ef_search = min(EF_SEARCH_MAX, max(settings.HNSW_EF_SEARCH, k))
+            await conn.execute(SET_LOCAL_SQL, "hnsw.ef_search", str(ef_search))
+            if settings.HNSW_ITERATIVE_SCAN: # pgvector 0.8 이상 : 필터로 후보가 줄어도 인덱스를 계속 탐색
+                await conn.execute(SET_LOCAL_SQL, "hnsw.iterative_scan", settings.HNSW_ITERATIVE_SCAN)
+            rows = await statement_registry.fetch(
+                conn, name, query, embedding, similarity_threshold, k, limit, *condition_params
+            )
+
+        # 후보가 K개 미만이면 더 넓혀도 같은 결과 - iterative scan일 때만 확실함
+        # (그 외에는 인덱스가 ef_search 안에서 ACTIVE가 아닌 행을 걸러 K개보다 적게 줄 수 있으므로 K를 끝까지 늘림)
+        exhausted = (
+            bool(settings.HNSW_ITERATIVE_SCAN) and bool(rows) and rows[0]["candidate_count"] < min(k, ef_search)
+        )
+        if len(rows) >= limit or exhausted or k >= max_k:
+            logger.info(f"[hybrid_search] ann 후보 K={k}, 결과 {len(rows)}개")
+            return rows
+        k = min(k * 4, max_k)
+
+
+def _use_prefilter(condition):
+    """구조화 조건이 하나도 없으면 후보가 전체 테이블이므로 예상 건수를 볼 필요 없이 pgvector 검색"""
+    return settings.HYBRID_PREFILTER and bool(condition_shape(condition))
+
+
+async def _fetch_prefilter_candidates(conn, embedding_field, condition):
+    """
+    구조화 조건 후보 조회 (임베딩 생성과 동시에 실행)
+    EXPLAIN 예상 건수가 HYBRID_PREFILTER_MAX_CANDIDATES 이하일 때만 조회하고,
+    실제 건수가 넘치면(통계가 틀린 경우) None - 호출한 쪽에서 pgvector 검색으로 전환
+    """
+    max_candidates = settings.HYBRID_PREFILTER_MAX_CANDIDATES
+    query, condition_params = _prefilter_query(embedding_field, condition)
+    estimate = await estimate_count(conn, query, [max_candidates + 1] + condition_params)
+    if estimate is None or estimate > max_candidates:
+        logger.info(f"[hybrid_search] prefilter 생략 - 예상 후보 {estimate}개")
+        return None
+    rows = await statement_registry.fetch(
+        conn, _statement_name("prefilter", embedding_field, condition), query, max_candidates + 1, *condition_params
+    )
+    if len(rows) > max_candidates:
+        logger.info(f"[hybrid_search] prefilter 후보 초과 (예상 {estimate}개) - pgvector 검색으로 전환")
+        return None
+    return rows
+
+
+def _register_hot_statements():
+    """자주 쓰이는 쿼리 형태 등록 (기본 임베딩 모델 jhgan, 현재 검색 모드 기준으로 LIMIT 0 실행)"""
+    embedding_field, zero_vector = "embedding768", [0.0] * 768
+    for condition in HOT_CONDITIONS:
+        if _use_ann():
+            query, condition_params = _ann_query(embedding_field, condition, storage=settings.VECTOR_STORAGE)
+            statement_registry.register(
+                _statement_name(_ann_mode(), embedding_field, condition), query, zero_vector, 0.0, 0, 0, *condition_params
+            )
+        else:
+            query, condition_params = _exact_query(embedding_field, condition)
+            statement_registry.register(
+                _statement_name("exact", embedding_field, condition), query, zero_vector, 0.0, 0, *condition_params
+            )
+        if settings.HYBRID_PREFILTER and condition_shape(condition):
+            query, condition_params = _prefilter_query(embedding_field, condition)
+            statement_registry.register(
+                _statement_name("prefilter", embedding_field, condition), query, 0, *condition_params
+            )
+
+
+_register_hot_statements()
+
+if (settings.VECTOR_STORAGE != "vector" and not settings.HNSW_ITERATIVE_SCAN
+        and settings.ANN_CANDIDATES * settings.VECTOR_RERANK_FACTOR > EF_SEARCH_MAX):
+    logger.warning(
+        f"[hybrid_search] VECTOR_STORAGE={settings.VECTOR_STORAGE} : HNSW_ITERATIVE_SCAN 없이는 후보가 "
+        f"{EF_SEARCH_MAX}개로 제한됨 (ANN_CANDIDATES x VECTOR_RERANK_FACTOR = "
+        f"{settings.ANN_CANDIDATES * settings.VECTOR_RERANK_FACTOR}) - pgvector 0.8 이상이면 HNSW_ITERATIVE_SCAN 설정 권장"
+    )
+
+
+def _set_result(state, results, next_cursor=None, total_estimate=None):
+    """상태 업데이트 및 응답 메시지 생성"""
+    state.result = results
+    state.nextCursor = next_cursor
+    state.totalEstimate = total_estimate
+    if len(results) > 0:
+        state.reply = f"하이브리드 검색 결과: {len(results)}개의 일자리를 찾았습니다."
+    else:
+        state.reply = "조건에 맞는 일자리를 찾지 못했습니다. 조건을 완화해보시겠어요?"
+    return state
+
+
+def _plan(state):
+    """
+    검색 조건 검증, 페이지 정보 준비 (임베딩 생성 전 단계)
+    Returns: (plan, error_msg) - 오류면 plan은 None
     """
-    logger.info(f"[hybrid_search] 시작")
-    
     condition = state.condition
     requirements = condition.get("requirements")
-    
+
     # requirements가 없으면 일반 SQL 검색과 동일
     if not requirements or not requirements.strip():
         logger.warning("[hybrid_search] requirements 없음 - 일반 SQL 검색으로 대체")
-        state.result = []
-        state.reply = "추가 조건(requirements)이 없어 하이브리드 검색을 수행할 수 없습니다."
-        return state
-    
+        return None, "추가 조건(requirements)이 없어 하이브리드 검색을 수행할 수 없습니다."
+
     # start_time과 end_time 검증
     is_valid, error_msg = validate_time_conditions(condition)
     if not is_valid:
         logger.error(f"[hybrid_search] {error_msg}")
-        state.result = []
-        state.reply = error_msg
-        return state
-    
+        return None, error_msg
+
+    try:
+        after = decode_cursor(getattr(state, "cursor", None), "hybrid")
+    except ValueError as e:
+        return None, str(e)
+
     # 임베딩 모델 선택
     embedding_model = state.embeddingModel or "jhgan"
     similarity_threshold = state.similarityThreshold or 0.4
-    
-    logger.info(f"[hybrid_search] embedding_model: {embedding_model}, threshold: {similarity_threshold}")
-    
-    # requirements 임베딩 생성
+
+    logger.info(f"[hybrid_search] embedding_model: {embedding_model}, threshold: {similarity_threshold}, mode: {settings.HYBRID_SEARCH_MODE}, storage: {settings.VECTOR_STORAGE}")
+
+    return {
+        "after": after,
+        "size": page_size(state),
+        "threshold": float(similarity_threshold),
+        "requirements": requirements,
+        "embedding_model": embedding_model,
+        "embedding_field": EMBEDDING_FIELDS.get(embedding_model),
+    }, None
+
+
+async def _embed(plan):
+    """
+    requirements 임베딩 생성 (jhgan은 임베딩 서비스에서 마이크로 배치 처리, openai는 스레드에서 호출)
+    Returns: (embedding, error_msg) - 한 번 만든 임베딩은 plan에 보관
+    """
+    if plan.get("embedding") is not None:
+        return plan["embedding"], None
     try:
-        if embedding_model == "jhgan":
-            embedder = get_embedder_768()
-            requirements_embedding = embedder.create_embedding(requirements)
-            embedding_field = "embedding768"
-            logger.info(f"[hybrid_search] 768차원 임베딩 생성 완료")
-        elif embedding_model == "openai":
-            if not _client_embed:
-                raise Exception("OpenAI API Key가 설정되지 않았습니다")
-            response = _client_embed.embeddings.create(
-                model="text-embedding-3-small",
-                input=requirements
-            )
-            requirements_embedding = response.data[0].embedding
-            embedding_field = "embedding1536"
-            logger.info(f"[hybrid_search] 1536차원 임베딩 생성 완료")
-        else:
-            raise Exception(f"지원하지 않는 임베딩 모델: {embedding_model}")
-        
+        requirements_embedding, embedding_field = await embed_query(plan["embedding_model"], plan["requirements"])
+        logger.info(f"[hybrid_search] {embedding_field} 임베딩 생성 완료")
+
         if not requirements_embedding:
             raise Exception("임베딩 생성 실패")
-    
+
     except Exception as e:
         logger.exception(f"[hybrid_search] 임베딩 생성 오류: {e}")
+        return None, f"벡터 임베딩 생성 중 오류가 발생했습니다: {str(e)}"
+
+    plan["embedding"] = requirements_embedding
+    return requirements_embedding, None
+
+
+async def _prepare(state):
+    """
+    검색 조건 검증, 페이지 정보 준비, requirements 임베딩 생성
+    Returns: (plan, error_msg) - 오류면 plan은 None
+    """
+    plan, error_msg = _plan(state)
+    if plan is None:
+        return None, error_msg
+    _, error_msg = await _embed(plan)
+    if error_msg:
+        return None, error_msg
+    return plan, None
+
+
+async def _search_replica(state, plan):
+    """
+    프로세스 내 복제본으로 유사도 계산/조건/정렬 (DB는 고른 id의 행 조회만)
+    Returns: 결과를 채운 state / 복제본이 처리할 수 없는 조건이면 None (DB 검색)
+    """
+    embedding, error_msg = await _embed(plan)
+    if error_msg:
         state.result = []
-        state.reply = f"벡터 임베딩 생성 중 오류가 발생했습니다: {str(e)}"
+        state.reply = error_msg
         return state
-    
-    # SQL 쿼리 기본 구조
-    query = """
-        SELECT id, company, title, location, hourly_wage, work_days, start_time, end_time,
-               category, gender, age, description, deadline, status,
-               1 - ({embedding_field} <=> $1::vector) AS similarity
-          FROM public.jobs1
-         WHERE status = 'ACTIVE'
-    """.replace("{embedding_field}", embedding_field)
-    
-    # 첫 번째 파라미터는 임베딩 벡터
-    # 공통 WHERE 조건 생성 (초기 param_count는 1, 임베딩 벡터가 $1이므로)
-    where_clause, condition_params, param_count = build_where_conditions(condition, initial_param_count=1)
-    query += where_clause
-    
-    # 파라미터 리스트: 임베딩 벡터 + 조건 파라미터
-    params = [requirements_embedding] + condition_params
-    
-    # 9. 벡터 유사도 조건 (임계값)
-    query += f" AND (1 - ({embedding_field} <=> $1::vector)) >= {similarity_threshold}"
-    
-    # 유사도 높은 순, 최신 등록순 정렬, 최대 50개 제한
-    query += " ORDER BY similarity DESC, created_at DESC LIMIT 50"
-    
+    size = plan["size"]
+    found = await vector_replica.search(
+        plan["embedding_field"], embedding, state.condition, plan["threshold"], size + 1 + REPLICA_HIT_SLACK, plan["after"]
+    )
+    if found is None:
+        return None
+    hits, matched = found
+
+    rows = []
+    if hits:
+        async with db_connection("hybrid_search") as conn:
+            records = await statement_registry.fetch(conn, "hybrid_replica_rows", ROWS_BY_ID_SQL, [row_id for row_id, _ in hits])
+        by_id = {record["id"]: record for record in records}
+        rows = [{**dict(by_id[row_id]), "similarity": similarity} for row_id, similarity in hits if row_id in by_id]
+    rows, next_cursor = split_page(rows[:size + 1], size, "hybrid", "similarity")
+
+    with stage_timer("serialize", "hybrid_search"):
+        results = [row_to_card(row, row["similarity"]) for row in rows]
+    logger.info(f"[hybrid_search] 복제본 검색 완료 - {len(results)}개 결과")
+    return _set_result(state, results, next_cursor, matched if getattr(state, "withCount", False) else None)
+
+
+async def hybrid_search(state):
+    """
+    하이브리드 검색: 일반 SQL 검색 + 벡터 유사도 검색
+    - requirements 필드를 벡터 임베딩하여 유사도 검색
+    - sql_search의 WHERE 조건을 재사용하고, 벡터 검색 조건을 추가
+    - VECTOR_REPLICA 복제본이 준비되어 있으면 유사도 계산/조건 적용을 프로세스 안에서 처리 (DB는 결과 행 조회만)
+    - HYBRID_PREFILTER 이면 임베딩 생성과 동시에 구조화 조건 후보(예상 건수가 적을 때만)를 벡터와 함께 조회하고
+      유사도는 NumPy로 계산 (후보가 많으면 아래 pgvector 검색)
+    - HYBRID_SEARCH_MODE=ann 이면 벡터 인덱스로 후보를 먼저 뽑은 뒤 조건 적용 (2단계 검색)
+    - VECTOR_STORAGE=halfvec/bit 이면 양자화 사본 인덱스로 후보를 뽑고 원본 벡터로 rerank
+    - 키셋 페이지네이션 : state.cursor 다음부터 state.pageSize개
+    """
+    logger.info(f"[hybrid_search] 시작")
+
+    condition = state.condition
+
+    plan, error_msg = _plan(state)
+    if plan is None:
+        state.result = []
+        state.reply = error_msg
+        return state
+    embedding_field, threshold, size = plan["embedding_field"], plan["threshold"], plan["size"]
+
+    if vector_replica.covers(embedding_field):
+        try:
+            replica_state = await _search_replica(state, plan)
+        except Exception as e:
+            logger.exception(f"[hybrid_search] 복제본 검색 오류 - DB 검색으로 대체: {e}")
+            replica_state = None
+        if replica_state is not None:
+            return replica_state
+
+    prefilter = embedding_field is not None and _use_prefilter(condition)
+    embedding_task = None
+    if prefilter: # 후보 조회와 동시에 임베딩 생성
+        embedding_task = asyncio.create_task(_embed(plan))
+    else: # 임베딩을 만드는 동안 DB 커넥션을 잡고 있지 않도록 먼저 생성
+        embedding, error_msg = await _embed(plan)
+        if error_msg:
+            state.result = []
+            state.reply = error_msg
+            return state
+
+    fetch = _fetch_ann if _use_ann() else _fetch_exact
+
     try:
-        async with get_db_connection() as conn:
-            rows = await conn.fetch(query, *params)
-            
-            # 결과를 딕셔너리 리스트로 변환
-            results = []
-            for row in rows:
-                results.append({
-                    "id": row["id"],
-                    "company": row["company"],
-                    "title": row["title"],
-                    "location": row["location"],
-                    "hourly_wage": row["hourly_wage"],
-                    "work_days": row["work_days"],
-                    "start_time": row["start_time"],
-                    "end_time": row["end_time"],
-                    "category": row["category"],
-                    "gender": row["gender"],
-                    "age": row["age"],
-                    "description": row["description"],
-                    "deadline": row["deadline"].isoformat() if row["deadline"] else None,
-                    "status": row["status"],
-                    "similarity": float(row["similarity"])
-                })
-            
-            logger.info(f"[hybrid_search] 검색 완료 - {len(results)}개 결과")
-            
-            # 상태 업데이트
-            state.result = results
-            
-            # 응답 메시지 생성
-            if len(results) > 0:
-                state.reply = f"하이브리드 검색 결과: {len(results)}개의 일자리를 찾았습니다."
+        async with db_connection("hybrid_search") as conn:
+            candidates = None
+            if prefilter:
+                candidates = await _fetch_prefilter_candidates(conn, embedding_field, condition)
+                embedding, error_msg = await embedding_task
+                if error_msg:
+                    state.result = []
+                    state.reply = error_msg
+                    return state
+
+            total_estimate = None
+            if candidates is not None:
+                # 다음 페이지 존재 여부 확인용으로 1개 더 선택
+                with stage_timer("rerank", "hybrid_search"):
+                    rows, matched = vector_rerank.rank(
+                        candidates, embedding, len(embedding), threshold, size + 1, plan["after"]
+                    )
+                rows, next_cursor = split_page(rows, size, "hybrid", "similarity")
+                if getattr(state, "withCount", False):
+                    total_estimate = matched # 후보 전체를 계산했으므로 정확한 건수
+                logger.info(f"[hybrid_search] prefilter 후보 {len(candidates)}개 중 {matched}개 임계값 통과")
             else:
-                state.reply = "조건에 맞는 일자리를 찾지 못했습니다. 조건을 완화해보시겠어요?"
-            
-            return state
-            
+                # 다음 페이지 존재 여부 확인용으로 1개 더 조회
+                rows = await fetch(conn, embedding_field, condition, embedding, threshold, size + 1, plan["after"])
+                rows, next_cursor = split_page(rows, size, "hybrid", "similarity")
+                if getattr(state, "withCount", False):
+                    count_query, count_params = _count_query(embedding_field, condition)
+                    total_estimate = await estimate_count(conn, count_query, [embedding, threshold] + count_params)
+
+            # 결과를 카드 dict 리스트로 변환
+            with stage_timer("serialize", "hybrid_search"):
+                results = [row_to_card(row, row["similarity"]) for row in rows]
+
+            logger.info(f"[hybrid_search] 검색 완료 - {len(results)}개 결과")
+
+            return _set_result(state, results, next_cursor, total_estimate)
+
     except Exception as e:
         logger.exception(f"[hybrid_search] 오류 발생: {e}")
         state.result = []
         state.reply = "하이브리드 검색 중 오류가 발생했습니다."
         return state
+    finally:
+        if embedding_task is not None and not embedding_task.done(): # 후보 조회 중 오류/취소
+            embedding_task.cancel()
+
+
+async def stream_hybrid_search(state):
+    """
+    hybrid_search 스트리밍 버전
+    - exact 모드 : 서버 측 커서에서 나오는 대로 행을 하나씩 전달
+    - ann 모드 : 후보 K를 늘려가며 재조회할 수 있으므로 조회 완료 후 행을 전달
+    yield {"event": "row", "row": {...}} ... {"event": "end", "reply", "next_cursor"}
+    """
+    plan, error_msg = await _prepare(state)
+    if plan is None:
+        yield {"event": "end", "reply": error_msg, "next_cursor": None, "count": 0}
+        return
+    embedding_field, embedding, threshold, size = plan["embedding_field"], plan["embedding"], plan["threshold"], plan["size"]
+
+    results = []
+    next_cursor = None
+    async with db_connection("hybrid_search") as conn:
+        if _use_ann():
+            rows = await _fetch_ann(conn, embedding_field, state.condition, embedding, threshold, size + 1, plan["after"])
+            rows, next_cursor = split_page(rows, size, "hybrid", "similarity")
+            for row in rows:
+                results.append(row_to_card(row, row["similarity"]))
+                yield {"event": "row", "row": results[-1]}
+        else:
+            query, condition_params = _exact_query(embedding_field, state.condition, plan["after"])
+            statement_registry.record(conn, _statement_name("exact", embedding_field, state.condition, plan["after"]), query)
+            last = None
+            async with conn.transaction(): # 서버 측 커서는 트랜잭션 안에서만 사용 가능
+                async for row in conn.cursor(query, embedding, threshold, size + 1, *condition_params,
+                                             prefetch=settings.STREAM_PREFETCH):
+                    if len(results) == size: # size+1번째 행이 있으면 다음 페이지 존재
+                        next_cursor = encode_cursor("hybrid", last["similarity"], last["id"])
+                        break
+                    last = row
+                    results.append(row_to_card(row, row["similarity"]))
+                    yield {"event": "row", "row": results[-1]}
 
+    logger.info(f"[hybrid_search] 스트리밍 완료 - {len(results)}개 결과")
+    _set_result(state, results, next_cursor)
+    yield {"event": "end", "reply": state.reply, "next_cursor": next_cursor, "count": len(results)}
@@ -0,0 +1,37 @@
+"""
+검색 결과 카드 (목록 응답용 projection) 공통 모듈
+- sql_search / hybrid_search 결과는 카드에 표시하는 필드만 조회 (status, qualifications 등은 상세 조회에서)
+- description은 DB에서 RESULT_DESCRIPTION_CHARS자(+1)까지만 읽어 잘린 경우 말줄임표를 붙임 (0이면 조회/응답에서 제외)
+- 전체 내용은 GET /chat/jobs/{id} (service/job_detail.py)
+"""
+from typing import Any, Dict, Optional
+from service.config import settings
+
+CARD_FIELDS = (
+    "id", "company", "title", "location", "hourly_wage", "work_days", "start_time", "end_time",
+    "category", "gender", "age", "deadline",
+)
+ELLIPSIS = "…"
+
+
+def card_columns(id_column: str = "id") -> str:
+    """카드 필드 SELECT 목록 (ann 모드처럼 조인하는 쿼리는 id_column="j.id")"""
+    columns = [id_column, *CARD_FIELDS[1:]]
+    chars = settings.RESULT_DESCRIPTION_CHARS
+    if chars > 0: # 1자 더 읽어서 잘렸는지 확인
+        columns.append(f"left(description, {chars + 1}) AS description")
+    return ", ".join(columns)
+
+
+def row_to_card(row, similarity: Optional[float] = None) -> Dict[str, Any]:
+    """asyncpg Record(또는 dict) → 카드 dict (deadline은 date 그대로, JSON 직렬화 시 ISO 형식)"""
+    card = {field: row[field] for field in CARD_FIELDS}
+    chars = settings.RESULT_DESCRIPTION_CHARS
+    if chars > 0:
+        description = row["description"]
+        if description is not None and len(description) > chars:
+            description = description[:chars].rstrip() + ELLIPSIS
+        card["description"] = description
+    if similarity is not None:
+        card["similarity"] = float(similarity)
+    return card
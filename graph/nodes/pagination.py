@@ -0,0 +1,75 @@
+"""
+검색 결과 키셋(keyset) 페이지네이션 공통 모듈
+- sql_search : (created_at, id) 내림차순, hybrid_search : (similarity, id) 내림차순
+- 커서는 마지막 행의 정렬 키를 담은 불투명 문자열 (base64url JSON)
+- OFFSET을 쓰지 않으므로 sql_search와 hybrid exact 모드는 뒤쪽 페이지도 첫 페이지와 같은 비용
+- hybrid ann 모드(양자화 저장 포함)는 벡터 인덱스 상위 K개 후보에 커서를 적용하므로 뒤쪽 페이지일수록 K를 늘려야 하고,
+  K 상한(ANN_MAX_CANDIDATES, iterative scan이 없으면 1000)을 넘는 깊이의 결과는 나오지 않음 (next_cursor 없음)
+"""
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from service.config import settings
+
+
+def page_size(state) -> int:
+    """요청 페이지 크기 (없으면 기본값, 1 ~ 최대값으로 제한)"""
+    size = getattr(state, "pageSize", None) or settings.PAGE_SIZE_DEFAULT
+    return max(1, min(int(size), settings.PAGE_SIZE_MAX))
+
+
+def encode_cursor(kind: str, key: Any, row_id: Any) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([kind, key, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], kind: str) -> Optional[Tuple[Any, Any]]:
+    """
+    커서 해석 : (정렬 키, id) 반환, 커서가 없으면 None
+    kind가 다르거나 형식이 잘못되면 ValueError
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_kind, key, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError("잘못된 커서입니다")
+    if cursor_kind != kind:
+        raise ValueError("검색 종류가 다른 커서입니다")
+    if not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise ValueError("잘못된 커서입니다")
+    try:
+        if kind == "sql":
+            key = datetime.fromisoformat(key)
+        elif isinstance(key, (int, float)) and not isinstance(key, bool) and math.isfinite(key):
+            key = float(key)
+        else:
+            raise ValueError(key)
+    except (TypeError, ValueError):
+        raise ValueError("잘못된 커서입니다")
+    return key, row_id
+
+
+def split_page(rows: List[Any], size: int, kind: str, key_column: str) -> Tuple[List[Any], Optional[str]]:
+    """size+1개를 조회한 결과를 현재 페이지와 다음 페이지 커서로 분리"""
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    last = rows[-1]
+    return rows, encode_cursor(kind, last[key_column], last["id"])
+
+
+async def estimate_count(conn, query: str, params: List[Any]) -> Optional[int]:
+    """EXPLAIN의 예상 행 수 (실제 COUNT 없이 빠르게 대략적인 전체 건수)"""
+    try:
+        plan = await conn.fetchval("EXPLAIN (FORMAT JSON) " + query, *params)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
@@ -0,0 +1,176 @@
+"""
+규칙 기반 조건 추출기 (classify_input의 LLM 호출 전에 실행)
+- classify_input 프롬프트의 규칙 중 정해진 형식으로 뽑을 수 있는 항목만 처리
+  나이(35세 -> 30대), 성별, 요일(주말 -> 토일), 시간(오전 -> 09:00~14:00, 09:00-18:00), 시급, 카테고리(이름 그대로 나온 경우)
+- 추출한 부분과 불용어를 지웠을 때 남는 내용이 없으면 입력 전체를 해석한 것으로 보고 LLM 호출 생략
+- 지역(place), 추가 조건(requirements)처럼 해석이 필요한 내용은 LLM이 처리
+- 확실하지 않은 부분은 추출하지 않고 원문에 남겨 LLM이 처리 (남은 내용이 있으므로 LLM 호출)
+  부정 표현(주말 빼고, 오전 말고), 월급/일급/연봉, 주5일, 오전/오후 없는 1~7시, 시각으로 볼 수 없는 숫자(전화번호 등)
+"""
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DAYS = "월화수목금토일"
+
+# 조건이 아닌 말 (지우고 남는 내용이 없으면 LLM 생략)
+FILLER_WORDS = [
+    "아르바이트", "알바", "일자리", "일거리", "구인", "구직", "근무", "출근", "가능", "희망", "원해요", "원합니다", "원함",
+    "구해요", "구합니다", "찾아요", "찾습니다", "찾고", "있어요", "있습니다", "싶어요", "싶습니다", "주세요", "해주세요",
+    "입니다", "이에요", "예요", "이고", "이며", "저는", "나는", "제가", "내가", "그리고", "이상", "정도", "요일", "시간",
+    "할", "수", "있는", "하는", "하고", "면", "좋겠어요", "좋아요", "요",
+]
+PARTICLES = r"(은|는|이|가|을|를|에|의|로|으로|과|와|도|만|부터|까지|에서)"
+# 토큰 전체가 불용어/조사로만 이루어진 경우만 지움 (한 글자 불용어가 "수영", "면허" 같은 단어를 지우지 않도록)
+_FILLER_TOKEN = re.compile(
+    "(?:" + "|".join(sorted(FILLER_WORDS, key=len, reverse=True)) + "|" + PARTICLES[1:-1] + ")+"
+)
+# 바로 뒤에 오면 앞의 조건을 반대로 뒤집는 말 (예: 주말 빼고, 오전 말고)
+_NEGATION = re.compile(r"\s*(?:은|는|을|를|이|가)?\s*(?:빼고|말고|제외|아니|아닌|싫)")
+# 시급이 아닌 금액 (바로 앞에 오면 시급으로 추출하지 않음)
+_NOT_HOURLY = re.compile(r"(?:월급|일급|주급|연봉|일당|월)\s*$")
+MAX_HOURLY_WAGE = 100000  # 이보다 크면 시급이 아닌 금액으로 보고 LLM에 맡김
+
+
+def _hhmm(hour: str, minute: str = "00") -> str:
+    return f"{int(hour):02d}:{int(minute or 0):02d}"
+
+
+def _clock(token: str) -> Optional[str]:
+    """09:00 또는 0900 → "09:00" (시각으로 볼 수 없는 숫자면 None)"""
+    hour, minute = token.split(":") if ":" in token else (token[:2], token[2:])
+    if int(hour) >= 24 or int(minute) >= 60:
+        return None
+    return _hhmm(hour, minute)
+
+
+def _hour_range(match: re.Match) -> Optional[Tuple[str, str]]:
+    """
+    "오후 2시부터 6시까지", "10시~6시반" → (시작, 종료)
+    - 종료에 오전/오후가 없으면 시작 시각 이후가 되도록 해석 (10시~6시 → 18:00)
+    - 시작이 오전/오후 없는 1~7시면 새벽인지 오후인지 알 수 없으므로 None (LLM이 처리)
+    """
+    start_meridiem, start_hour, start_half, end_meridiem, end_hour, end_half = match.groups()
+    start, end = int(start_hour), int(end_hour)
+    if start_meridiem is None and 1 <= start <= 7:
+        return None
+    if start_meridiem == "오후" and start < 12:
+        start += 12
+    if end_meridiem == "오후" and end < 12:
+        end += 12
+    elif end_meridiem is None and end <= start and end < 12:
+        end += 12
+    if start >= 24 or end >= 24:
+        return None
+    return _hhmm(start, "30" if start_half else "00"), _hhmm(end, "30" if end_half else "00")
+
+
+def _wage(match: re.Match) -> Optional[int]:
+    """
+    "시급 12000", "12,000원", "1만원", "1만2천원", "9천원" → 원 단위 금액
+    월/월급/일급/연봉 뒤의 금액이나 시급으로 보기 어려운 금액, 단위 없는 숫자는 None (LLM이 처리)
+    """
+    prefix, man, man_cheon, cheon, plain, won = match.groups()
+    if man:
+        wage = int(man.replace(",", "")) * 10000 + int(man_cheon or 0) * 1000
+    elif cheon:
+        wage = int(cheon) * 1000
+    elif prefix or won:
+        wage = int(plain.replace(",", ""))
+    else:
+        return None
+    if wage > MAX_HOURLY_WAGE or _NOT_HOURLY.search(match.string[:match.start()]):
+        return None
+    return wage
+
+
+class _Text:
+    """원문에서 해석한 부분을 공백으로 지워 가며 남는 내용을 추적"""
+
+    def __init__(self, text: str):
+        self.rest = f" {text} "
+
+    def take(self, pattern: str, accept: Optional[Callable[[re.Match], bool]] = None) -> List[re.Match]:
+        """
+        패턴에 맞는 부분을 지우고 반환
+        accept가 False이거나 바로 뒤에 부정 표현이 있으면 지우지 않고 남김 (LLM이 처리)
+        """
+        matches = [
+            match for match in re.finditer(pattern, self.rest)
+            if not _NEGATION.match(self.rest, match.end()) and (accept is None or accept(match))
+        ]
+        for match in reversed(matches):
+            self.rest = self.rest[:match.start()] + " " * (match.end() - match.start()) + self.rest[match.end():]
+        return matches
+
+    def leftover(self) -> str:
+        tokens = re.sub(r"[\s.,!?~\-/()\[\]]+", " ", self.rest).split()
+        return " ".join(token for token in tokens if not _FILLER_TOKEN.fullmatch(token))
+
+
+def extract_conditions(text: str, categories: Iterable[str] = ()) -> Tuple[Dict[str, Any], bool]:
+    """
+    categories : 카테고리 이름 목록 (긴 이름이 먼저 매칭되도록 길이 내림차순으로 정렬된 상태로 전달)
+    Returns: (condition, fully_covered)
+    - condition : 규칙으로 추출한 항목만 담은 딕셔너리
+    - fully_covered : 입력 전체를 규칙으로 해석했으면 True (LLM 호출 불필요)
+    """
+    t = _Text(text or "")
+    cond: Dict[str, Any] = {}
+
+    # 1) 시간 범위 : 09:00-18:00, 0900~1800 (전화번호처럼 더 긴 숫자의 일부는 제외), 9시~18시반, 오후 2시부터 6시까지
+    clock = r"(\d{1,2}:\d{2}|\d{4})"
+    for match in t.take(rf"(?<![\d:\-]){clock}\s*[-~]\s*{clock}(?![\d:\-])",
+                        lambda m: _clock(m[1]) is not None and _clock(m[2]) is not None):
+        cond["start_time"], cond["end_time"] = _clock(match[1]), _clock(match[2])
+    for match in t.take(r"(?:(오전|오후)\s*)?(?<!\d)(\d{1,2})시\s*(반)?\s*(?:부터|[-~])\s*(?:(오전|오후)\s*)?(\d{1,2})시\s*(반)?\s*(?:까지)?",
+                        lambda m: _hour_range(m) is not None):
+        cond["start_time"], cond["end_time"] = _hour_range(match)
+
+    # 2) 시급 : "시급 12000원", "시급 1만원", "1만2천원", "12,000원"
+    for match in t.take(r"(시급\s*)?(?<![\d,])(?:(\d[\d,]*)\s*만\s*(?:(\d)\s*천)?|(\d)\s*천|(\d[\d,]*))\s*(원)?",
+                        lambda m: _wage(m) is not None):
+        cond["hourly_wage"] = str(_wage(match))
+
+    # 3) 나이 : 35세/35살 -> 30대, 30대
+    for match in t.take(r"(\d{1,2})\s*(?:세|살)"):
+        cond["age"] = f"{int(match[1]) // 10 * 10}대"
+    for match in t.take(r"([1-9]0)\s*대"):
+        cond["age"] = f"{match[1]}대"
+
+    # 4) 성별
+    for match in t.take(r"(남자|남성|여자|여성)"):
+        cond["gender"] = "남성" if match[1].startswith("남") else "여성"
+
+    # 5) 시간대 : 오전/오후/종일
+    for match in t.take(r"(오전|오후|종일|하루\s*종일|풀타임)"):
+        if match[1] == "오전":
+            cond["start_time"], cond["end_time"] = "09:00", "14:00"
+        elif match[1] == "오후":
+            cond["start_time"], cond["end_time"] = "14:00", "18:00"
+        else:
+            cond["start_time"], cond["end_time"] = "09:00", "18:00"
+
+    # 6) 요일 : 주말 -> 토일, 주중/평일 -> 월화수목금, 월~금, 월수금(요일)
+    days: List[str] = []
+    # (주5일, 내일처럼 숫자/다른 글자 뒤의 "일"은 요일이 아님)
+    for match in t.take(rf"주말|주중|평일|(?<![\d가-힣])([{DAYS}])\s*~\s*([{DAYS}])|(?<![\d가-힣])([{DAYS}]+)(?=\s*(?:요일|근무|출근))"):
+        if match[0] == "주말":
+            days += list("토일")
+        elif match[0] in ("주중", "평일"):
+            days += list("월화수목금")
+        elif match[1]:
+            start, end = DAYS.index(match[1]), DAYS.index(match[2])
+            days += list(DAYS[start:end + 1]) if start <= end else list(DAYS[start:] + DAYS[:end + 1])
+        else:
+            days += list(match[3])
+    if days:
+        cond["work_days"] = "".join(dict.fromkeys(days)) # 순서 유지 중복 제거
+
+    # 7) 카테고리 : 카테고리 이름이 그대로 나온 경우만
+    for category in categories:
+        if category and t.take(re.escape(category)):
+            cond["category"] = category
+            break
+
+    fully_covered = bool(cond) and not t.leftover()
+    return cond, fully_covered
@@ -3,6 +3,7 @@
 sql_search와 hybrid_search에서 공통으로 사용하는 WHERE 조건 생성 로직
 """
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any
 
 def normalize_region(region_name: str) -> str:
@@ -18,6 +19,11 @@ def normalize_region(region_name: str) -> str:
     return region_name
 
 
+def _escape_like(value: str) -> str:
+    """LIKE 패턴 특수문자(\\, %, _) 이스케이프"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def validate_time_conditions(condition: Dict[str, Any]) -> Tuple[bool, str]:
     """
     start_time과 end_time 검증
@@ -32,33 +38,49 @@ def validate_time_conditions(condition: Dict[str, Any]) -> Tuple[bool, str]:
     return True, ""
 
 
-def build_where_conditions(
-    condition: Dict[str, Any],
-    initial_param_count: int = 0
-) -> Tuple[str, List[Any], int]:
+# 조건별 WHERE 절 템플릿 (쿼리 형태 고정) : {0}, {1}은 파라미터 번호
+# 같은 조건 항목 조합(shape)이면 값과 상관없이 항상 같은 SQL 문자열이 만들어짐 → asyncpg 문장 캐시 재사용
+_PREDICATES = {
+    "gender": " AND gender IN ('무관', ${0})",
+    "age": " AND ${0}::varchar = ANY(age)",
+    "sido": " AND loc_sido = ${0}",
+    "sigungu": " AND loc_sigungu = ${0}",
+    "loc_prefix": " AND loc_norm LIKE ${0}",
+    "work_days": " AND ${0}::varchar[] @> work_days",
+    "time": """
+            AND start_time::time BETWEEN (${0}::text::time - interval '1 hour')
+                                     AND (${0}::text::time + interval '1 hour')
+            AND end_time::time BETWEEN (${1}::text::time - interval '1 hour')
+                                   AND (${1}::text::time + interval '1 hour')
+        """,
+    "wage": " AND hourly_wage >= ${0}",
+    "category": " AND category = ${0}",
+}
+
+
+# 자주 쓰이는 조건 조합(쿼리 형태)의 대표값 : 시작 시 prepared statement 워밍업용 (값은 의미 없음, 형태만 사용)
+HOT_CONDITIONS = [
+    {},
+    {"place": "서울시"},
+    {"place": "서울시 강남구"},
+    {"category": "-"},
+    {"place": "서울시 강남구", "category": "-"},
+    {"place": "서울시 강남구", "work_days": "토일"},
+    {"place": "서울시 강남구", "start_time": "09:00", "end_time": "18:00"},
+    {"gender": "남성", "age": "30대", "place": "서울시 강남구"},
+]
+
+
+def _condition_parts(condition: Dict[str, Any]) -> List[Tuple[str, List[Any]]]:
     """
-    검색 조건에 따라 WHERE 절과 파라미터를 생성
+    검색 조건을 (템플릿 이름, 파라미터 값 목록) 리스트로 변환 (순서 고정)
     requirements 조건은 제외 (벡터 검색용)
-    
-    Args:
-        condition: 검색 조건 딕셔너리
-        initial_param_count: 시작 파라미터 번호 (기본값 0)
-    
-    Returns:
-        (where_clause, params, param_count)
-        - where_clause: SQL WHERE 절 문자열
-        - params: 바인딩할 파라미터 리스트
-        - param_count: 최종 파라미터 개수
     """
-    where_parts = []
-    params = []
-    param_count = initial_param_count
+    parts = []
     
     # 1. gender 조건: 남성인 경우 gender in ('무관', '남성')
     if condition.get("gender"):
-        param_count += 1
-        where_parts.append(f" AND gender IN ('무관', ${param_count})")
-        params.append(condition["gender"])
+        parts.append(("gender", [condition["gender"]]))
     
     # 2. age 조건: varchar 배열 필드에서 '20대' 같은 값 찾기
     if condition.get("age"):
@@ -71,37 +93,23 @@ def build_where_conditions(
             age_range = age_value
         else:
             age_range = str(age_value)
-        
-        param_count += 1
-        where_parts.append(f" AND ${param_count}::varchar = ANY(age)")
-        params.append(age_range)
+        parts.append(("age", [age_range]))
     
     # 3. place 조건: 시/군까지만 매칭 (제주도는 제주도까지만)
+    # 저장 시점에 정규화해 둔 컬럼(loc_sido, loc_sigungu, loc_norm - sql/003_location_region.sql)을 인덱스로 검색
     if condition.get("place"):
-        place = condition["place"]
-        place = normalize_region(place)
+        place = normalize_region(condition["place"]).strip()
         
-        if place.startswith("제주"):
-            region_pattern = "제주"
-        else:
-            match = re.match(r'^(.+[시군도])(?:\s|$)', place)
-            if match:
-                region_pattern = match.group(1)
-            else:
-                region_pattern = place
+        match = None if place.startswith("제주") else re.match(r'^(.+[시군도])(?:\s|$)', place)
+        tokens = match.group(1).split() if match else []
         
-        param_count += 1
-        where_parts.append(f"""
-            AND REGEXP_REPLACE(
-                REGEXP_REPLACE(
-                    REGEXP_REPLACE(
-                        REGEXP_REPLACE(location, '특별자치도', '도', 'g'),
-                        '특별자치시', '시', 'g'),
-                    '특별시', '시', 'g'),
-                '광역시', '시', 'g'
-            ) LIKE ${param_count} || '%'
-        """)
-        params.append(region_pattern)
+        if 1 <= len(tokens) <= 2: # 예) "서울시" 또는 "경기도 수원시" : 시도/시군구 일치
+            parts.append(("sido", [tokens[0]]))
+            if len(tokens) == 2:
+                parts.append(("sigungu", [tokens[1]]))
+        else: # 예) "제주" 또는 시/군/도로 끝나지 않는 지역명 : 정규화된 주소 앞부분 일치
+            region_pattern = "제주" if place.startswith("제주") else (match.group(1) if match else place)
+            parts.append(("loc_prefix", [_escape_like(region_pattern) + "%"]))
     
     # 4. work_days 조건: DB에 저장된 모든 요일이 검색 조건에 포함되어야 함
     # 예) DB에 "월화수" 저장 시, 검색 조건이 "월"만 있으면 X, "월화수" 또는 "월화수목"이면 O
@@ -112,48 +120,75 @@ def build_where_conditions(
                 days_list = [day.strip() for day in work_days.split(",")]
             else:
                 days_list = [work_days[i:i+1] for i in range(0, len(work_days), 1)]
-            
-            param_count += 1
-            where_parts.append(f" AND ${param_count}::varchar[] @> work_days")
-            params.append(days_list)
+            parts.append(("work_days", [days_list]))
     
     # 5-6. start_time, end_time 조건: 전후 1시간 범위
     has_start = condition.get("start_time") not in (None, "")
     has_end = condition.get("end_time") not in (None, "")
     
     if has_start and has_end:
-        start_time = condition["start_time"]
-        end_time = condition["end_time"]
-        
-        param_count += 1
-        start_param = param_count
-        param_count += 1
-        end_param = param_count
-        
-        where_parts.append(f"""
-            AND start_time::time BETWEEN (${start_param}::text::time - interval '1 hour')
-                                     AND (${start_param}::text::time + interval '1 hour')
-            AND end_time::time BETWEEN (${end_param}::text::time - interval '1 hour')
-                                   AND (${end_param}::text::time + interval '1 hour')
-        """)
-        params.append(start_time)
-        params.append(end_time)
+        parts.append(("time", [condition["start_time"], condition["end_time"]]))
     
     # 7. hourly_wage 조건: 최소 시급 이상
     if condition.get("hourly_wage"):
         wage = condition["hourly_wage"]
         if isinstance(wage, str):
             wage = int(''.join(filter(str.isdigit, wage)))
-        
-        param_count += 1
-        where_parts.append(f" AND hourly_wage >= ${param_count}")
-        params.append(int(wage))
+        parts.append(("wage", [int(wage)]))
     
     # 8. category 조건
     if condition.get("category"):
-        param_count += 1
-        where_parts.append(f" AND category = ${param_count}")
-        params.append(condition["category"])
+        parts.append(("category", [condition["category"]]))
     
-    where_clause = ''.join(where_parts)
-    return where_clause, params, param_count
+    return parts
+
+
+def condition_parts(condition: Dict[str, Any]) -> List[Tuple[str, List[Any]]]:
+    """(템플릿 이름, 파라미터 값 목록) 리스트 - SQL 없이 조건을 직접 평가하는 쪽(service/vector_replica.py)용"""
+    return _condition_parts(condition)
+
+
+def condition_shape(condition: Dict[str, Any]) -> Tuple[str, ...]:
+    """검색 조건의 쿼리 형태 (사용된 템플릿 이름 목록) - 통계/워밍업 구분용"""
+    return tuple(name for name, _ in _condition_parts(condition))
+
+
+def shape_label(shape: Tuple[str, ...]) -> str:
+    return "+".join(shape) or "-"
+
+
+@lru_cache(maxsize=1024)
+def _where_clause(shape: Tuple[str, ...], initial_param_count: int) -> str:
+    """쿼리 형태별 WHERE 절 문자열 (형태와 시작 번호가 같으면 한 번만 생성)"""
+    where_parts = []
+    param_count = initial_param_count
+    for name in shape:
+        template = _PREDICATES[name]
+        n = 2 if "{1}" in template else 1
+        where_parts.append(template.format(*range(param_count + 1, param_count + 1 + n)))
+        param_count += n
+    return ''.join(where_parts)
+
+
+def build_where_conditions(
+    condition: Dict[str, Any],
+    initial_param_count: int = 0
+) -> Tuple[str, List[Any], int]:
+    """
+    검색 조건에 따라 WHERE 절과 파라미터를 생성
+    requirements 조건은 제외 (벡터 검색용)
+    
+    Args:
+        condition: 검색 조건 딕셔너리
+        initial_param_count: 시작 파라미터 번호 (기본값 0)
+    
+    Returns:
+        (where_clause, params, param_count)
+        - where_clause: SQL WHERE 절 문자열
+        - params: 바인딩할 파라미터 리스트
+        - param_count: 최종 파라미터 개수
+    """
+    parts = _condition_parts(condition)
+    shape = tuple(name for name, _ in parts)
+    params = [value for _, values in parts for value in values]
+    return _where_clause(shape, initial_param_count), params, initial_param_count + len(params)
@@ -1,82 +1,194 @@
-from common_fastapi.shared.db import get_db_connection
 from common_fastapi.shared.logger import logger
-from .search_conditions import validate_time_conditions, build_where_conditions
+from service.config import settings
+from service.metrics import db_connection, stage_timer
+from service.result_cache import sql_result_cache, condition_key
+from service.statements import statement_registry
+from .search_conditions import (
+    validate_time_conditions, build_where_conditions, condition_shape, shape_label, HOT_CONDITIONS
+)
+from .pagination import page_size, decode_cursor, encode_cursor, split_page, estimate_count
+from .job_card import card_columns, row_to_card
+
+def _set_result(state, results, next_cursor=None, total_estimate=None):
+    """상태 업데이트 및 응답 메시지 생성"""
+    state.result = results
+    state.nextCursor = next_cursor
+    state.totalEstimate = total_estimate
+    if len(results) > 0:
+        state.reply = f"조건에 맞는 일자리 {len(results)}개를 찾았습니다."
+    else:
+        state.reply = "조건에 맞는 일자리를 찾지 못했습니다. 조건을 완화해보시겠어요?"
+    return state
+
+
+def build_sql_query(condition, after=None):
+    """
+    sql_search 쿼리 생성
+    파라미터 : $1 조회 건수(LIMIT), $2~ 공통 WHERE 조건, 마지막에 키셋 커서 (created_at, id)
+    Returns: (query, params(LIMIT 제외), count_query, count_params)
+    """
+    # SQL 쿼리 기본 구조
+    query = f"""
+        SELECT {card_columns()}, created_at
+          FROM public.jobs1
+         WHERE status = 'ACTIVE'
+    """
+
+    # 공통 WHERE 조건 생성 ($1은 LIMIT)
+    where_clause, params, param_count = build_where_conditions(condition, initial_param_count=1)
+    query += where_clause
+
+    # 예상 건수 조회용 (LIMIT/커서 없이 조건만)
+    count_where, count_params, _ = build_where_conditions(condition, initial_param_count=0)
+    count_query = "SELECT id FROM public.jobs1 WHERE status = 'ACTIVE'" + count_where
+
+    # 키셋 커서 : 이전 페이지 마지막 행 다음부터
+    if after is not None:
+        query += f" AND (created_at, id) < (${param_count + 1}, ${param_count + 2})"
+        params += [after[0], after[1]]
+
+    # 최신 등록순 정렬 (동일 시각은 id 역순)
+    query += " ORDER BY created_at DESC, id DESC LIMIT $1"
+    return query, params, count_query, count_params
+
+
+def _statement_name(condition, after=None):
+    """문장 캐시 통계용 쿼리 형태 이름 (다음 페이지 조회는 키셋 조건이 붙어 별도 형태)"""
+    return f"sql:{shape_label(condition_shape(condition))}" + (":next" if after is not None else "")
+
+
+# 자주 쓰이는 쿼리 형태 등록 (시작 시 풀의 커넥션마다 LIMIT 0으로 실행)
+for _condition in HOT_CONDITIONS:
+    _query, _params, _, _ = build_sql_query(_condition)
+    statement_registry.register(_statement_name(_condition), _query, 0, *_params)
+
+
+def _prepare(state):
+    """
+    검색 조건 검증 및 페이지 정보 준비
+    Returns: (plan, error_msg) - 오류면 plan은 None
+    """
+    # start_time과 end_time 검증
+    is_valid, error_msg = validate_time_conditions(state.condition)
+    if not is_valid:
+        return None, error_msg
+
+    try:
+        after = decode_cursor(getattr(state, "cursor", None), "sql")
+    except ValueError as e:
+        return None, str(e)
+    size = page_size(state)
+    with_count = bool(getattr(state, "withCount", False))
+    return {
+        "after": after,
+        "size": size,
+        "with_count": with_count,
+        "cache_key": condition_key(state.condition, getattr(state, "cursor", None), size, with_count),
+    }, None
+
+
+def _cached(plan):
+    if not settings.SQL_CACHE_ENABLED:
+        return None
+    return sql_result_cache.get(plan["cache_key"])
+
+
+def _cache_put(plan, results, next_cursor, total_estimate, cache_version):
+    if settings.SQL_CACHE_ENABLED:
+        sql_result_cache.put(plan["cache_key"], {
+            "results": results, "next_cursor": next_cursor, "total_estimate": total_estimate
+        }, cache_version)
+
 
 async def sql_search(state):
     """
     일반 SQL 검색 (requirements 제외)
     jobseeker의 조건과 employer의 jobs 테이블 데이터를 매칭
+    키셋 페이지네이션 : state.cursor 다음부터 state.pageSize개
     """
     logger.info(f"[sql_search] 시작")
-    
+
     condition = state.condition
-    
-    # start_time과 end_time 검증
-    is_valid, error_msg = validate_time_conditions(condition)
-    if not is_valid:
+
+    plan, error_msg = _prepare(state)
+    if plan is None:
         logger.error(f"[sql_search] {error_msg}")
         state.result = []
         state.reply = error_msg
         return state
-    
-    # SQL 쿼리 기본 구조
-    query = """
-        SELECT id, company, title, location, hourly_wage, work_days, start_time, end_time,
-               category, gender, age, description, deadline, status
-          FROM public.jobs1
-         WHERE status = 'ACTIVE'
-    """
-    
-    # 공통 WHERE 조건 생성
-    where_clause, params, param_count = build_where_conditions(condition, initial_param_count=0)
-    query += where_clause
-    
-    # 공통 WHERE 조건 생성
-    where_clause, params, param_count = build_where_conditions(condition, initial_param_count=0)
-    query += where_clause
-    
-    # 최신 등록순 정렬, 최대 50개 제한
-    query += " ORDER BY created_at DESC LIMIT 50"
-    
+    after, size, with_count = plan["after"], plan["size"], plan["with_count"]
+
+    # 결과 캐시 확인 (jobs1이 바뀌면 알림으로 무효화됨)
+    cached = _cached(plan)
+    if cached is not None:
+        logger.info(f"[sql_search] 캐시 적중 - {len(cached['results'])}개 결과")
+        return _set_result(state, cached["results"], cached["next_cursor"], cached["total_estimate"])
+    cache_version = sql_result_cache.version
+
+    query, params, count_query, count_params = build_sql_query(condition, after)
+
     try:
-        async with get_db_connection() as conn:
-            rows = await conn.fetch(query, *params)
-            
-            # 결과를 딕셔너리 리스트로 변환
-            results = []
-            for row in rows:
-                results.append({
-                    "id": row["id"],
-                    "company": row["company"],
-                    "title": row["title"],
-                    "location": row["location"],
-                    "hourly_wage": row["hourly_wage"],
-                    "work_days": row["work_days"],
-                    "start_time": row["start_time"],
-                    "end_time": row["end_time"],
-                    "category": row["category"],
-                    "gender": row["gender"],
-                    "age": row["age"],
-                    "description": row["description"],
-                    "deadline": row["deadline"].isoformat() if row["deadline"] else None,
-                    "status": row["status"]
-                })
-            
+        async with db_connection("sql_search") as conn:
+            rows = await statement_registry.fetch( # 다음 페이지 존재 여부 확인용으로 1개 더 조회
+                conn, _statement_name(condition, after), query, size + 1, *params
+            )
+            rows, next_cursor = split_page(rows, size, "sql", "created_at")
+            total_estimate = await estimate_count(conn, count_query, count_params) if with_count else None
+
+            # 결과를 카드 dict 리스트로 변환
+            with stage_timer("serialize", "sql_search"):
+                results = [row_to_card(row) for row in rows]
+
             logger.info(f"[sql_search] 검색 완료 - {len(results)}개 결과")
-            
-            # 상태 업데이트
-            state.result = results
-            
-            # 응답 메시지 생성
-            if len(results) > 0:
-                state.reply = f"조건에 맞는 일자리 {len(results)}개를 찾았습니다."
-            else:
-                state.reply = "조건에 맞는 일자리를 찾지 못했습니다. 조건을 완화해보시겠어요?"
-            
-            return state
-            
+
+            _cache_put(plan, results, next_cursor, total_estimate, cache_version)
+
+            return _set_result(state, results, next_cursor, total_estimate)
+
     except Exception as e:
         logger.exception(f"[sql_search] 오류 발생: {e}")
         state.result = []
         state.reply = "일자리 검색 중 오류가 발생했습니다."
         return state
+
+
+async def stream_sql_search(state):
+    """
+    sql_search 스트리밍 버전 : 서버 측 커서에서 나오는 대로 행을 하나씩 전달
+    yield {"event": "row", "row": {...}} ... {"event": "end", "reply", "next_cursor"}
+    """
+    plan, error_msg = _prepare(state)
+    if plan is None:
+        yield {"event": "end", "reply": error_msg, "next_cursor": None, "count": 0}
+        return
+    size = plan["size"]
+
+    cached = _cached(plan)
+    if cached is not None:
+        for result in cached["results"]:
+            yield {"event": "row", "row": result}
+        _set_result(state, cached["results"], cached["next_cursor"], cached["total_estimate"])
+        yield {"event": "end", "reply": state.reply, "next_cursor": state.nextCursor, "count": len(state.result)}
+        return
+    cache_version = sql_result_cache.version
+
+    query, params, _, _ = build_sql_query(state.condition, plan["after"])
+    results = []
+    next_cursor = None
+    last = None
+    async with db_connection("sql_search") as conn:
+        statement_registry.record(conn, _statement_name(state.condition, plan["after"]), query)
+        async with conn.transaction(): # 서버 측 커서는 트랜잭션 안에서만 사용 가능
+            async for row in conn.cursor(query, size + 1, *params, prefetch=settings.STREAM_PREFETCH):
+                if len(results) == size: # size+1번째 행이 있으면 다음 페이지 존재
+                    next_cursor = encode_cursor("sql", last["created_at"], last["id"])
+                    break
+                last = row
+                results.append(row_to_card(row))
+                yield {"event": "row", "row": results[-1]}
+
+    logger.info(f"[sql_search] 스트리밍 완료 - {len(results)}개 결과")
+    if not plan["with_count"]: # 스트리밍은 예상 건수를 계산하지 않으므로 그 키에는 저장하지 않음
+        _cache_put(plan, results, next_cursor, None, cache_version)
+    _set_result(state, results, next_cursor)
+    yield {"event": "end", "reply": state.reply, "next_cursor": next_cursor, "count": len(results)}
@@ -1,14 +1,27 @@
 from fastapi import FastAPI, status # https://fastapi.tiangolo.com/reference/status/
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.requests import Request
 import sys
+import asyncio
+import time
 from dotenv import load_dotenv  # 프로젝트별 .env 로드용
 from contextlib import asynccontextmanager
 from common_fastapi.shared.logger import logger
 from common_fastapi.shared.constant import Const
-from common_fastapi.shared.db import init_db_pool, close_db_pool, get_db_connection  # 공통 DB 모듈
+from common_fastapi.shared.db import init_db_pool, close_db_pool  # 공통 DB 모듈
 from common_fastapi.shared.config import validate_env  # 공통 환경 변수 검증
+from service.config import settings
+from service.db_listener import db_listener
+from service.embed_jobs import auto_reembedder
+from service.result_cache import sql_result_cache
+from service.job_detail import job_detail_cache
+from service.prefetch import search_prefetcher
+from service.refdata import refdata
+from service.statements import statement_registry
+from service.models import model_registry
+from service.vector_replica import vector_replica
+from service import metrics
 
 from route.chat import router as chat_router
 from route.admin import router as admin_router
@@ -18,27 +31,56 @@ load_dotenv() # 프로젝트별 환경 변수 로드 (LOG_PATH 등)
 # API_KEY, DB_URL은 common_fastapi/.env 사용하고 LOG_PATH는 gigchat_fastapi/.env 사용
 
 pool = None  # 하위 호환을 위한 module-level 변수
-CATEGORIES = []  # DB에서 로드할 카테고리 목록 (kind='01', depth=1)
 @asynccontextmanager
 async def lifespan(app: FastAPI): # Application lifespan: 생성시 DB풀 만들고 종료시 닫음
-    global pool, CATEGORIES
+    global pool
     validate_env() # 공통 환경 변수 검증 (API_KEY, DB_URL)
     pool = await init_db_pool() # common_fastapi의 DB 풀 초기화
     app.state.pool = pool
     
-    try: # 카테고리 목록 로드
-        async with get_db_connection() as conn:
-            rows = await conn.fetch(
-                "SELECT nm FROM public.category WHERE kind = '01' AND depth = 1 ORDER BY seq"
-            )
-            CATEGORIES = [row['nm'] for row in rows] # logger.info(f"✅ 카테고리 로드 완료: {len(CATEGORIES)}개")
-    except Exception as e:
-        logger.exception(f"❌ 카테고리 로드 실패: {e}")
-        CATEGORIES = []  # 실패 시 빈 배열
+    # 임베딩 모델 로드 + 워밍업은 백그라운드로 (끝날 때까지 /ready 는 503)
+    model_task = asyncio.create_task(model_registry.load()) if settings.EMBED_PRELOAD else None
+    
+    if settings.STATEMENT_WARMUP: # 자주 쓰이는 검색 쿼리를 커넥션마다 미리 준비
+        try:
+            await statement_registry.warm(pool)
+        except Exception as e:
+            logger.exception(f"prepared statement 워밍업 실패: {e}")
+    
+    await refdata.load() # 카테고리 등 참조 데이터 로드 (변경 알림을 받으면 다시 로드)
+    db_listener.subscribe("category_changed", refdata.on_notify)
+    db_listener.on_connect(refdata.on_reconnect)
+    
+    if settings.SQL_CACHE_ENABLED: # jobs1 변경 시 검색 결과 캐시 무효화
+        db_listener.subscribe("jobs1_changed", sql_result_cache.on_notify)
+        db_listener.on_connect(sql_result_cache.on_reconnect)
+    if settings.JOB_DETAIL_CACHE_ENABLED: # jobs1 변경 시 일자리 상세 조회 캐시 무효화
+        db_listener.subscribe("jobs1_changed", job_detail_cache.on_notify)
+        db_listener.on_connect(job_detail_cache.on_reconnect)
+    if settings.PREFETCH_ENABLED: # jobs1 변경 시 미리 조회한 검색 결과 폐기
+        db_listener.subscribe("jobs1_changed", search_prefetcher.on_notify)
+        db_listener.on_connect(search_prefetcher.on_reconnect)
+    if settings.EMBED_AUTO_REFRESH: # jobs1 등록/수정 시 자동 재임베딩
+        db_listener.subscribe("jobs1_embed", auto_reembedder.on_notify)
+    replica_task = None
+    if vector_replica.enabled: # 프로세스 내 벡터 인덱스 복제본 (스냅샷 로드/생성은 백그라운드, 준비 전에는 DB 검색)
+        db_listener.subscribe("jobs1_vector", vector_replica.on_notify)
+        db_listener.on_connect(vector_replica.on_reconnect)
+        replica_task = asyncio.create_task(vector_replica.start())
+    await db_listener.start()
     
     try:
         yield # 애플리케이션 실행
     finally:
+        if model_task is not None and not model_task.done():
+            model_task.cancel()
+        if replica_task is not None and not replica_task.done():
+            replica_task.cancel()
+        await vector_replica.stop()
+        try:
+            await db_listener.stop()
+        except Exception:
+            logger.exception("Error stopping DB listener on shutdown")
         try:
             await close_db_pool()  # common_fastapi의 close 함수 사용
         except Exception:
@@ -47,12 +89,50 @@ async def lifespan(app: FastAPI): # Application lifespan: 생성시 DB풀 만들
 app = FastAPI(lifespan=lifespan)
 app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
+if settings.TRACE_ID_LOGGING: # 로그 앞에 요청별 trace id 표시
+    logger.addFilter(metrics.TraceIdFilter())
+
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    """요청별 trace id (X-Request-ID) + 처리 시간/처리 중 요청 수 메트릭 (스트리밍 응답은 헤더 전송까지)"""
+    trace_id = metrics.new_trace_id(request.headers.get("x-request-id"))
+    metrics.REQUESTS_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        response.headers["X-Request-ID"] = trace_id
+        return response
+    finally:
+        metrics.REQUESTS_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        metrics.REQUEST_SECONDS.labels(
+            request.method, getattr(route, "path", "unmatched"), str(status_code)
+        ).observe(time.perf_counter() - started)
+
 print(f"sys.executable={sys.executable}")
 print(f"sys.version={sys.version.splitlines()[0]}")
 
 app.include_router(chat_router, prefix="/chat")
 app.include_router(admin_router, prefix="/admin")
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        body, content_type = metrics.render_metrics(pool)
+        return Response(content=body, media_type=content_type)
+
+@app.get("/ready")
+async def ready():
+    """readiness probe : DB 풀과 임베딩 모델(워밍업 완료)이 준비되면 200, 아니면 503"""
+    model_ready = model_registry.ready or not settings.EMBED_PRELOAD
+    is_ready = pool is not None and model_ready
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"ready": is_ready, "db": pool is not None, "model": model_registry.status()}
+    )
+
 # 예를 들어, localhost:8000/gigwork/doc_query/docid 라우팅인데 localhost:8000/gigwork/doc_query 만으로 요청시
 # fastapi가 { "detail": "Not Found" }으로 응답하는데 아래 @app.exception_handler(Exception)로 걸리지 않고 있음
 # 이 부분은 클라이언트에서 응답핸들링 공통 모듈을 작성하기로 함 
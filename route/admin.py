@@ -1,224 +1,188 @@
 from fastapi import APIRouter, HTTPException, status
 from typing import Dict, Any
+from pathlib import Path
 from common_fastapi.shared.db import get_db_connection
 from common_fastapi.shared.logger import logger
-from common_fastapi.ai.embed_jhgan import EmbedderKo
 from common_fastapi.ai.embed_openai import _client_embed
-import time
+from service.embed_cache import embedding_cache
+from service.job_runner import embed_job_runner
+from service.result_cache import sql_result_cache
+from service.job_detail import job_detail_cache
+from service.prefetch import search_prefetcher
+from service.refdata import refdata
+from service.statements import statement_registry
+from service.vector_replica import vector_replica
+from graph.nodes.classify_input import extract_stats
+from service.llm_async import async_llm
 
 router = APIRouter()
 
-# 768차원 임베딩 모델 (jhgan/ko-sroberta-multitask)
-embedder_768 = None
+SQL_DIR = Path(__file__).resolve().parent.parent / "sql" # 스키마 변경 스크립트 (번호순 실행, 재실행 가능하게 작성)
 
-# 1536차원 임베딩 모델 (OpenAI text-embedding-3-small)
-# _client_embed는 common_fastapi에서 가져옴
 
-def get_embedder_768():
-    """768차원 임베딩 모델 싱글톤"""
-    global embedder_768
-    if embedder_768 is None:
-        embedder_768 = EmbedderKo()
-    return embedder_768
-
-
-@router.post("/update_embeddings768")
-async def update_embeddings768() -> Dict[str, Any]:
-    """
-    jobs1 테이블의 embedding768 필드를 업데이트
-    - company + title + description + qualifications 를 결합하여 임베딩
-    - jhgan/ko-sroberta-multitask 모델 사용 (768차원)
-    """
+@router.post("/migrate")
+async def migrate() -> Dict[str, Any]:
+    """sql 폴더의 스크립트를 파일명 순서대로 실행"""
+    applied = []
     try:
-        start_time = time.time()
-        embedder = get_embedder_768()
-        
-        total = 0
-        updated = 0
-        failed = 0
-        failed_ids = []
-        
         async with get_db_connection() as conn:
-            # embedding768이 NULL인 레코드 조회 : WHERE embedding768 IS NULL 일단 빼고 전체 업데이트
-            rows = await conn.fetch("""
-                SELECT id, company, title, description, qualifications
-                FROM public.jobs1
-                
-                ORDER BY id
-            """)
-            
-            total = len(rows)
-            logger.info(f"[768 Embeddings] 처리할 레코드: {total}개")
-            
-            for row in rows:
-                try:
-                    # 임베딩할 텍스트 생성
-                    text_parts = []
-                    if row['company']:
-                        text_parts.append(row['company'])
-                    if row['title']:
-                        text_parts.append(row['title'])
-                    if row['description']:
-                        text_parts.append(row['description'])
-                    if row['qualifications']:
-                        text_parts.append(row['qualifications'])
-                    
-                    text = ' '.join(text_parts)
-                    
-                    if not text.strip():
-                        logger.warning(f"[768 Embeddings] Job ID {row['id']}: 임베딩할 텍스트 없음")
-                        failed += 1
-                        failed_ids.append(row['id'])
-                        continue
-                    
-                    # 임베딩 생성
-                    embedding = embedder.create_embedding(text)
-                    
-                    if not embedding:
-                        logger.error(f"[768 Embeddings] Job ID {row['id']}: 임베딩 생성 실패")
-                        failed += 1
-                        failed_ids.append(row['id'])
-                        continue
-                    
-                    # DB 업데이트
-                    await conn.execute("""
-                        UPDATE public.jobs1
-                        SET embedding768 = $1::vector
-                        WHERE id = $2
-                    """, embedding, row['id'])
-                    
-                    updated += 1
-                    
-                    if updated % 10 == 0:
-                        logger.info(f"[768 Embeddings] 진행 중... {updated}/{total}")
-                
-                except Exception as e:
-                    logger.exception(f"[768 Embeddings] Job ID {row['id']} 처리 실패: {e}")
-                    failed += 1
-                    failed_ids.append(row['id'])
-        
-        duration = time.time() - start_time
-        
-        logger.info(f"[768 Embeddings] 완료 - 총: {total}, 성공: {updated}, 실패: {failed}, 소요시간: {duration:.1f}초")
-        
-        return {
-            "success": True,
-            "total": total,
-            "updated": updated,
-            "failed": failed,
-            "failed_ids": failed_ids,
-            "duration": duration
-        }
-    
+            for path in sorted(SQL_DIR.glob("*.sql")):
+                await conn.execute(path.read_text(encoding="utf-8"))
+                applied.append(path.name)
+                logger.info(f"[migrate] 적용 완료: {path.name}")
+        return {"success": True, "applied": applied}
     except Exception as e:
-        logger.exception(f"[768 Embeddings] 전체 처리 오류: {e}")
+        logger.exception(f"[migrate] 적용 실패 (완료: {applied}): {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 
+@router.post("/update_embeddings768")
+async def update_embeddings768(full: bool = False) -> Dict[str, Any]:
+    """
+    jobs1 테이블의 embedding768 필드를 업데이트하는 백그라운드 작업 등록 (job_id 바로 반환)
+    - company + title + description + qualifications 를 결합하여 임베딩
+    - jhgan/ko-sroberta-multitask 모델 사용 (768차원)
+    - 원문 해시가 바뀌었거나 임베딩이 없는 행만 처리 (full=true면 전체 재임베딩 : 모델 변경 시)
+    - 진행률은 GET /admin/jobs/{job_id}로 조회
+    """
+    return await _submit_job("768", full)
+
+
 @router.post("/update_embeddings1536")
-async def update_embeddings1536() -> Dict[str, Any]:
+async def update_embeddings1536(full: bool = False) -> Dict[str, Any]:
     """
-    jobs1 테이블의 embedding1536 필드를 업데이트
+    jobs1 테이블의 embedding1536 필드를 업데이트하는 백그라운드 작업 등록 (job_id 바로 반환)
     - company + title + description + qualifications 를 결합하여 임베딩
     - OpenAI text-embedding-3-small 모델 사용 (1536차원)
+    - 원문 해시가 바뀌었거나 임베딩이 없는 행만 처리 (full=true면 전체 재임베딩 : 모델 변경 시)
+    - 진행률은 GET /admin/jobs/{job_id}로 조회
     """
+    if not _client_embed:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="OpenAI API Key가 설정되지 않았습니다"
+        )
+    return await _submit_job("1536", full)
+
+
+async def _submit_job(model: str, full: bool) -> Dict[str, Any]:
     try:
-        if not _client_embed:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="OpenAI API Key가 설정되지 않았습니다"
-            )
-        
-        start_time = time.time()
-        
-        total = 0
-        updated = 0
-        failed = 0
-        failed_ids = []
-        
-        async with get_db_connection() as conn:
-            # embedding1536이 NULL인 레코드 조회 : WHERE embedding1536 IS NULL 일단 빼고 전체 업데이트
-            rows = await conn.fetch("""
-                SELECT id, company, title, description, qualifications
-                FROM public.jobs1
-                
-                ORDER BY id
-            """)
-            
-            total = len(rows)
-            logger.info(f"[1536 Embeddings] 처리할 레코드: {total}개")
-            
-            for row in rows:
-                try:
-                    # 임베딩할 텍스트 생성
-                    text_parts = []
-                    if row['company']:
-                        text_parts.append(row['company'])
-                    if row['title']:
-                        text_parts.append(row['title'])
-                    if row['description']:
-                        text_parts.append(row['description'])
-                    if row['qualifications']:
-                        text_parts.append(row['qualifications'])
-                    
-                    text = ' '.join(text_parts)
-                    
-                    if not text.strip():
-                        logger.warning(f"[1536 Embeddings] Job ID {row['id']}: 임베딩할 텍스트 없음")
-                        failed += 1
-                        failed_ids.append(row['id'])
-                        continue
-                    
-                    # OpenAI 임베딩 생성
-                    response = _client_embed.embeddings.create(
-                        model="text-embedding-3-small",
-                        input=text
-                    )
-                    
-                    embedding = response.data[0].embedding
-                    
-                    if not embedding:
-                        logger.error(f"[1536 Embeddings] Job ID {row['id']}: 임베딩 생성 실패")
-                        failed += 1
-                        failed_ids.append(row['id'])
-                        continue
-                    
-                    # DB 업데이트
-                    await conn.execute("""
-                        UPDATE public.jobs1
-                        SET embedding1536 = $1::vector
-                        WHERE id = $2
-                    """, embedding, row['id'])
-                    
-                    updated += 1
-                    
-                    if updated % 10 == 0:
-                        logger.info(f"[1536 Embeddings] 진행 중... {updated}/{total}")
-                
-                except Exception as e:
-                    logger.exception(f"[1536 Embeddings] Job ID {row['id']} 처리 실패: {e}")
-                    failed += 1
-                    failed_ids.append(row['id'])
-        
-        duration = time.time() - start_time
-        
-        logger.info(f"[1536 Embeddings] 완료 - 총: {total}, 성공: {updated}, 실패: {failed}, 소요시간: {duration:.1f}초")
-        
-        return {
-            "success": True,
-            "total": total,
-            "updated": updated,
-            "failed": failed,
-            "failed_ids": failed_ids,
-            "duration": duration
-        }
-    
+        job = await embed_job_runner.submit(model, full)
+        logger.info(f"[{model} Embeddings] 작업 등록: {job['id']} (full={full})")
+        return {"success": True, "job_id": job["id"], "job": job}
     except Exception as e:
-        logger.exception(f"[1536 Embeddings] 전체 처리 오류: {e}")
+        logger.exception(f"[{model} Embeddings] 작업 등록 오류: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+
+
+@router.get("/jobs")
+async def list_jobs(limit: int = 20) -> Dict[str, Any]:
+    """최근 임베딩 작업 목록"""
+    return {"success": True, "jobs": await embed_job_runner.list_jobs(limit)}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Dict[str, Any]:
+    """작업 진행률 조회 (processed/total, rows_per_sec, eta_sec, failed_ids)"""
+    job = await embed_job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="작업을 찾을 수 없습니다")
+    return {"success": True, "job": job}
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str) -> Dict[str, Any]:
+    """작업 취소 요청 (진행 중이면 현재 배치 커밋 후 멈춤)"""
+    job = await embed_job_runner.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="작업을 찾을 수 없습니다")
+    return {"success": True, "job": job}
+
+
+@router.post("/jobs/{job_id}/resume")
+async def resume_job(job_id: str) -> Dict[str, Any]:
+    """취소/실패/중단된 작업을 마지막 체크포인트부터 재개"""
+    try:
+        return {"success": True, "job": await embed_job_runner.resume(job_id)}
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/embed_cache_stats")
+async def embed_cache_stats() -> Dict[str, Any]:
+    """쿼리 임베딩 캐시 적중/미스/축출 통계"""
+    return embedding_cache.stats()
+
+
+@router.get("/sql_cache_stats")
+async def sql_cache_stats() -> Dict[str, Any]:
+    """sql_search 결과 캐시 적중률/크기/무효화 통계"""
+    return sql_result_cache.stats()
+
+
+@router.get("/job_detail_cache_stats")
+async def job_detail_cache_stats() -> Dict[str, Any]:
+    """일자리 상세 조회(GET /chat/jobs/{id}) 캐시 적중률/크기/무효화 통계"""
+    return job_detail_cache.stats()
+
+
+@router.get("/prefetch_stats")
+async def prefetch_stats() -> Dict[str, Any]:
+    """검색 결과 미리 조회 적중률과 동시 실행 상한 초과로 건너뛴 건수"""
+    return search_prefetcher.stats()
+
+
+@router.post("/refdata/reload")
+async def refdata_reload() -> Dict[str, Any]:
+    """참조 데이터(카테고리) 즉시 다시 로드 - 이 요청을 받은 워커만 해당 (다른 워커는 category_changed 알림으로 갱신)"""
+    await refdata.load()
+    return refdata.stats()
+
+
+@router.get("/refdata_stats")
+async def refdata_stats() -> Dict[str, Any]:
+    """참조 데이터 버전과 로드 횟수"""
+    return refdata.stats()
+
+
+@router.get("/statement_stats")
+async def statement_stats() -> Dict[str, Any]:
+    """검색 쿼리 형태별 문장 캐시 적중/미적중 (커넥션별 LRU 추정)"""
+    return statement_registry.stats()
+
+
+@router.get("/vector_replica_stats")
+async def vector_replica_stats() -> Dict[str, Any]:
+    """벡터 인덱스 복제본 세대, 스냅샷/변경분 행 수, 검색/반영 횟수 (이 요청을 받은 워커 기준)"""
+    return vector_replica.stats()
+
+
+@router.post("/vector_replica/rebuild")
+async def vector_replica_rebuild() -> Dict[str, Any]:
+    """복제본 새 세대 스냅샷 생성 - 다른 워커는 세대 확인 주기(VECTOR_REPLICA_CHECK_INTERVAL)에 교체"""
+    if not vector_replica.enabled:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="VECTOR_REPLICA가 설정되지 않았습니다")
+    await vector_replica.rebuild()
+    return vector_replica.stats()
+
+
+@router.get("/classify_stats")
+async def classify_stats() -> Dict[str, Any]:
+    """classify_input 규칙 기반 추출로 LLM을 생략한 비율"""
+    total = extract_stats["llm_skipped"] + extract_stats["llm_called"]
+    return {
+        **extract_stats,
+        "skip_rate": round(extract_stats["llm_skipped"] / total, 4) if total else 0.0,
+    }
+
+
+@router.get("/llm_stats")
+async def llm_stats() -> Dict[str, Any]:
+    """LLM 호출 토큰 사용량 (프롬프트/캐시 적중/응답 토큰)과 평균 지연시간"""
+    return async_llm.stats()
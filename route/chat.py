@@ -1,6 +1,15 @@
 from fastapi import APIRouter, HTTPException, status
-from typing import Union
+from fastapi.responses import StreamingResponse
+from typing import Optional, Union
 from graph.chat_graph import workflow, ChatState
+from graph.dispatch import run_chat
+from graph.nodes.sql_search import sql_search, stream_sql_search
+from graph.nodes.hybrid_search import hybrid_search, stream_hybrid_search
+from service.config import settings
+from service.job_detail import get_job_detail
+from service.json_response import FastJSONResponse, dumps
+from service.prefetch import search_prefetcher
+from service.result_cache import condition_key
 from common_fastapi.restful.rqst import ChatRequest
 from common_fastapi.restful.resp import CodeMsgBase, Common, rsObj, rsError
 from common_fastapi.shared.logger import logger
@@ -8,29 +17,172 @@ from common_fastapi.shared.constant import Const
 
 router = APIRouter()
 
+class ChatSearchRequest(ChatRequest):
+    cursor: Optional[str] = None  # 이전 응답의 next_cursor (다음 페이지)
+    pageSize: Optional[int] = None
+    withCount: bool = False  # 예상 전체 건수 포함 여부
+
+def _build_state(payload: ChatSearchRequest) -> ChatState:
+    return ChatState(
+        userid=payload.userid,
+        text=payload.text,
+        condition=payload.condition or {},
+        search=payload.search,
+        embeddingModel=payload.embeddingModel,
+        similarityThreshold=payload.similarityThreshold,
+        cursor=payload.cursor,
+        pageSize=payload.pageSize,
+        withCount=payload.withCount
+    )
+
+def _prefetch_key(state: ChatState) -> str:
+    """미리 조회 결과를 찾을 키 : 검색 조건(requirements 포함) + 검색 옵션"""
+    return condition_key(
+        state.condition, state.condition.get("requirements") or None,
+        state.embeddingModel, state.similarityThreshold, state.pageSize, state.withCount
+    )
+
+def _search_result(state) -> dict:
+    return {
+        "result": state.result,
+        "reply": state.reply,
+        "nextCursor": state.nextCursor,
+        "totalEstimate": state.totalEstimate
+    }
+
+def _schedule_prefetch(state: ChatState):
+    """조건 추출 직후 첫 페이지 검색을 백그라운드로 미리 실행 (decide_search_type 분기와 동일)"""
+    if not settings.PREFETCH_ENABLED or not state.job_related:
+        return
+    search_state = state.model_copy(update={"search": True, "cursor": None}, deep=True)
+    search = hybrid_search if search_state.condition.get("requirements") else sql_search
+
+    async def run():
+        return _search_result(await search(search_state))
+
+    search_prefetcher.schedule(state.userid, _prefetch_key(search_state), run)
+
+async def _take_prefetched(state: ChatState):
+    """search=True 첫 페이지 요청이면 미리 조회한 결과 사용 (없으면 None)"""
+    if not settings.PREFETCH_ENABLED or not state.search or state.cursor:
+        return None
+    return await search_prefetcher.take(state.userid, _prefetch_key(state))
+
 @router.post("", response_model=Union[Common, CodeMsgBase])
-async def chat_endpoint(payload: ChatRequest):
+async def chat_endpoint(payload: ChatSearchRequest):
     try:
-        state = ChatState(
-            userid=payload.userid,
-            text=payload.text,
-            condition=payload.condition or {},
-            search=payload.search,
-            embeddingModel=payload.embeddingModel,
-            similarityThreshold=payload.similarityThreshold
-        )
-        result_state = await workflow.ainvoke(state)
-        
+        state = _build_state(payload)
+        prefetched = await _take_prefetched(state)
+        if prefetched is not None:
+            logger.info(f"[chat_endpoint] 미리 조회한 결과 사용 - {len(prefetched['result'])}개 결과")
+            return FastJSONResponse(rsObj({
+                "job_related": None,
+                "condition": state.condition,
+                "result": prefetched["result"],
+                "reply": prefetched["reply"],
+                "next_cursor": prefetched["nextCursor"],
+                "total_estimate": prefetched["totalEstimate"]
+            }))
+
+        result_state = await run_chat(state)
+        if not state.search:
+            _schedule_prefetch(ChatState(**result_state))
+
         # 검색 결과 개수만 로그 출력
         result_count = len(result_state.get("result", []))
         logger.info(f"[chat_endpoint] 검색 완료 - {result_count}개 결과")
-        
-        return rsObj({
+
+        # 응답 모델 검증 / jsonable_encoder 없이 바로 직렬화 (service/json_response.py)
+        return FastJSONResponse(rsObj({
             "job_related": result_state.get("job_related"),
             "condition": result_state.get("condition"),
             "result": result_state.get("result"),
-            "reply": result_state.get("reply")
-        })
+            "reply": result_state.get("reply"),
+            "next_cursor": result_state.get("nextCursor"),
+            "total_estimate": result_state.get("totalEstimate")
+        }))
     except Exception as e: # 예) raise Exception("Error")을 통해 여기로 전달됨
         logger.exception("chat_endpoint_error : %s", e)
         return rsError(Const.CODE_NOT_OK, str(e), True)
+
+
+@router.get("/jobs/{job_id}", response_model=Union[Common, CodeMsgBase])
+async def job_detail_endpoint(job_id: int):
+    """
+    일자리 상세 조회 : 검색 결과 목록(카드 필드, description 일부)에서 선택한 일자리의 전체 내용
+    ACTIVE가 아닌 일자리도 status와 함께 반환, 없는 id는 404
+    """
+    try:
+        detail = await get_job_detail(job_id)
+    except Exception as e:
+        logger.exception("job_detail_error : %s", e)
+        return rsError(Const.CODE_NOT_OK, str(e), True)
+    if detail is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="일자리를 찾을 수 없습니다")
+    return FastJSONResponse(rsObj(detail))
+
+
+def _ndjson(event: dict) -> bytes:
+    return dumps(event) + b"\n"
+
+def _value(values, key):
+    """LangGraph 노드 업데이트 값(dict 또는 ChatState)에서 필드 조회"""
+    if isinstance(values, dict):
+        return values.get(key)
+    return getattr(values, key, None)
+
+async def _stream_events(state: ChatState):
+    """
+    스트리밍 이벤트 (한 줄에 JSON 하나)
+    - 공통 : {"event": "start"} 로 시작
+    - 조건 추출 : {"event": "node", "node": ...} 노드가 끝날 때마다, {"event": "condition", ...} 추출 결과
+    - 검색 : {"event": "row", "row": {...}} 행마다, 마지막에 {"event": "end", "reply", "next_cursor", "count"}
+    - 오류 : {"event": "error", "code", "msg"}
+    """
+    yield _ndjson({"event": "start", "search": state.search})
+    try:
+        prefetched = await _take_prefetched(state)
+        if prefetched is not None:
+            for result in prefetched["result"]:
+                yield _ndjson({"event": "row", "row": result})
+            yield _ndjson({"event": "end", "reply": prefetched["reply"],
+                           "next_cursor": prefetched["nextCursor"], "count": len(prefetched["result"])})
+            return
+
+        if state.search: # check_search > decide_search_type 분기와 동일
+            rows = stream_hybrid_search(state) if state.condition.get("requirements") else stream_sql_search(state)
+            async for event in rows:
+                yield _ndjson(event)
+            return
+
+        async for update in workflow.astream(state, stream_mode="updates"):
+            for node, values in update.items():
+                yield _ndjson({"event": "node", "node": node})
+                if node == "classify_input":
+                    _schedule_prefetch(state.model_copy(update={
+                        "job_related": _value(values, "job_related"),
+                        "condition": _value(values, "condition") or state.condition
+                    }))
+                    yield _ndjson({
+                        "event": "condition",
+                        "job_related": _value(values, "job_related"),
+                        "condition": _value(values, "condition"),
+                        "reply": _value(values, "reply")
+                    })
+        yield _ndjson({"event": "end"})
+    except Exception as e:
+        logger.exception("chat_stream_error : %s", e)
+        yield _ndjson({"event": "error", "code": Const.CODE_NOT_OK, "msg": str(e)})
+
+@router.post("/stream")
+async def chat_stream_endpoint(payload: ChatSearchRequest):
+    """
+    /chat 스트리밍 버전 (NDJSON) : 조건 추출 결과나 검색 행을 나오는 즉시 전달
+    기존 /chat 응답 형식은 그대로 유지
+    """
+    state = _build_state(payload)
+    return StreamingResponse(
+        _stream_events(state),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"} # 프록시 버퍼링 방지
+    )
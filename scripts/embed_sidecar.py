@@ -0,0 +1,121 @@
+"""
+임베딩 사이드카 프로세스 (jhgan 모델을 한 번만 로드하여 같은 서버의 모든 uvicorn 워커가 공유)
+
+  python -m scripts.embed_sidecar serve [--socket /run/gigchat/embed.sock] [--mode 660]
+    - EMBED_BACKEND(torch/onnx) 모델 로드 + 워밍업 후 Unix 도메인 소켓에서 요청 처리
+    - 여러 워커에서 동시에 들어온 문장은 EmbeddingService 마이크로 배치(EMBED_MAX_BATCH_SIZE, EMBED_MAX_WAIT_MS)로 묶어서 encode
+    - 워커는 EMBED_SIDECAR_SOCKET 을 같은 경로로 설정 (프로토콜은 service/embed_sidecar.py)
+  python -m scripts.embed_sidecar check [--socket ...] [--repeat 20]
+    - 실행 중인 사이드카에 예시 문장을 보내 차원과 요청당 지연시간 확인 (대체 처리 없이, 실패하면 종료 코드 1)
+"""
+import argparse
+import asyncio
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common_fastapi.shared.logger import logger  # noqa: E402
+from service.config import settings  # noqa: E402
+from service.embed_sidecar import (  # noqa: E402
+    OP_EMBED, SidecarEmbedder, decode_request, encode_error, encode_response, read_frame,
+)
+from service.embedding import EmbeddingService  # noqa: E402
+from service.models import ModelRegistry  # noqa: E402
+from scripts.onnx_embedder import SAMPLE_TEXTS  # noqa: E402
+
+
+async def _handle(service: EmbeddingService, reader, writer):
+    """연결 1개 : 요청을 순서대로 처리 (문장 단위로 다른 연결의 요청과 함께 배치)"""
+    try:
+        while True:
+            try:
+                body = await read_frame(reader)
+            except ValueError as e:
+                logger.warning(f"[embed_sidecar] 잘못된 요청 - 연결 종료: {e}")
+                break
+            if body is None:
+                break
+            request_id = 0
+            try:
+                request_id, op, texts = decode_request(body)
+                if op != OP_EMBED:
+                    raise ValueError(f"알 수 없는 명령: {op}")
+                vectors = await asyncio.gather(*(service.embed(text) for text in texts))
+                writer.write(encode_response(request_id, vectors))
+            except Exception as e:
+                logger.exception(f"[embed_sidecar] 요청 처리 실패: {e}")
+                writer.write(encode_error(request_id, str(e)))
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+def _remove_stale_socket(path: str):
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+async def serve(socket_path: str, mode: int):
+    # 사이드카 안에서는 항상 프로세스 내 모델 사용 (자기 자신에게 요청하지 않도록 소켓 없이 생성)
+    registry = ModelRegistry(settings.EMBED_BACKEND, settings.ONNX_MODEL_PATH, settings.ONNX_THREADS)
+    await registry.load()
+    if not registry.ready:
+        raise SystemExit(f"모델 로드 실패: {registry.status()['error']}")
+    service = EmbeddingService(registry.get_768, settings.EMBED_MAX_BATCH_SIZE, settings.EMBED_MAX_WAIT_MS)
+
+    Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+    _remove_stale_socket(socket_path)
+    server = await asyncio.start_unix_server(lambda r, w: _handle(service, r, w), path=socket_path)
+    os.chmod(socket_path, mode)
+    logger.info(f"[embed_sidecar] {socket_path} 에서 대기 ({registry.status()['backend']})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        _remove_stale_socket(socket_path)
+
+
+def check(socket_path: str, repeat: int) -> bool:
+    client = SidecarEmbedder(socket_path, settings.EMBED_SIDECAR_TIMEOUT, 0.0)
+    try:
+        vectors = client.encode(SAMPLE_TEXTS)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            client.encode(SAMPLE_TEXTS[:1])
+        elapsed = (time.perf_counter() - started) / max(1, repeat)
+    except Exception as e:
+        print(f"FAIL : {e}")
+        return False
+    print(f"문장 {len(vectors)}개, {vectors.shape[1]}차원 / 1문장 요청 {elapsed * 1000:.1f} ms")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve")
+    serve_parser.add_argument("--socket", default=settings.EMBED_SIDECAR_SOCKET or "/run/gigchat/embed.sock")
+    serve_parser.add_argument("--mode", default="660", help="소켓 파일 권한 (8진수, 워커 실행 계정이 접근 가능해야 함)")
+    check_parser = sub.add_parser("check")
+    check_parser.add_argument("--socket", default=settings.EMBED_SIDECAR_SOCKET or "/run/gigchat/embed.sock")
+    check_parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.socket, int(args.mode, 8)))
+        except KeyboardInterrupt:
+            pass
+    elif not check(args.socket, args.repeat):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+ko-sroberta ONNX 모델 내보내기 / 기존 임베딩과 일치도 확인 (EMBED_BACKEND=onnx 사용 전에 실행)
+
+  python -m scripts.onnx_embedder export [--out models/ko-sroberta-int8.onnx]
+    - SentenceTransformer(torch) 모델을 ONNX로 내보내고 int8 동적 양자화 (onnxruntime.quantization)
+  python -m scripts.onnx_embedder check [--model models/ko-sroberta-int8.onnx] [--db-rows 200] [--min-cosine 0.99]
+    - 예시 문장(과 jobs1 행)을 torch/onnx 두 백엔드로 임베딩하여 코사인 유사도 비교
+    - jobs1 행은 DB에 저장된 embedding768과도 비교 (기존 인덱스/임베딩을 그대로 써도 되는지 확인)
+    - 최소 코사인이 기준보다 낮거나, 예시 문장 검색 순위(top-5)가 달라지면 종료 코드 1
+
+필요 패키지 : onnx, onnxruntime, transformers, torch, sentence-transformers (check --db-rows 사용 시 DB_URL)
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from service.models import JHGAN_MODEL_NAME, OnnxEmbedder  # noqa: E402
+
+SAMPLE_TEXTS = [
+    "운전 면허증 있음",
+    "수영 강사 자격증과 경력 3년",
+    "바리스타 자격증 보유, 카페 근무 경험",
+    "엑셀 가능, 사무 보조 경험",
+    "지게차 운전 가능",
+    "영어 회화 가능한 분",
+    "주말 오전 편의점 아르바이트",
+    "초등학생 수학 과외 경험",
+    "요양보호사 자격증",
+    "포토샵, 일러스트 가능",
+]
+
+
+def export(out: str):
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    out_path = Path(out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    fp32_path = out_path.with_name(out_path.stem + "-fp32.onnx")
+
+    tokenizer = AutoTokenizer.from_pretrained(JHGAN_MODEL_NAME)
+    model = AutoModel.from_pretrained(JHGAN_MODEL_NAME).eval()
+    encoded = tokenizer(SAMPLE_TEXTS[:2], padding=True, return_tensors="pt")
+    inputs = ("input_ids", "attention_mask")
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(encoded[name] for name in inputs), str(fp32_path),
+            input_names=list(inputs), output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in (*inputs, "last_hidden_state")},
+            opset_version=17,
+        )
+    quantize_dynamic(str(fp32_path), str(out_path), weight_type=QuantType.QInt8)
+    print(f"fp32 : {fp32_path} ({fp32_path.stat().st_size / 1e6:.1f}MB)")
+    print(f"int8 : {out_path} ({out_path.stat().st_size / 1e6:.1f}MB)")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+def _row_cosines(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (_normalize(a) * _normalize(b)).sum(axis=1)
+
+
+async def _fetch_rows(limit: int):
+    import asyncpg
+    from dotenv import load_dotenv
+    load_dotenv()
+    conn = await asyncpg.connect(os.getenv("DB_URL"))
+    try:
+        return await conn.fetch(
+            "SELECT public.jobs1_embed_text(company, title, description, qualifications) AS text, "
+            "embedding768::text AS embedding FROM public.jobs1 "
+            "WHERE embedding768 IS NOT NULL ORDER BY id DESC LIMIT $1",
+            limit,
+        )
+    finally:
+        await conn.close()
+
+
+def check(model_path: str, db_rows: int, min_cosine: float) -> bool:
+    from sentence_transformers import SentenceTransformer
+
+    torch_model = SentenceTransformer(JHGAN_MODEL_NAME)
+    onnx_model = OnnxEmbedder(model_path)
+
+    texts = list(SAMPLE_TEXTS)
+    stored = None
+    if db_rows > 0:
+        rows = asyncio.run(_fetch_rows(db_rows))
+        texts += [row["text"] for row in rows]
+        stored = np.array([[float(v) for v in row["embedding"].strip("[]").split(",")] for row in rows])
+
+    started = time.perf_counter()
+    torch_vectors = torch_model.encode(texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False)
+    torch_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    onnx_vectors = onnx_model.encode(texts, batch_size=32)
+    onnx_sec = time.perf_counter() - started
+
+    ok = True
+    cosines = _row_cosines(torch_vectors, onnx_vectors)
+    print(f"torch vs onnx : min={cosines.min():.4f} mean={cosines.mean():.4f} ({len(texts)}건)")
+    print(f"encode 시간   : torch={torch_sec:.2f}s onnx={onnx_sec:.2f}s")
+    ok &= cosines.min() >= min_cosine
+
+    if stored is not None and len(stored):
+        stored_cosines = _row_cosines(stored, onnx_vectors[len(SAMPLE_TEXTS):])
+        print(f"저장된 embedding768 vs onnx : min={stored_cosines.min():.4f} mean={stored_cosines.mean():.4f}")
+        ok &= stored_cosines.min() >= min_cosine
+
+        # 예시 문장으로 검색했을 때 상위 5개 순위가 같은지
+        torch_rank = np.argsort(-_normalize(torch_vectors[:len(SAMPLE_TEXTS)]) @ _normalize(stored).T, axis=1)[:, :5]
+        onnx_rank = np.argsort(-_normalize(onnx_vectors[:len(SAMPLE_TEXTS)]) @ _normalize(stored).T, axis=1)[:, :5]
+        same = int((torch_rank == onnx_rank).all(axis=1).sum())
+        print(f"top-5 순위 일치 : {same}/{len(SAMPLE_TEXTS)}")
+        ok &= same == len(SAMPLE_TEXTS)
+
+    print("OK" if ok else "FAIL")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export")
+    export_parser.add_argument("--out", default=os.getenv("ONNX_MODEL_PATH", "models/ko-sroberta-int8.onnx"))
+    check_parser = sub.add_parser("check")
+    check_parser.add_argument("--model", default=os.getenv("ONNX_MODEL_PATH", "models/ko-sroberta-int8.onnx"))
+    check_parser.add_argument("--db-rows", type=int, default=0)
+    check_parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export(args.out)
+    elif not check(args.model, args.db_rows, args.min_cosine):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
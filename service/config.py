@@ -0,0 +1,134 @@
+"""
+프로젝트 설정 모듈
+- .env 및 환경 변수에서 성능/운영 관련 설정값을 읽어옴
+- main.py는 라우터 import 이후에 load_dotenv()를 호출하므로 여기서 먼저 로드함 (중복 호출해도 무방)
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    # LLM (classify_input)
+    LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+    LLM_MAX_CONCURRENCY = _int("LLM_MAX_CONCURRENCY", 8)  # 워커당 동시 LLM 호출 수
+    LLM_TIMEOUT = _float("LLM_TIMEOUT", 20.0)  # LLM 호출 1건당 제한시간(초)
+
+    # jhgan(768) 임베딩 모델 백엔드 : torch(SentenceTransformer) 또는 onnx(ONNX Runtime, int8 양자화 모델)
+    EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+    ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", "models/ko-sroberta-int8.onnx")
+    ONNX_THREADS = _int("ONNX_THREADS", 0)  # 0이면 onnxruntime 기본값
+    EMBED_PRELOAD = _bool("EMBED_PRELOAD", True)  # 시작 시 모델 로드 + 워밍업 (끝나야 /ready 200)
+    # 임베딩 사이드카 (scripts/embed_sidecar.py) : 소켓 경로가 있으면 워커는 모델을 로드하지 않고 사이드카에 요청
+    EMBED_SIDECAR_SOCKET = os.getenv("EMBED_SIDECAR_SOCKET", "")  # 예) /run/gigchat/embed.sock
+    EMBED_SIDECAR_TIMEOUT = _float("EMBED_SIDECAR_TIMEOUT", 10.0)  # 요청 1건 제한시간(초)
+    EMBED_SIDECAR_FALLBACK = _bool("EMBED_SIDECAR_FALLBACK", False)  # 실행 중 연결할 수 없으면 프로세스 내 모델 로드 (워커마다 모델 메모리 사용)
+    EMBED_SIDECAR_RETRY = _float("EMBED_SIDECAR_RETRY", 5.0)  # 연결 실패 후 재시도 간격(초) (시작 시 대기 포함)
+
+    # 쿼리 임베딩 마이크로 배치 (jhgan)
+    EMBED_MAX_BATCH_SIZE = _int("EMBED_MAX_BATCH_SIZE", 32)
+    EMBED_MAX_WAIT_MS = _float("EMBED_MAX_WAIT_MS", 5.0)
+
+    # 쿼리 임베딩 캐시 (디스크 경로가 비어 있으면 메모리 캐시만 사용)
+    EMBED_CACHE_MAX_ENTRIES = _int("EMBED_CACHE_MAX_ENTRIES", 2000)
+    EMBED_CACHE_TTL = _float("EMBED_CACHE_TTL", 3600.0)  # 초
+    EMBED_CACHE_DISK_PATH = os.getenv("EMBED_CACHE_DISK_PATH", "")
+    EMBED_CACHE_DISK_TTL = _float("EMBED_CACHE_DISK_TTL", 30 * 24 * 3600.0)  # 초 (0이면 만료 없음)
+    EMBED_CACHE_DISK_MAX_ROWS = _int("EMBED_CACHE_DISK_MAX_ROWS", 200000)  # 0이면 제한 없음
+
+    # 검색 결과 페이지 크기 (키셋 페이지네이션)
+    PAGE_SIZE_DEFAULT = _int("PAGE_SIZE_DEFAULT", 50)
+    PAGE_SIZE_MAX = _int("PAGE_SIZE_MAX", 100)
+    STREAM_PREFETCH = _int("STREAM_PREFETCH", 10)  # 스트리밍 검색 시 커서가 한 번에 가져오는 행 수
+    # 검색 결과 목록은 카드 필드만 (전체 내용은 GET /chat/jobs/{id})
+    RESULT_DESCRIPTION_CHARS = _int("RESULT_DESCRIPTION_CHARS", 100)  # 목록의 description 최대 글자 수 (0이면 제외)
+
+    # 하이브리드 검색 모드 : exact(전체 거리 계산) 또는 ann(벡터 인덱스 후보 K개 → 조건 적용)
+    HYBRID_SEARCH_MODE = os.getenv("HYBRID_SEARCH_MODE", "exact")
+    ANN_CANDIDATES = _int("ANN_CANDIDATES", 200)  # 1단계 후보 수 K (결과가 부족하면 4배씩 늘림)
+    ANN_MAX_CANDIDATES = _int("ANN_MAX_CANDIDATES", 5000)  # HNSW_ITERATIVE_SCAN이 없으면 ef_search 최대값(1000)으로 제한
+    HNSW_EF_SEARCH = _int("HNSW_EF_SEARCH", 100)  # K보다 작으면 K로 맞춤 (최대 1000)
+    HNSW_ITERATIVE_SCAN = os.getenv("HNSW_ITERATIVE_SCAN", "")  # pgvector 0.8 이상 : relaxed_order 또는 strict_order
+    # 벡터 후보 추출용 저장 방식 : vector(원본), halfvec(float16 사본), bit(이진 양자화 사본) - sql/008_quantized_embeddings.sql
+    # halfvec/bit 이면 HYBRID_SEARCH_MODE와 상관없이 사본 인덱스로 후보를 뽑고 원본 벡터로 rerank
+    VECTOR_STORAGE = os.getenv("VECTOR_STORAGE", "vector")
+    VECTOR_RERANK_FACTOR = _int("VECTOR_RERANK_FACTOR", 4)  # 양자화 모드에서 후보 수 K 배수
+    # 구조화 조건 후보가 적으면(EXPLAIN 예상 건수 기준) 임베딩 생성과 동시에 후보 벡터를 조회하고 NumPy로 유사도 계산
+    HYBRID_PREFILTER = _bool("HYBRID_PREFILTER", True)
+    HYBRID_PREFILTER_MAX_CANDIDATES = _int("HYBRID_PREFILTER_MAX_CANDIDATES", 2000)
+
+    # 프로세스 내 벡터 인덱스 복제본 (service/vector_replica.py, sql/009_vector_replica.sql)
+    # 사용할 임베딩 컬럼 (예: embedding768 또는 embedding768,embedding1536, 비어 있으면 사용 안 함)
+    VECTOR_REPLICA = os.getenv("VECTOR_REPLICA", "")
+    VECTOR_REPLICA_PATH = os.getenv("VECTOR_REPLICA_PATH", "data/vector_replica")  # 스냅샷 디렉터리 (워커끼리 공유)
+    VECTOR_REPLICA_DTYPE = os.getenv("VECTOR_REPLICA_DTYPE", "float16")  # float16 또는 float32
+    VECTOR_REPLICA_DELAY = _float("VECTOR_REPLICA_DELAY", 0.2)  # 변경 알림을 모으는 시간(초)
+    VECTOR_REPLICA_CHECK_INTERVAL = _float("VECTOR_REPLICA_CHECK_INTERVAL", 30.0)  # 새 세대 확인 주기(초)
+    VECTOR_REPLICA_REBUILD_ROWS = _int("VECTOR_REPLICA_REBUILD_ROWS", 5000)  # 변경분이 이 행 수를 넘으면 새 세대 생성
+    VECTOR_REPLICA_MAX_AGE = _float("VECTOR_REPLICA_MAX_AGE", 24 * 3600.0)  # 스냅샷 최대 보관 시간(초, 0이면 제한 없음)
+    VECTOR_REPLICA_CATCHUP_MARGIN = _float("VECTOR_REPLICA_CATCHUP_MARGIN", 300.0)  # 스냅샷 시각보다 이만큼 앞부터 다시 읽음(초)
+
+    # sql_search 결과 캐시 (jobs1_changed 알림으로 무효화, MAX_AGE는 알림 유실 대비 안전장치)
+    SQL_CACHE_ENABLED = _bool("SQL_CACHE_ENABLED", True)
+    SQL_CACHE_MAX_ENTRIES = _int("SQL_CACHE_MAX_ENTRIES", 1000)
+    SQL_CACHE_MAX_BYTES = _int("SQL_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    SQL_CACHE_MAX_AGE = _float("SQL_CACHE_MAX_AGE", 600.0)  # 초 (0이면 제한 없음)
+
+    # 일자리 상세 조회 캐시 (GET /chat/jobs/{id}, jobs1_changed 알림으로 무효화)
+    JOB_DETAIL_CACHE_ENABLED = _bool("JOB_DETAIL_CACHE_ENABLED", True)
+    JOB_DETAIL_CACHE_MAX_ENTRIES = _int("JOB_DETAIL_CACHE_MAX_ENTRIES", 5000)
+    JOB_DETAIL_CACHE_MAX_BYTES = _int("JOB_DETAIL_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+    JOB_DETAIL_CACHE_MAX_AGE = _float("JOB_DETAIL_CACHE_MAX_AGE", 600.0)  # 초 (0이면 제한 없음)
+
+    # 조건 추출 직후 검색 결과 미리 조회 (사용자가 검색 버튼을 누르기 전에 백그라운드 실행)
+    PREFETCH_ENABLED = _bool("PREFETCH_ENABLED", True)
+    PREFETCH_TTL = _float("PREFETCH_TTL", 60.0)  # 미리 조회한 결과 보관 시간(초)
+    PREFETCH_MAX_CONCURRENCY = _int("PREFETCH_MAX_CONCURRENCY", 2)  # 워커당 동시 미리 조회 수 (넘으면 건너뜀)
+    PREFETCH_MAX_ENTRIES = _int("PREFETCH_MAX_ENTRIES", 1000)  # 보관할 사용자 수
+
+    # 검색 쿼리 prepared statement 워밍업 (DB_STATEMENT_CACHE_SIZE는 asyncpg 풀의 statement_cache_size와 맞춤)
+    STATEMENT_WARMUP = _bool("STATEMENT_WARMUP", True)
+    DB_STATEMENT_CACHE_SIZE = _int("DB_STATEMENT_CACHE_SIZE", 100)
+
+    # 검색 요청(search=True)은 LangGraph 런타임 없이 노드 직접 호출 (graph/dispatch.py)
+    GRAPH_DIRECT_DISPATCH = _bool("GRAPH_DIRECT_DISPATCH", True)
+
+    # 메트릭 / 요청 추적 ID
+    METRICS_ENABLED = _bool("METRICS_ENABLED", True)  # GET /metrics (Prometheus)
+    TRACE_ID_LOGGING = _bool("TRACE_ID_LOGGING", False)  # 로그 앞에 요청별 trace id 표시
+
+    # 관리자 임베딩 재생성 배치 크기
+    EMBED_BATCH_SIZE_768 = _int("EMBED_BATCH_SIZE_768", 64)
+    EMBED_BATCH_SIZE_1536 = _int("EMBED_BATCH_SIZE_1536", 128)
+    EMBED_JOB_MAX_CONCURRENCY = _int("EMBED_JOB_MAX_CONCURRENCY", 1)  # 워커당 동시 실행 작업 수
+    EMBED_JOB_THREADS = _int("EMBED_JOB_THREADS", 1)  # 작업용 임베딩 스레드 수
+    EMBED_JOB_STALE_SEC = _float("EMBED_JOB_STALE_SEC", 600.0)  # 체크포인트가 이 시간 이상 없으면 중단된 작업으로 봄
+
+    # jobs1 등록/수정 시 자동 재임베딩 (LISTEN jobs1_embed)
+    EMBED_AUTO_REFRESH = _bool("EMBED_AUTO_REFRESH", False)
+    EMBED_AUTO_DELAY = _float("EMBED_AUTO_DELAY", 3.0)  # 알림을 모으는 시간(초)
+
+
+settings = Settings()
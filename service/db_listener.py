@@ -0,0 +1,83 @@
+"""
+Postgres LISTEN/NOTIFY 수신 모듈
+- 풀 커넥션을 점유하지 않도록 전용 커넥션 1개로 여러 채널을 LISTEN
+- 커넥션이 끊기면 재연결 후 다시 LISTEN
+"""
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncpg
+from common_fastapi.shared.logger import logger
+
+NotifyCallback = Callable[[str], Awaitable[None]]
+
+
+class DbListener:
+
+    def __init__(self, reconnect_delay: float = 5.0):
+        self.reconnect_delay = reconnect_delay
+        self._callbacks: Dict[str, List[NotifyCallback]] = {}
+        self._connect_callbacks: List[Callable[[], Awaitable[None]]] = []
+        self._conn: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lost: Optional[asyncio.Event] = None
+
+    def subscribe(self, channel: str, callback: NotifyCallback):
+        """start() 이전에 채널별 콜백 등록 (payload 문자열을 인자로 받음)"""
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def on_connect(self, callback: Callable[[], Awaitable[None]]):
+        """(재)연결 직후 호출할 콜백 등록 - 끊긴 동안 놓친 알림을 보정하는 용도"""
+        self._connect_callbacks.append(callback)
+
+    def _on_notify(self, conn, pid, channel, payload):
+        for callback in self._callbacks.get(channel, []):
+            asyncio.create_task(self._dispatch(channel, callback, payload))
+
+    async def _dispatch(self, channel: str, callback, payload: Optional[str]):
+        try:
+            await (callback(payload) if payload is not None else callback())
+        except Exception as e:
+            logger.exception(f"[DbListener] {channel} 처리 오류: {e}")
+
+    def _on_termination(self, conn):
+        if self._lost is not None:
+            self._lost.set()
+
+    async def _run(self):
+        while True:
+            try:
+                self._lost = asyncio.Event()
+                self._conn = await asyncpg.connect(os.getenv("DB_URL"))
+                self._conn.add_termination_listener(self._on_termination)
+                for channel in self._callbacks:
+                    await self._conn.add_listener(channel, self._on_notify)
+                logger.info(f"[DbListener] LISTEN 시작: {', '.join(self._callbacks)}")
+                for callback in self._connect_callbacks:
+                    await self._dispatch("connect", callback, None)
+                await self._lost.wait()
+                logger.warning("[DbListener] 커넥션 끊김 - 재연결 시도")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"[DbListener] 연결 오류: {e}")
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self):
+        if self._callbacks and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+
+
+db_listener = DbListener()
@@ -0,0 +1,180 @@
+"""
+쿼리 임베딩 캐시 (2단계)
+- 1단계: 프로세스 메모리 LRU + TTL
+- 2단계(선택): SQLite 파일 캐시 - 재시작 후에도 유지되고 같은 서버의 여러 워커가 공유
+- 키는 (embeddingModel, 정규화한 텍스트) - 임베딩도 정규화한 텍스트로 생성 (service/embedding.py의 embed_query)
+  같은 키에 먼저 들어온 원문 표기에 따라 다른 벡터가 저장되지 않도록
+- 디스크 캐시는 DISK_PRUNE_INTERVAL마다 disk_ttl이 지난 행을 지우고 disk_max_rows를 넘으면 오래된 순으로 삭제
+- 적중/미스/축출 카운터를 stats()로 제공하여 캐시 크기 산정에 사용
+"""
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from common_fastapi.shared.logger import logger
+from service.config import settings
+
+DISK_PRUNE_INTERVAL = 3600.0  # 디스크 캐시 정리 주기(초)
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 NFC 정규화 + 앞뒤 공백 제거 + 연속 공백 1개로 + 소문자"""
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class EmbeddingCache:
+
+    def __init__(self, max_entries: int, ttl: float, disk_path: str = "", disk_ttl: float = 0, disk_max_rows: int = 0):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl
+        self.disk_max_rows = disk_max_rows
+        self._pruned_at = 0.0
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, List[float]]]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "disk_pruned": 0}
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        if disk_path:
+            self._open_disk(disk_path)
+
+    def _open_disk(self, path: str):
+        try:
+            conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 워커 프로세스 동시 읽기/쓰기
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_embedding (
+                    model TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model, text)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS query_embedding_created_at ON query_embedding (created_at)")
+            conn.commit()
+            self._disk = conn
+            self._disk_prune()
+            logger.info(f"[EmbeddingCache] 디스크 캐시 사용: {path}")
+        except Exception as e:
+            logger.exception(f"[EmbeddingCache] 디스크 캐시 열기 실패 - 메모리 캐시만 사용: {e}")
+            self._disk = None
+
+    # 메모리 캐시 ##########################################
+    def _memory_get(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        item = self._memory.get(key)
+        if item is None:
+            return None
+        expires_at, vector = item
+        if self.ttl and expires_at < time.monotonic():
+            del self._memory[key]
+            self._stats["expirations"] += 1
+            return None
+        self._memory.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key: Tuple[str, str], vector: List[float]):
+        self._memory[key] = (time.monotonic() + self.ttl, vector)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    # 디스크 캐시 (스레드에서 실행) ###########################
+    def _disk_get(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        with self._disk_lock:
+            row = self._disk.execute(
+                "SELECT vector, created_at FROM query_embedding WHERE model = ? AND text = ?", key
+            ).fetchone()
+        if row is None:
+            return None
+        if self.disk_ttl and row[1] + self.disk_ttl < time.time():
+            return None
+        return array("f", row[0]).tolist()
+
+    def _disk_put(self, key: Tuple[str, str], vector: List[float]):
+        with self._disk_lock:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO query_embedding (model, text, vector, created_at) VALUES (?, ?, ?, ?)",
+                (key[0], key[1], array("f", vector).tobytes(), time.time())
+            )
+            self._disk.commit()
+        if time.monotonic() - self._pruned_at >= DISK_PRUNE_INTERVAL:
+            self._disk_prune()
+
+    def _disk_prune(self):
+        """만료된 행 삭제 + 행 수 상한을 넘으면 오래된 순으로 삭제 (여러 워커가 실행해도 결과는 같음)"""
+        self._pruned_at = time.monotonic()
+        with self._disk_lock:
+            deleted = 0
+            if self.disk_ttl:
+                deleted += self._disk.execute(
+                    "DELETE FROM query_embedding WHERE created_at < ?", (time.time() - self.disk_ttl,)
+                ).rowcount
+            if self.disk_max_rows > 0:
+                deleted += self._disk.execute(
+                    "DELETE FROM query_embedding WHERE rowid IN ("
+                    " SELECT rowid FROM query_embedding ORDER BY created_at"
+                    " LIMIT max(0, (SELECT count(*) FROM query_embedding) - ?))",
+                    (self.disk_max_rows,)
+                ).rowcount
+            self._disk.commit()
+        if deleted:
+            self._stats["disk_pruned"] += deleted
+            logger.info(f"[EmbeddingCache] 디스크 캐시 정리 : {deleted}행 삭제")
+
+    ########################################################
+    async def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = (model, normalize_text(text))
+        vector = self._memory_get(key)
+        if vector is not None:
+            self._stats["memory_hits"] += 1
+            return vector
+        if self._disk is not None:
+            try:
+                vector = await asyncio.to_thread(self._disk_get, key)
+            except Exception as e:
+                logger.warning(f"[EmbeddingCache] 디스크 캐시 조회 실패: {e}")
+                vector = None
+            if vector is not None:
+                self._stats["disk_hits"] += 1
+                self._memory_put(key, vector)
+                return vector
+        self._stats["misses"] += 1
+        return None
+
+    async def put(self, model: str, text: str, vector: List[float]):
+        key = (model, normalize_text(text))
+        vector = list(vector)
+        self._memory_put(key, vector)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk_put, key, vector)
+            except Exception as e:
+                logger.warning(f"[EmbeddingCache] 디스크 캐시 저장 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        return {
+            **self._stats,
+            "size": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_enabled": self._disk is not None,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+embedding_cache = EmbeddingCache(
+    settings.EMBED_CACHE_MAX_ENTRIES,
+    settings.EMBED_CACHE_TTL,
+    settings.EMBED_CACHE_DISK_PATH,
+    settings.EMBED_CACHE_DISK_TTL,
+    settings.EMBED_CACHE_DISK_MAX_ROWS,
+)
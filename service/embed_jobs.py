@@ -0,0 +1,255 @@
+"""
+jobs1 임베딩 갱신 모듈
+- company + title + description + qualifications 원문의 md5 해시를 모델별 컬럼(embedding768_hash, embedding1536_hash)에 저장
+- 원문이 바뀌었거나 임베딩이 없는 행만 다시 임베딩 (full=True면 전체)
+- 서버 측 커서로 스트리밍 조회 + 배치 임베딩 + executemany 일괄 저장
+- 양자화 사본(_half, _bit)은 원본 저장 시 트리거가 함께 갱신 (sql/008_quantized_embeddings.sql)
+- EMBED_AUTO_REFRESH가 켜져 있으면 jobs1_embed 알림으로 받은 id를 모아서 자동 재임베딩
+  (여러 워커 중 advisory lock을 잡은 워커만 처리)
+"""
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from common_fastapi.shared.db import get_db_connection
+from common_fastapi.shared.logger import logger
+from common_fastapi.ai.embed_openai import _client_embed
+from service.config import settings
+from service.models import model_registry, encode_batch
+
+# 자동 재임베딩 워커 간 중복 방지용 advisory lock 이름 (모델별로 ":768" 등을 붙여 hashtext)
+AUTO_REEMBED_LOCK = "jobs1_auto_reembed"
+
+# 임베딩 원문 식 (sql/001_embedding_hash.sql의 jobs1_embed_text와 동일)
+EMBED_TEXT_SQL = "public.jobs1_embed_text(company, title, description, qualifications)"
+
+
+def _embed_768(texts: List[str]) -> List[List[float]]:
+    return encode_batch(model_registry.get_768(), texts)
+
+
+def _embed_1536(texts: List[str]) -> List[List[float]]:
+    response = _client_embed.embeddings.create(
+        model="text-embedding-3-small",
+        input=texts
+    )
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+EMBED_TARGETS = {
+    "768": {"field": "embedding768", "label": "768 Embeddings", "embed": _embed_768,
+            "batch_size": settings.EMBED_BATCH_SIZE_768},
+    "1536": {"field": "embedding1536", "label": "1536 Embeddings", "embed": _embed_1536,
+             "batch_size": settings.EMBED_BATCH_SIZE_1536},
+}
+
+
+def build_embed_text(row) -> str:
+    """임베딩할 텍스트 생성 (빈 값 제외하고 공백으로 결합)"""
+    text_parts = []
+    for key in ("company", "title", "description", "qualifications"):
+        if row[key]:
+            text_parts.append(row[key])
+    return ' '.join(text_parts)
+
+
+def _target_where(field: str, full: bool, ids: Optional[List[int]], after_id: Optional[int]):
+    """재임베딩 대상 조건 : 원문 해시가 다르거나 임베딩이 없는 행 (after_id 이후부터)"""
+    where = " WHERE TRUE"
+    params = []
+    if not full:
+        where += f" AND ({field} IS NULL OR {field}_hash IS DISTINCT FROM md5({EMBED_TEXT_SQL}))"
+    if ids:
+        params.append(ids)
+        where += f" AND id = ANY(${len(params)}::int[])"
+    if after_id is not None:
+        params.append(after_id)
+        where += f" AND id > ${len(params)}"
+    return where, params
+
+
+class Progress:
+    """배치마다 갱신되는 진행 상황 (processed = 성공 + 실패)"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.processed = 0
+        self.updated = 0
+        self.failed_ids: List[int] = []
+        self.last_id: Optional[int] = None
+
+    def fail(self, job_id: int):
+        self.failed_ids.append(job_id)
+
+
+async def _embed_rows(target: Dict[str, Any], rows: List[Any], progress: Progress,
+                      executor: Optional[Executor]) -> List[tuple]:
+    """
+    배치 임베딩 : 텍스트 없는 행은 실패 처리
+    배치 호출이 실패하면 문제 행을 가려내기 위해 한 건씩 다시 시도
+    Returns: UPDATE 파라미터 리스트 [(embedding, src_hash, id), ...]
+    """
+    label = target["label"]
+    valid = []
+    for row in rows:
+        text = build_embed_text(row)
+        if not text.strip():
+            logger.warning(f"[{label}] Job ID {row['id']}: 임베딩할 텍스트 없음")
+            progress.fail(row['id'])
+            continue
+        valid.append((row, text))
+    if not valid:
+        return []
+
+    loop = asyncio.get_running_loop()
+    try:
+        embeddings = await loop.run_in_executor(executor, target["embed"], [text for _, text in valid])
+    except Exception as e:
+        logger.warning(f"[{label}] 배치 임베딩 실패 - 한 건씩 재시도: {e}")
+        embeddings = []
+        for row, text in valid:
+            try:
+                embeddings.append((await loop.run_in_executor(executor, target["embed"], [text]))[0])
+            except Exception as e:
+                logger.exception(f"[{label}] Job ID {row['id']} 처리 실패: {e}")
+                embeddings.append(None)
+
+    records = []
+    for (row, _), embedding in zip(valid, embeddings):
+        if embedding is None or len(embedding) == 0:
+            logger.error(f"[{label}] Job ID {row['id']}: 임베딩 생성 실패")
+            progress.fail(row['id'])
+            continue
+        records.append((embedding, row['src_hash'], row['id']))
+    return records
+
+
+async def reembed(model: str, full: bool = False, ids: Optional[List[int]] = None,
+                  after_id: Optional[int] = None,
+                  on_batch: Optional[Callable[[Progress], Awaitable[bool]]] = None,
+                  executor: Optional[Executor] = None) -> Dict[str, Any]:
+    """
+    model("768" 또는 "1536") 임베딩 갱신
+    - full=False : 원문이 바뀌었거나 임베딩이 없는 행만 처리
+    - ids : 지정한 id만 대상으로 제한
+    - after_id : 이 id 이후부터 처리 (중단된 작업 재개용)
+    - on_batch : 배치 저장(커밋) 직후 호출, False를 반환하면 중단 (취소)
+    - executor : 임베딩 계산을 실행할 스레드 풀 (None이면 기본 풀)
+    - 서버 측 커서로 batch_size씩 읽어서 배치 임베딩 후 executemany로 일괄 저장 (메모리 사용량 일정)
+    """
+    target = EMBED_TARGETS[model]
+    field = target["field"]
+    label = target["label"]
+    batch_size = target["batch_size"]
+    if model == "1536" and not _client_embed:
+        raise Exception("OpenAI API Key가 설정되지 않았습니다")
+
+    start_time = time.time()
+    where, params = _target_where(field, full, ids, after_id)
+    update_query = f"""
+        UPDATE public.jobs1
+        SET {field} = $1::vector, {field}_hash = $2
+        WHERE id = $3
+    """
+    cancelled = False
+
+    # 읽기용(커서) 커넥션과 쓰기용 커넥션 분리 : 쓰기는 배치마다 바로 커밋됨
+    async with get_db_connection() as read_conn, get_db_connection() as write_conn:
+        total = await read_conn.fetchval(f"SELECT count(*) FROM public.jobs1{where}", *params)
+        progress = Progress(total)
+        logger.info(f"[{label}] 처리할 레코드: {total}개 (full={full}, after_id={after_id}, batch_size={batch_size})")
+
+        async def flush(rows) -> bool:
+            records = await _embed_rows(target, rows, progress, executor)
+            if records:
+                await write_conn.executemany(update_query, records)
+                progress.updated += len(records)
+            progress.processed += len(rows)
+            progress.last_id = rows[-1]['id']
+            logger.info(f"[{label}] 진행 중... {progress.processed}/{total}")
+            return await on_batch(progress) if on_batch else True
+
+        async with read_conn.transaction(): # 서버 측 커서는 트랜잭션 안에서만 사용 가능
+            rows = []
+            async for row in read_conn.cursor(f"""
+                SELECT id, company, title, description, qualifications, md5({EMBED_TEXT_SQL}) AS src_hash
+                  FROM public.jobs1{where}
+                 ORDER BY id
+            """, *params, prefetch=batch_size):
+                rows.append(row)
+                if len(rows) >= batch_size:
+                    if not await flush(rows):
+                        cancelled = True
+                        break
+                    rows = []
+            if rows and not cancelled:
+                cancelled = not await flush(rows)
+
+    duration = time.time() - start_time
+    updated = progress.updated
+    failed = len(progress.failed_ids)
+
+    logger.info(f"[{label}] {'취소' if cancelled else '완료'} - 총: {total}, 성공: {updated}, 실패: {failed}, 소요시간: {duration:.1f}초")
+
+    return {
+        "success": True,
+        "cancelled": cancelled,
+        "total": total,
+        "updated": updated,
+        "failed": failed,
+        "failed_ids": progress.failed_ids,
+        "last_id": progress.last_id,
+        "duration": duration
+    }
+
+
+class AutoReembedder:
+    """jobs1_embed 알림으로 받은 id를 delay초 동안 모아서 한 번에 재임베딩"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._pending: Set[int] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def on_notify(self, payload: str):
+        try:
+            self._pending.add(int(payload))
+        except ValueError:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _reembed_locked(self, model: str, ids: List[int]):
+        """
+        모델별 advisory lock을 잡은 워커만 재임베딩
+        - 알림은 모든 워커가 받으므로 lock이 없으면 같은 id를 워커 수만큼 임베딩함
+        - lock을 못 잡으면 커넥션을 반납하고 delay초 뒤 다시 시도 : 먼저 처리한 워커가 해시를 갱신했으면
+          reembed의 해시 비교에서 대상이 0건이 되어 임베딩 없이 끝남 (워커마다 모은 id가 달라도 누락 없음)
+        """
+        key = f"{AUTO_REEMBED_LOCK}:{model}"
+        while True:
+            async with get_db_connection() as conn:
+                if await conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", key):
+                    try:
+                        await reembed(model, ids=ids)
+                    finally:
+                        await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", key)
+                    return
+            logger.info(f"[AutoReembedder] {model} 다른 워커가 재임베딩 중 - {self.delay}초 후 재시도")
+            await asyncio.sleep(self.delay)
+
+    async def _flush(self):
+        while self._pending: # 처리 중에 들어온 id도 이어서 처리
+            await asyncio.sleep(self.delay)
+            ids = sorted(self._pending)
+            self._pending.clear()
+            for model in EMBED_TARGETS:
+                if model == "1536" and not _client_embed:
+                    continue
+                try:
+                    await self._reembed_locked(model, ids)
+                except Exception as e:
+                    logger.exception(f"[AutoReembedder] {model} 자동 재임베딩 실패: {e}")
+
+
+auto_reembedder = AutoReembedder(settings.EMBED_AUTO_DELAY)
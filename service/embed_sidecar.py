@@ -0,0 +1,232 @@
+"""
+임베딩 사이드카 (여러 uvicorn 워커가 jhgan 모델 1개를 공유)
+- 사이드카 프로세스(scripts/embed_sidecar.py)가 모델을 로드하고 Unix 도메인 소켓으로 배치 임베딩 요청을 처리
+  (여러 워커에서 동시에 들어온 문장을 EmbeddingService 마이크로 배치로 다시 묶어서 encode)
+- 워커 쪽 SidecarEmbedder는 EmbedderKo와 같은 방식(model.encode, create_embedding)으로 사용하므로
+  검색(EmbeddingService)과 관리자 재임베딩(embed_jobs)이 코드 변경 없이 사이드카를 사용 (ModelRegistry.get_768)
+- 워커 시작 시 사이드카가 응답할 때까지 기다림 (그동안 /ready 503, ModelRegistry.load)
+- 실행 중 사이드카에 연결할 수 없으면 EMBED_SIDECAR_RETRY초 동안 오류 (/ready도 503) 후 다시 시도
+  EMBED_SIDECAR_FALLBACK이면 그동안 프로세스 내 모델로 처리하고, 사이드카가 다시 응답하면 그 모델은 해제
+
+프로토콜 (little-endian, 프레임 = u32 본문 길이 + 본문)
+  요청 : u32 요청 id, u8 명령(1=embed), u16 문장 수, 문장마다 u32 바이트 수 + UTF-8
+  응답 : u32 요청 id, u8 상태(0=성공), 성공이면 u16 문장 수 + u16 차원 + float32 x 문장 수 x 차원
+         실패면 UTF-8 오류 메시지
+"""
+import asyncio
+import socket
+import struct
+import threading
+import time
+from itertools import count
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import numpy as np
+from common_fastapi.shared.logger import logger
+
+OP_EMBED = 1
+STATUS_OK = 0
+STATUS_ERROR = 1
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+MAX_TEXTS = 0xFFFF
+
+_LENGTH = struct.Struct("<I")
+_REQUEST_HEAD = struct.Struct("<IBH")
+_RESPONSE_HEAD = struct.Struct("<IB")
+_MATRIX_HEAD = struct.Struct("<HH")
+
+
+class SidecarError(Exception):
+    """사이드카가 오류 응답을 보냄 (연결 문제가 아니므로 대체 처리하지 않음)"""
+
+
+def _frame(body: bytes) -> bytes:
+    if len(body) > MAX_FRAME_BYTES:
+        raise ValueError(f"프레임이 너무 큼 ({len(body)} bytes)")
+    return _LENGTH.pack(len(body)) + body
+
+
+def encode_request(request_id: int, texts: Sequence[str]) -> bytes:
+    if len(texts) > MAX_TEXTS:
+        raise ValueError(f"한 번에 보낼 수 있는 문장 수 초과 ({len(texts)})")
+    parts = [_REQUEST_HEAD.pack(request_id, OP_EMBED, len(texts))]
+    for text in texts:
+        data = text.encode("utf-8")
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return _frame(b"".join(parts))
+
+
+def decode_request(body: bytes) -> Tuple[int, int, List[str]]:
+    request_id, op, n = _REQUEST_HEAD.unpack_from(body)
+    offset, texts = _REQUEST_HEAD.size, []
+    for _ in range(n):
+        (length,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        texts.append(body[offset:offset + length].decode("utf-8"))
+        offset += length
+    return request_id, op, texts
+
+
+def encode_response(request_id: int, vectors: Sequence[Sequence[float]]) -> bytes:
+    matrix = np.asarray(vectors, dtype="<f4") if len(vectors) else np.empty((0, 0), dtype="<f4")
+    head = _RESPONSE_HEAD.pack(request_id, STATUS_OK) + _MATRIX_HEAD.pack(matrix.shape[0], matrix.shape[1])
+    return _frame(head + matrix.tobytes())
+
+
+def encode_error(request_id: int, message: str) -> bytes:
+    return _frame(_RESPONSE_HEAD.pack(request_id, STATUS_ERROR) + message.encode("utf-8"))
+
+
+def decode_response(body: bytes) -> Tuple[int, np.ndarray]:
+    request_id, status = _RESPONSE_HEAD.unpack_from(body)
+    if status != STATUS_OK:
+        raise SidecarError(body[_RESPONSE_HEAD.size:].decode("utf-8", "replace"))
+    n, dims = _MATRIX_HEAD.unpack_from(body, _RESPONSE_HEAD.size)
+    offset = _RESPONSE_HEAD.size + _MATRIX_HEAD.size
+    return request_id, np.frombuffer(body, dtype="<f4", count=n * dims, offset=offset).reshape(n, dims)
+
+
+async def read_frame(reader) -> Optional[bytes]:
+    """asyncio StreamReader에서 프레임 본문 1개 (연결이 끝났으면 None, 길이가 비정상이면 ValueError)"""
+    try:
+        (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+        if length > MAX_FRAME_BYTES:
+            raise ValueError(f"프레임이 너무 큼 ({length} bytes)")
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view, received = memoryview(buffer), 0
+    while received < size:
+        chunk = sock.recv_into(view[received:], size - received)
+        if chunk == 0:
+            raise ConnectionError("사이드카 연결 종료")
+        received += chunk
+    return bytes(buffer)
+
+
+class SidecarEmbedder:
+    """
+    사이드카 클라이언트 (EmbedderKo와 같은 방식으로 사용 : model.encode, create_embedding)
+    - 임베딩 스레드(검색 마이크로 배치, 재임베딩 작업)에서 호출되므로 스레드별 블로킹 소켓 연결
+    - fallback_loader : 사이드카에 연결할 수 없을 때 쓸 프로세스 내 모델 (None이면 오류)
+    - on_recover : 연결 실패 후 사이드카가 다시 응답했을 때 호출 (프로세스 내 모델 해제)
+    """
+
+    def __init__(self, socket_path: str, timeout: float, retry_after: float,
+                 fallback_loader: Optional[Callable[[], Any]] = None,
+                 on_recover: Optional[Callable[[], None]] = None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.model = self  # encode_batch가 model.encode로 배치 처리하도록
+        self._fallback_loader = fallback_loader
+        self._on_recover = on_recover
+        self._local = threading.local()
+        self._ids = count(1)
+        self._retry_at = 0.0
+        self._stats = {"requests": 0, "texts": 0, "failures": 0, "fallback_requests": 0}
+        self._last_error: Optional[str] = None
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _request(self, texts: List[str]) -> np.ndarray:
+        request_id = next(self._ids) & 0xFFFFFFFF
+        sock = self._connection()
+        try:
+            sock.sendall(encode_request(request_id, texts))
+            (length,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+            if length > MAX_FRAME_BYTES:
+                raise ConnectionError(f"잘못된 응답 길이 ({length})")
+            response_id, vectors = decode_response(_recv_exact(sock, length))
+        except SidecarError:
+            raise
+        except BaseException:
+            self._close() # 응답을 끝까지 읽지 못한 연결은 다시 쓰지 않음
+            raise
+        if response_id != request_id or len(vectors) != len(texts):
+            self._close()
+            raise ConnectionError("사이드카 응답이 요청과 맞지 않음")
+        return vectors
+
+    def _remote(self, texts: List[str]) -> np.ndarray:
+        """사이드카에만 요청 (실패하면 OSError, 연결 실패 후 처음 성공하면 on_recover 호출)"""
+        try:
+            vectors = np.concatenate([
+                self._request(texts[start:start + MAX_TEXTS]) for start in range(0, len(texts), MAX_TEXTS)
+            ])
+        except OSError as e: # 연결 실패, 시간 초과, 연결 끊김
+            self._stats["failures"] += 1
+            self._last_error = str(e)
+            self._retry_at = time.monotonic() + self.retry_after
+            raise
+        self._stats["requests"] += 1
+        self._stats["texts"] += len(texts)
+        if self._retry_at:
+            self._retry_at = 0.0
+            logger.info("[SidecarEmbedder] 사이드카 연결 복구")
+            if self._on_recover is not None:
+                self._on_recover()
+        return vectors
+
+    def probe(self, texts: List[str]) -> np.ndarray:
+        """대체 처리 없이 사이드카에 요청 (시작 시 대기 / 워밍업용, 재시도 대기 시간도 무시)"""
+        return self._remote(list(texts))
+
+    @property
+    def available(self) -> bool:
+        """연결 실패 후 재시도 대기 중이 아니면 True"""
+        return time.monotonic() >= self._retry_at
+
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True, show_progress_bar: bool = False):
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self.available:
+            try:
+                return self._remote(texts)
+            except OSError as e:
+                if self._fallback_loader is None:
+                    raise
+                logger.warning(f"[SidecarEmbedder] 사이드카 연결 실패 ({e}) - {self.retry_after}초 동안 프로세스 내 모델 사용")
+        elif self._fallback_loader is None:
+            raise ConnectionError(f"사이드카 연결 실패 후 재시도 대기 중: {self._last_error}")
+        self._stats["fallback_requests"] += 1
+        from service.models import encode_batch # 순환 import 방지
+        return np.asarray(encode_batch(self._fallback_loader(), texts), dtype=np.float32)
+
+    def create_embedding(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+    def status(self) -> dict:
+        return {
+            **self._stats,
+            "socket": self.socket_path,
+            "fallback": self._fallback_loader is not None,
+            "available": self.available,
+            "retry_in": round(max(0.0, self._retry_at - time.monotonic()), 1),
+            "last_error": self._last_error,
+        }
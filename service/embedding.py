@@ -0,0 +1,116 @@
+"""
+쿼리 임베딩 서비스
+- jhgan(768) 모델 추론을 전용 스레드에서 실행하여 이벤트 루프를 막지 않음
+- 동시에 들어온 requirements 문장들을 마이크로 배치로 묶어 한 번에 encode (최대 배치 크기, 최대 대기 ms)
+- 요청한 노드에는 Future를 돌려주고 배치 결과가 나오면 각각 채워줌
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+from common_fastapi.shared.logger import logger
+from common_fastapi.ai.embed_openai import _client_embed
+from service.config import settings
+from service.embed_cache import embedding_cache, normalize_text
+from service.models import model_registry, encode_batch
+from service.metrics import EMBED_BATCH_SIZE, stage_timer
+
+class EmbeddingService:
+
+    def __init__(self, loader: Callable[[], Any], max_batch_size: int, max_wait_ms: float):
+        self._loader = loader
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        return encode_batch(self._loader(), texts)
+
+    async def embed(self, text: str) -> List[float]:
+        """문장 1개 임베딩 (다른 요청과 함께 배치 처리됨)"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        """첫 요청을 받은 뒤 max_wait 동안 또는 max_batch_size가 찰 때까지 모음"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            batch = [(text, future) for text, future in batch if not future.done()] # 취소된 요청 제외
+            if not batch:
+                continue
+            EMBED_BATCH_SIZE.observe(len(batch))
+            try:
+                with stage_timer("embed", "jhgan"):
+                    vectors = await loop.run_in_executor(self._executor, self._encode, [text for text, _ in batch])
+                for (_, future), vector in zip(batch, vectors):
+                    if not future.done():
+                        future.set_result(vector)
+            except Exception as e:
+                logger.exception(f"[EmbeddingService] 배치 임베딩 실패 ({len(batch)}건): {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+embedding_service_768 = EmbeddingService(
+    model_registry.get_768, settings.EMBED_MAX_BATCH_SIZE, settings.EMBED_MAX_WAIT_MS
+)
+
+
+EMBEDDING_FIELDS = {"jhgan": "embedding768", "openai": "embedding1536"}
+
+
+async def _create_embedding(embedding_model: str, text: str) -> List[float]:
+    if embedding_model == "jhgan":
+        return await embedding_service_768.embed(text)
+    if not _client_embed:
+        raise Exception("OpenAI API Key가 설정되지 않았습니다")
+    with stage_timer("embed", "openai"):
+        response = await asyncio.to_thread(
+            _client_embed.embeddings.create, model="text-embedding-3-small", input=text
+        )
+    return response.data[0].embedding
+
+
+async def embed_query(embedding_model: str, text: str) -> Tuple[List[float], str]:
+    """
+    검색어(requirements) 임베딩 생성 (캐시 우선)
+    Returns: (embedding, embedding_field)
+    """
+    embedding_field = EMBEDDING_FIELDS.get(embedding_model)
+    if embedding_field is None:
+        raise Exception(f"지원하지 않는 임베딩 모델: {embedding_model}")
+    
+    text = normalize_text(text) # 캐시 키와 같은 텍스트로 임베딩 (원문 표기 차이로 같은 키에 다른 벡터가 저장되지 않도록)
+    embedding = await embedding_cache.get(embedding_model, text)
+    if embedding is None:
+        embedding = await _create_embedding(embedding_model, text)
+        if embedding:
+            await embedding_cache.put(embedding_model, text, embedding)
+    return embedding, embedding_field
@@ -0,0 +1,47 @@
+"""
+일자리 상세 조회 (GET /chat/jobs/{id})
+- 검색 결과 목록은 카드 필드만 보내므로(graph/nodes/job_card.py) 전체 description, qualifications 등은 여기서 조회
+- ACTIVE가 아닌 행도 반환 (목록을 받은 뒤 마감된 경우 status로 표시)
+- 결과는 ResultCache에 id별로 보관하고 jobs1_changed 알림(sql/005, sql/010)을 받으면 전체 무효화
+"""
+from typing import Any, Dict, Optional
+from common_fastapi.shared.logger import logger
+from service.config import settings
+from service.metrics import db_connection
+from service.result_cache import ResultCache
+from service.statements import statement_registry
+
+JOB_DETAIL_SQL = """
+    SELECT id, company, title, location, hourly_wage, work_days, start_time, end_time,
+           category, gender, age, description, qualifications, deadline, status, created_at
+      FROM public.jobs1
+     WHERE id = $1
+"""
+
+job_detail_cache = ResultCache(
+    "job_detail", settings.JOB_DETAIL_CACHE_MAX_ENTRIES, settings.JOB_DETAIL_CACHE_MAX_BYTES,
+    settings.JOB_DETAIL_CACHE_MAX_AGE
+)
+
+statement_registry.register("job_detail", JOB_DETAIL_SQL, 0)
+
+
+async def get_job_detail(job_id: int) -> Optional[Dict[str, Any]]:
+    """id로 일자리 전체 내용 조회 (없으면 None, 없는 id는 캐시하지 않음)"""
+    key = str(job_id)
+    if settings.JOB_DETAIL_CACHE_ENABLED:
+        cached = job_detail_cache.get(key)
+        if cached is not None:
+            return cached
+    cache_version = job_detail_cache.version
+
+    async with db_connection("job_detail") as conn:
+        rows = await statement_registry.fetch(conn, "job_detail", JOB_DETAIL_SQL, job_id)
+    if not rows:
+        logger.info(f"[job_detail] 일자리 없음 - id {job_id}")
+        return None
+
+    detail = dict(rows[0])
+    if settings.JOB_DETAIL_CACHE_ENABLED:
+        job_detail_cache.put(key, detail, cache_version)
+    return detail
@@ -0,0 +1,164 @@
+"""
+임베딩 재생성 백그라운드 작업 관리
+- 작업을 등록하면 job_id를 바로 반환하고 백그라운드에서 실행
+- 배치가 커밋될 때마다 public.embed_job에 진행률과 체크포인트(last_id) 저장
+- 취소는 DB 상태(CANCELLING)로 전달하므로 다른 워커에서 요청해도 다음 배치 경계에서 멈춤
+- 재개 시 마지막 체크포인트 이후부터 처리
+- 임베딩 계산은 전용 스레드 풀에서 실행하고 동시 실행 작업 수를 제한하여 /chat 지연에 주는 영향을 줄임
+"""
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from common_fastapi.shared.db import get_db_connection
+from common_fastapi.shared.logger import logger
+from service.config import settings
+from service.embed_jobs import EMBED_TARGETS, Progress, reembed
+
+
+class EmbedJobRunner:
+
+    def __init__(self, max_concurrency: int, threads: int, stale_sec: float):
+        self.stale_sec = stale_sec
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="embed-job")
+        self._tasks: Dict[str, asyncio.Task] = {}  # 이 워커에서 실행 중인 작업
+
+    async def submit(self, model: str, full: bool) -> Dict[str, Any]:
+        """작업 등록 후 바로 반환"""
+        if model not in EMBED_TARGETS:
+            raise Exception(f"지원하지 않는 임베딩 모델: {model}")
+        job_id = uuid.uuid4().hex
+        async with get_db_connection() as conn:
+            await conn.execute(
+                "INSERT INTO public.embed_job (id, model, full_run) VALUES ($1, $2, $3)",
+                job_id, model, full
+            )
+        self._start(job_id)
+        return await self.get(job_id)
+
+    async def resume(self, job_id: str) -> Dict[str, Any]:
+        """
+        취소/실패된 작업을 마지막 체크포인트부터 재개
+        RUNNING 상태라도 stale_sec 동안 체크포인트가 없으면 (서버 재시작 등으로) 중단된 것으로 보고 재개
+        """
+        if job_id in self._tasks:
+            raise Exception("이미 실행 중인 작업입니다")
+        async with get_db_connection() as conn:
+            status = await conn.fetchval(
+                """UPDATE public.embed_job SET status = 'PENDING', error = NULL, updated_at = now()
+                     WHERE id = $1
+                       AND (status IN ('CANCELLED', 'FAILED')
+                            OR (status IN ('RUNNING', 'CANCELLING') AND updated_at < now() - make_interval(secs => $2)))
+                 RETURNING status""",
+                job_id, self.stale_sec
+            )
+        if status is None:
+            raise Exception("재개할 수 없는 작업입니다 (없거나 이미 완료/대기 중)")
+        self._start(job_id)
+        return await self.get(job_id)
+
+    async def cancel(self, job_id: str) -> Dict[str, Any]:
+        async with get_db_connection() as conn:
+            await conn.execute(
+                """UPDATE public.embed_job
+                      SET status = CASE WHEN status = 'PENDING' THEN 'CANCELLED' ELSE 'CANCELLING' END,
+                          updated_at = now()
+                    WHERE id = $1 AND status IN ('PENDING', 'RUNNING')""",
+                job_id
+            )
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        async with get_db_connection() as conn:
+            row = await conn.fetchrow("SELECT * FROM public.embed_job WHERE id = $1", job_id)
+        return self._to_dict(row) if row else None
+
+    async def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        async with get_db_connection() as conn:
+            rows = await conn.fetch("SELECT * FROM public.embed_job ORDER BY created_at DESC LIMIT $1", limit)
+        return [self._to_dict(row) for row in rows]
+
+    def _to_dict(self, row) -> Dict[str, Any]:
+        job = dict(row)
+        for key in ("created_at", "started_at", "updated_at", "finished_at"):
+            job[key] = job[key].isoformat() if job[key] else None
+        job["failed_ids"] = list(job["failed_ids"] or [])
+        rate = None
+        eta = None
+        if row["started_at"] and row["status"] in ("RUNNING", "CANCELLING"):
+            elapsed = (row["updated_at"] - row["started_at"]).total_seconds()
+            done = row["processed"] - row["run_base"]
+            if elapsed > 0 and done > 0:
+                rate = done / elapsed
+                eta = max(0, row["total"] - row["processed"]) / rate
+        job["rows_per_sec"] = round(rate, 2) if rate else None
+        job["eta_sec"] = round(eta, 1) if eta is not None else None
+        job["running_here"] = row["id"] in self._tasks
+        return job
+
+    def _start(self, job_id: str):
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job_id: str):
+        async with self._semaphore: # 동시 실행 작업 수 제한 (나머지는 PENDING으로 대기)
+            async with get_db_connection() as conn:
+                job = await conn.fetchrow(
+                    """UPDATE public.embed_job
+                          SET status = 'RUNNING', started_at = now(), updated_at = now(), run_base = processed
+                        WHERE id = $1 AND status = 'PENDING'
+                    RETURNING *""",
+                    job_id
+                )
+            if job is None: # 대기 중에 취소됨
+                return
+
+            base_processed = job["processed"]
+            base_updated = job["updated"]
+            base_failed = list(job["failed_ids"] or [])
+
+            async def on_batch(progress: Progress) -> bool: # 배치 커밋 직후 체크포인트 저장, 취소 요청 확인
+                async with get_db_connection() as conn:
+                    status = await conn.fetchval(
+                        """UPDATE public.embed_job
+                              SET total = $2, processed = $3, updated = $4, failed_ids = $5,
+                                  last_id = $6, updated_at = now()
+                            WHERE id = $1
+                        RETURNING status""",
+                        job_id, base_processed + progress.total, base_processed + progress.processed,
+                        base_updated + progress.updated, base_failed + progress.failed_ids,
+                        progress.last_id
+                    )
+                return status != "CANCELLING"
+
+            try:
+                result = await reembed(
+                    job["model"], full=job["full_run"], after_id=job["last_id"],
+                    on_batch=on_batch, executor=self._executor
+                )
+                final_status = "CANCELLED" if result["cancelled"] else "DONE"
+                async with get_db_connection() as conn:
+                    await conn.execute(
+                        """UPDATE public.embed_job
+                              SET status = $2, updated_at = now(), finished_at = now(),
+                                  total = CASE WHEN $2 = 'DONE' THEN processed ELSE total END
+                            WHERE id = $1""",
+                        job_id, final_status
+                    )
+                logger.info(f"[EmbedJobRunner] {job_id} {final_status}")
+            except Exception as e:
+                logger.exception(f"[EmbedJobRunner] {job_id} 실패: {e}")
+                async with get_db_connection() as conn:
+                    await conn.execute(
+                        """UPDATE public.embed_job
+                              SET status = 'FAILED', error = $2, updated_at = now(), finished_at = now()
+                            WHERE id = $1""",
+                        job_id, str(e)
+                    )
+
+
+embed_job_runner = EmbedJobRunner(
+    settings.EMBED_JOB_MAX_CONCURRENCY, settings.EMBED_JOB_THREADS, settings.EMBED_JOB_STALE_SEC
+)
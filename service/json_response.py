@@ -0,0 +1,41 @@
+"""
+빠른 JSON 직렬화 (orjson)
+- 검색 결과 응답을 응답 모델 검증 / jsonable_encoder 없이 바로 bytes로 직렬화
+- date/datetime은 ISO 형식, Decimal은 float, pydantic 모델(rsObj 응답 등)은 model_dump, 그 외는 str
+- orjson이 설치되어 있지 않으면 표준 json 사용 (결과는 같고 속도만 다름)
+"""
+import json
+from decimal import Decimal
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError: # requirements.txt에 포함되어 있지만 없어도 동작
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"): # 표준 json 경로의 date/datetime/time
+        return value.isoformat()
+    if hasattr(value, "keys"): # asyncpg Record
+        return dict(value)
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse와 같은 응답 형식, 직렬화만 dumps 사용 (엔드포인트에서 반환하면 response_model 검증 생략)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
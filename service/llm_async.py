@@ -0,0 +1,144 @@
+"""
+비동기 LLM 호출 모듈
+- classify_input 노드가 이벤트 루프를 막지 않도록 AsyncOpenAI 클라이언트로 호출
+- 워커당 동시 호출 수 제한(세마포어)과 호출 1건당 제한시간 적용
+- 비동기 클라이언트를 쓸 수 없거나 오류가 나면 기존 LLMClient(동기)를 스레드에서 실행하여 대체
+- 호출마다 프롬프트/캐시/응답 토큰 수와 지연시간을 기록 (stats)
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from openai import AsyncOpenAI
+from common_fastapi.ai.llm_openai import LLMClient
+from common_fastapi.shared.logger import logger
+from service.config import settings
+from service.metrics import LLM_OUTCOMES, record_llm
+
+
+def parse_json_text(text: str) -> Dict[str, Any]: # JSON 파싱 실패 시 빈 딕셔너리 반환 (동기 대체 경로용)
+    try:
+        return json.loads(text)
+    except Exception:
+        start = text.find("{")
+        end = text.rfind("}")
+        if start != -1 and end != -1:
+            try:
+                return json.loads(text[start:end+1])
+            except Exception:
+                pass
+        return {}
+
+
+class AsyncLLM:
+
+    def __init__(self, model: str, max_concurrency: int, timeout: float):
+        self.model = model
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._client: Optional[AsyncOpenAI] = None
+        self._sync_llm: Optional[LLMClient] = None
+        self._stats = {
+            "calls": 0, "timeouts": 0, "fallbacks": 0,
+            "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "latency_sum": 0.0,
+        }
+
+    def _get_client(self) -> Optional[AsyncOpenAI]:
+        """AsyncOpenAI 클라이언트 싱글톤 (API Key가 없으면 None)"""
+        if self._client is None:
+            api_key = os.getenv("OPENAI_API_KEY") or os.getenv("API_KEY")
+            if not api_key:
+                return None
+            self._client = AsyncOpenAI(api_key=api_key, timeout=self.timeout, max_retries=1)
+        return self._client
+
+    def _get_sync_llm(self) -> LLMClient:
+        """대체 경로용 동기 LLMClient 싱글톤"""
+        if self._sync_llm is None:
+            self._sync_llm = LLMClient()
+        return self._sync_llm
+
+    def _record(self, name: str, response: Any, latency: float):
+        """토큰 사용량과 지연시간 기록"""
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        self._stats["calls"] += 1
+        self._stats["prompt_tokens"] += prompt_tokens
+        self._stats["cached_tokens"] += cached_tokens
+        self._stats["completion_tokens"] += completion_tokens
+        self._stats["latency_sum"] += latency
+        record_llm(name, latency, prompt_tokens, cached_tokens, completion_tokens)
+        logger.info(
+            f"[AsyncLLM] {name} prompt={prompt_tokens} cached={cached_tokens} "
+            f"completion={completion_tokens} latency={latency * 1000:.0f}ms"
+        )
+
+    async def _sync_fallback(self, messages: List[Dict[str, Any]], deadline: float) -> Optional[str]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._stats["timeouts"] += 1
+            LLM_OUTCOMES.labels("timeout").inc()
+            return None
+        self._stats["fallbacks"] += 1
+        LLM_OUTCOMES.labels("fallback").inc()
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self._get_sync_llm().chat, messages),
+                timeout=remaining
+            )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            LLM_OUTCOMES.labels("timeout").inc()
+            logger.warning(f"[AsyncLLM] 동기 대체 호출 제한시간 초과")
+            return None
+
+    async def chat_json(self, messages: List[Dict[str, Any]], name: str, schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        JSON 스키마 구조화 출력(strict)으로 호출하여 딕셔너리 반환 (응답 파싱 보정 불필요)
+        - 동기 대체 경로에서만 텍스트에서 JSON을 찾아 파싱
+        - 제한시간 초과 시 None 반환
+        """
+        async with self._semaphore:
+            deadline = time.monotonic() + self.timeout
+            client = self._get_client()
+            if client is not None:
+                try:
+                    started = time.monotonic()
+                    response = await asyncio.wait_for(
+                        client.chat.completions.create(
+                            model=self.model,
+                            messages=messages,
+                            response_format={
+                                "type": "json_schema",
+                                "json_schema": {"name": name, "strict": True, "schema": schema},
+                            },
+                        ),
+                        timeout=self.timeout
+                    )
+                    self._record(name, response, time.monotonic() - started)
+                    return json.loads(response.choices[0].message.content)
+                except asyncio.TimeoutError:
+                    self._stats["timeouts"] += 1
+                    LLM_OUTCOMES.labels("timeout").inc()
+                    logger.warning(f"[AsyncLLM] 제한시간({self.timeout}초) 초과")
+                    return None
+                except Exception as e:
+                    logger.exception(f"[AsyncLLM] 비동기 호출 실패 - 동기 클라이언트로 대체: {e}")
+            raw_response = await self._sync_fallback(messages, deadline)
+            return None if raw_response is None else parse_json_text(raw_response)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self._stats["calls"]
+        return {
+            **self._stats,
+            "latency_avg_ms": round(self._stats["latency_sum"] / calls * 1000, 1) if calls else None,
+            "cached_ratio": round(self._stats["cached_tokens"] / self._stats["prompt_tokens"], 4)
+                            if self._stats["prompt_tokens"] else 0.0,
+        }
+
+
+async_llm = AsyncLLM(settings.LLM_MODEL, settings.LLM_MAX_CONCURRENCY, settings.LLM_TIMEOUT)
@@ -0,0 +1,150 @@
+"""
+Prometheus 메트릭 / 요청 추적 ID
+- 그래프 노드별 처리 시간, 구간별(DB 커넥션 획득, 쿼리 실행, 행 변환, 임베딩, LLM) 처리 시간 히스토그램
+- 처리 중인 요청/노드 수, DB 풀 크기/유휴 커넥션 수 게이지, LLM 토큰 카운터
+- GET /metrics (main.py) 에서 노출 : 여러 워커(uvicorn --workers)면 PROMETHEUS_MULTIPROC_DIR 지정 시 워커 합산
+- 요청마다 trace id(X-Request-ID 헤더 또는 새로 생성)를 contextvar에 두고 TRACE_ID_LOGGING이면 로그 앞에 붙임
+"""
+import functools
+import inspect
+import logging
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from common_fastapi.shared.db import get_db_connection
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_SECONDS = Histogram(
+    "gigchat_request_seconds", "HTTP 요청 처리 시간", ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge("gigchat_requests_in_flight", "처리 중인 HTTP 요청 수", multiprocess_mode="livesum")
+NODE_SECONDS = Histogram(
+    "gigchat_node_seconds", "그래프 노드 처리 시간", ["node"], buckets=LATENCY_BUCKETS
+)
+NODES_IN_FLIGHT = Gauge(
+    "gigchat_nodes_in_flight", "처리 중인 그래프 노드 수", ["node"], multiprocess_mode="livesum"
+)
+NODE_ERRORS = Counter("gigchat_node_errors_total", "그래프 노드 예외 수", ["node"])
+STAGE_SECONDS = Histogram(
+    "gigchat_stage_seconds", "구간별 처리 시간 (db_acquire, db_query, serialize, rerank, embed, llm)",
+    ["stage", "name"], buckets=LATENCY_BUCKETS
+)
+EMBED_BATCH_SIZE = Histogram(
+    "gigchat_embed_batch_size", "쿼리 임베딩 마이크로 배치 크기", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+LLM_TOKENS = Counter("gigchat_llm_tokens_total", "LLM 토큰 수", ["kind"])
+LLM_OUTCOMES = Counter("gigchat_llm_calls_total", "LLM 호출 결과 (ok, timeout, fallback)", ["outcome"])
+DB_POOL_SIZE = Gauge("gigchat_db_pool_size", "DB 풀 커넥션 수", multiprocess_mode="livesum")
+DB_POOL_IDLE = Gauge("gigchat_db_pool_idle", "DB 풀 유휴 커넥션 수", multiprocess_mode="livesum")
+DB_ACQUIRE_WAITING = Gauge(
+    "gigchat_db_acquire_waiting", "DB 커넥션을 기다리는 작업 수", multiprocess_mode="livesum"
+)
+
+trace_id_var: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+
+
+@contextmanager
+def stage_timer(stage: str, name: str = ""):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage, name).observe(time.perf_counter() - started)
+
+
+@asynccontextmanager
+async def db_connection(name: str = ""):
+    """get_db_connection + 커넥션 획득 대기 시간 기록"""
+    started = time.perf_counter()
+    DB_ACQUIRE_WAITING.inc()
+    try:
+        async with get_db_connection() as conn:
+            DB_ACQUIRE_WAITING.dec()
+            STAGE_SECONDS.labels("db_acquire", name).observe(time.perf_counter() - started)
+            started = None
+            yield conn
+    finally:
+        if started is not None: # 획득 전에 예외/취소
+            DB_ACQUIRE_WAITING.dec()
+
+
+def timed_node(name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """그래프 노드 처리 시간/처리 중 수/예외 수 기록 (동기, 비동기 노드 모두)"""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(state):
+            NODES_IN_FLIGHT.labels(name).inc()
+            started = time.perf_counter()
+            try:
+                return await fn(state)
+            except Exception:
+                NODE_ERRORS.labels(name).inc()
+                raise
+            finally:
+                NODE_SECONDS.labels(name).observe(time.perf_counter() - started)
+                NODES_IN_FLIGHT.labels(name).dec()
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(state):
+        started = time.perf_counter()
+        try:
+            return fn(state)
+        except Exception:
+            NODE_ERRORS.labels(name).inc()
+            raise
+        finally:
+            NODE_SECONDS.labels(name).observe(time.perf_counter() - started)
+    return wrapper
+
+
+def record_llm(name: str, latency: float, prompt_tokens: int, cached_tokens: int, completion_tokens: int):
+    STAGE_SECONDS.labels("llm", name).observe(latency)
+    LLM_OUTCOMES.labels("ok").inc()
+    LLM_TOKENS.labels("prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels("cached").inc(cached_tokens)
+    LLM_TOKENS.labels("completion").inc(completion_tokens)
+
+
+def update_pool_gauges(pool):
+    if pool is None:
+        return
+    try:
+        DB_POOL_SIZE.set(pool.get_size())
+        DB_POOL_IDLE.set(pool.get_idle_size())
+    except Exception:
+        pass
+
+
+def render_metrics(pool=None):
+    """(본문, content-type) - 멀티프로세스 모드면 모든 워커 값을 합산"""
+    update_pool_gauges(pool)
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def new_trace_id(header_value: Optional[str] = None) -> str:
+    trace_id = (header_value or "").strip()[:64] or uuid.uuid4().hex[:16]
+    trace_id_var.set(trace_id)
+    return trace_id
+
+
+class TraceIdFilter(logging.Filter):
+    """로그 메시지 앞에 [trace_id] 추가 (공통 로거의 포맷은 그대로)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace_id = trace_id_var.get()
+        record.trace_id = trace_id or "-"
+        if trace_id and not getattr(record, "_trace_prefixed", False):
+            record.msg = f"[{trace_id}] {record.msg}"
+            record._trace_prefixed = True
+        return True
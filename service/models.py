@@ -0,0 +1,171 @@
+"""
+임베딩 모델 레지스트리
+- 워커당 jhgan(768) 모델을 한 번만 로드하여 검색(EmbeddingService)과 관리자 재임베딩 작업이 함께 사용
+- lifespan에서 백그라운드로 로드 + 워밍업 추론까지 마친 뒤 ready (GET /ready 가 그때부터 200)
+- EMBED_BACKEND=onnx 이면 ONNX Runtime(int8 양자화) CPU 백엔드 사용 (선택 의존성 onnxruntime, transformers)
+  모델 파일은 scripts/onnx_embedder.py export 로 만들고, 같은 스크립트의 check 로 기존 임베딩과 일치도 확인
+- EMBED_SIDECAR_SOCKET 이 있으면 모델을 로드하지 않고 임베딩 사이드카(service/embed_sidecar.py)에 요청
+  (시작 시 사이드카가 응답할 때까지 ready가 아님, 실행 중 연결할 수 없을 때만 EMBED_SIDECAR_FALLBACK에 따라
+   프로세스 내 모델을 로드하고 사이드카가 복구되면 해제)
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from common_fastapi.shared.logger import logger
+from service.config import settings
+from service.embed_sidecar import SidecarEmbedder
+
+JHGAN_MODEL_NAME = "jhgan/ko-sroberta-multitask"
+
+
+def encode_batch(embedder: Any, texts: List[str]) -> List[List[float]]:
+    """
+    여러 문장을 한 번에 임베딩
+    - SentenceTransformer(model.encode)가 있으면 배치 encode, 없으면 한 문장씩 create_embedding
+    - 코사인 거리(<=>)로만 비교하므로 정규화 여부 차이는 결과에 영향 없음
+    """
+    model = getattr(embedder, "model", None)
+    if model is not None and hasattr(model, "encode"):
+        vectors = model.encode(texts, batch_size=len(texts), convert_to_numpy=True, show_progress_bar=False)
+        return [vector.tolist() for vector in vectors]
+    return [embedder.create_embedding(text) for text in texts]
+
+
+class OnnxEmbedder:
+    """
+    ko-sroberta ONNX 모델 (mean pooling) - EmbedderKo와 같은 방식으로 사용 (model.encode, create_embedding)
+    """
+
+    def __init__(self, model_path: str, tokenizer_name: str = JHGAN_MODEL_NAME, threads: int = 0):
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise RuntimeError("EMBED_BACKEND=onnx 사용 시 onnxruntime, transformers 패키지가 필요합니다") from e
+        options = ort.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.model = self  # encode_batch가 model.encode로 배치 처리하도록
+
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True, show_progress_bar: bool = False):
+        import numpy as np
+        outputs = []
+        for start in range(0, len(texts), max(1, batch_size)):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=True, max_length=128, return_tensors="np"
+            )
+            feeds = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            outputs.append((token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+        return np.concatenate(outputs, axis=0)
+
+    def create_embedding(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+class ModelRegistry:
+
+    def __init__(self, backend: str, onnx_path: str, onnx_threads: int, sidecar_socket: str = ""):
+        self.backend = backend
+        self.onnx_path = onnx_path
+        self.onnx_threads = onnx_threads
+        self._embedder_768: Any = None
+        self._sidecar: Optional[SidecarEmbedder] = None
+        if sidecar_socket:
+            self._sidecar = SidecarEmbedder(
+                sidecar_socket, settings.EMBED_SIDECAR_TIMEOUT, settings.EMBED_SIDECAR_RETRY,
+                self._get_local_768 if settings.EMBED_SIDECAR_FALLBACK else None,
+                self._release_local_768,
+            )
+        self._lock = threading.Lock()  # 검색 임베딩 스레드와 재임베딩 작업 스레드가 동시에 로드하지 않도록
+        self._ready = False
+        self._error: Optional[str] = None
+        self._load_sec: Optional[float] = None
+        self._warmup_ms: Optional[float] = None
+
+    def _load_768(self) -> Any:
+        if self.backend == "onnx":
+            return OnnxEmbedder(self.onnx_path, threads=self.onnx_threads)
+        from common_fastapi.ai.embed_jhgan import EmbedderKo
+        return EmbedderKo()
+
+    def get_768(self) -> Any:
+        """768차원 임베딩 모델 (사이드카를 쓰면 사이드카 클라이언트, 아니면 프로세스 내 모델)"""
+        if self._sidecar is not None:
+            return self._sidecar
+        return self._get_local_768()
+
+    def _get_local_768(self) -> Any:
+        """프로세스 내 모델 (아직 로드 전이면 호출한 스레드에서 로드)"""
+        if self._embedder_768 is None:
+            with self._lock:
+                if self._embedder_768 is None:
+                    started = time.monotonic()
+                    self._embedder_768 = self._load_768()
+                    self._load_sec = round(time.monotonic() - started, 2)
+                    logger.info(f"[ModelRegistry] {JHGAN_MODEL_NAME} 로드 완료 ({self.backend}, {self._load_sec}초)")
+        return self._embedder_768
+
+    def _release_local_768(self):
+        """사이드카가 복구되면 대체용으로 로드한 프로세스 내 모델 해제 (사용 중인 스레드는 참조를 가진 채 끝까지 처리)"""
+        with self._lock:
+            if self._embedder_768 is not None:
+                self._embedder_768 = None
+                logger.info(f"[ModelRegistry] 사이드카 복구 - 프로세스 내 {JHGAN_MODEL_NAME} 모델 해제")
+
+    def _load_and_warm(self):
+        started = time.monotonic()
+        if self._sidecar is not None: # 대체 모델을 로드하지 않고 사이드카 응답만 확인
+            self._sidecar.probe(["워밍업 문장입니다."])
+        else:
+            encode_batch(self.get_768(), ["워밍업 문장입니다."]) # 첫 추론의 지연(그래프 초기화, 메모리 할당)을 미리 처리
+        self._warmup_ms = round((time.monotonic() - started) * 1000, 1)
+
+    async def load(self):
+        """lifespan에서 호출 : 모델 로드 + 워밍업 추론 후 ready (사이드카는 응답할 때까지 EMBED_SIDECAR_RETRY초마다 재시도)"""
+        while True:
+            try:
+                await asyncio.to_thread(self._load_and_warm)
+                self._ready = True
+                self._error = None
+                logger.info(f"[ModelRegistry] 워밍업 완료 ({self._warmup_ms}ms) - ready")
+                return
+            except OSError as e:
+                self._error = str(e)
+                if self._sidecar is None:
+                    logger.exception(f"[ModelRegistry] 모델 로드 실패: {e}")
+                    return
+                logger.warning(f"[ModelRegistry] 사이드카 대기 중 ({e}) - {settings.EMBED_SIDECAR_RETRY}초 후 재시도")
+                await asyncio.sleep(settings.EMBED_SIDECAR_RETRY)
+            except Exception as e:
+                self._error = str(e)
+                logger.exception(f"[ModelRegistry] 모델 로드 실패: {e}")
+                return
+
+    @property
+    def ready(self) -> bool:
+        """워밍업 완료 (사이드카를 대체 모델 없이 쓰면 연결 실패 후 재시도 대기 중에도 False)"""
+        if self._sidecar is not None and not settings.EMBED_SIDECAR_FALLBACK and not self._sidecar.available:
+            return False
+        return self._ready
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self._ready,
+            "backend": "sidecar" if self._sidecar is not None else self.backend,
+            "model": JHGAN_MODEL_NAME,
+            "load_sec": self._load_sec,
+            "warmup_ms": self._warmup_ms,
+            "error": self._error,
+            "sidecar": self._sidecar.status() if self._sidecar is not None else None,
+        }
+
+
+model_registry = ModelRegistry(
+    settings.EMBED_BACKEND, settings.ONNX_MODEL_PATH, settings.ONNX_THREADS, settings.EMBED_SIDECAR_SOCKET
+)
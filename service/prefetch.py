@@ -0,0 +1,119 @@
+"""
+검색 결과 미리 조회 (speculative prefetch)
+- 조건 추출(search=False) 직후 사용자가 누를 가능성이 높은 검색을 백그라운드에서 실행
+  hybrid_search라면 requirements 임베딩도 이때 계산되어 임베딩 캐시에 들어감
+- 사용자별로 가장 최근 조건 하나만 보관 (userid -> 조건 키, 작업), TTL이 지나면 버림
+- 이어서 들어온 search=True 요청의 조건 키가 같으면 결과를 그대로 사용 (아직 실행 중이면 완료를 기다림)
+- 동시 실행 수 상한(budget)을 넘으면 미리 조회하지 않음 (DB 부하 방지)
+- jobs1_changed 알림을 받으면 보관 중인 결과를 모두 버림
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from common_fastapi.shared.logger import logger
+from service.config import settings
+
+
+class SearchPrefetcher:
+
+    def __init__(self, ttl: float, max_concurrency: int, max_entries: int):
+        self.ttl = ttl
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_entries = max(1, max_entries)
+        self.version = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # userid -> (key, created_at, version, task)
+        self._running = 0
+        self._stats = {"scheduled": 0, "skipped": 0, "hits": 0, "misses": 0, "expired": 0, "failed": 0}
+
+    def schedule(self, userid: Optional[str], key: str, run: Callable[[], Awaitable[Dict[str, Any]]]):
+        """
+        미리 조회 시작 (결과를 기다리지 않음)
+        run : 검색을 실행하고 응답에 쓸 결과 딕셔너리를 반환하는 코루틴 함수
+        """
+        if not userid:
+            return
+        self._discard(userid) # 같은 사용자의 이전 조건은 더 이상 쓰이지 않음
+        if self._running >= self.max_concurrency:
+            self._stats["skipped"] += 1
+            logger.info(f"[SearchPrefetcher] 동시 실행 상한({self.max_concurrency}) - 건너뜀")
+            return
+        self._running += 1
+        task = asyncio.create_task(run())
+        task.add_done_callback(self._done) # 시작 전에 취소되어도 호출됨
+        self._entries[userid] = (key, time.monotonic(), self.version, task)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+        self._stats["scheduled"] += 1
+
+    def _done(self, task: asyncio.Task):
+        self._running -= 1
+
+    async def take(self, userid: Optional[str], key: str) -> Optional[Dict[str, Any]]:
+        """
+        조건 키가 같은 미리 조회 결과를 꺼냄 (한 번만 사용)
+        - 없거나, 만료되었거나, 조건이 다르거나, 실패했으면 None (호출한 쪽에서 새로 검색)
+        """
+        entry = self._entries.pop(userid, None) if userid else None
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        entry_key, created_at, version, task = entry
+        if entry_key != key or version != self.version:
+            self._stats["misses"] += 1
+            self._cancel(task)
+            return None
+        if created_at + self.ttl < time.monotonic():
+            self._stats["expired"] += 1
+            self._cancel(task)
+            return None
+        try:
+            result = await asyncio.shield(task) # 요청이 취소되어도 미리 조회 작업은 취소하지 않음
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.warning(f"[SearchPrefetcher] 미리 조회 실패 - 새로 검색: {e}")
+            return None
+        if version != self.version: # 기다리는 동안 jobs1이 바뀜
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return result
+
+    def _discard(self, userid: str):
+        entry = self._entries.pop(userid, None)
+        if entry is not None:
+            self._cancel(entry[3])
+
+    @staticmethod
+    def _cancel(task: asyncio.Task):
+        if task.done():
+            if not task.cancelled():
+                task.exception() # 실패한 작업의 예외를 소비 (미처리 예외 경고 방지)
+        else:
+            task.cancel()
+
+    def invalidate(self):
+        self.version += 1
+        for userid in list(self._entries):
+            self._discard(userid)
+
+    async def on_notify(self, payload: str):
+        self.invalidate()
+
+    async def on_reconnect(self):
+        self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["expired"] + self._stats["failed"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "running": self._running,
+            "max_concurrency": self.max_concurrency,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+search_prefetcher = SearchPrefetcher(
+    settings.PREFETCH_TTL, settings.PREFETCH_MAX_CONCURRENCY, settings.PREFETCH_MAX_ENTRIES
+)
@@ -0,0 +1,62 @@
+"""
+참조 데이터 레지스트리 (카테고리 등 그래프 노드가 쓰는 조회용 테이블)
+- 워커 시작 시 한 번 로드하고, 테이블 변경 알림(sql/007_category_changed_notify.sql)을 받으면 다시 로드
+- 로드할 때 노드가 쓰는 파생 값(프롬프트 문구, 검증용 집합, 규칙 추출용 정렬 목록)을 미리 만들어 둠
+  → 요청 처리 중에는 조회나 문자열 생성 없이 스냅샷 속성만 읽음
+- 스냅샷은 읽기 전용이며 다시 로드하면 새 스냅샷으로 통째로 교체 (버전 증가)
+"""
+import asyncio
+from typing import Any, Dict, Iterable, Optional
+from common_fastapi.shared.db import get_db_connection
+from common_fastapi.shared.logger import logger
+
+CATEGORY_SQL = "SELECT nm FROM public.category WHERE kind = '01' AND depth = 1 ORDER BY seq"
+
+
+class CategorySnapshot:
+    """카테고리 목록 (kind='01', depth=1) 과 파생 값"""
+
+    def __init__(self, names: Iterable[str], version: int):
+        self.version = version
+        self.names = tuple(name for name in names if name)
+        self.name_set = frozenset(self.names)  # LLM이 고른 카테고리 검증용
+        self.by_length = tuple(sorted(self.names, key=len, reverse=True))  # 규칙 추출 시 긴 이름 우선 매칭
+        self.prompt_fragment = f"카테고리 목록: {', '.join(self.names)}"  # classify_input user 메시지 앞부분
+
+
+class RefDataRegistry:
+
+    def __init__(self):
+        self.categories = CategorySnapshot((), 0)
+        self._lock = asyncio.Lock()
+        self._stats = {"loads": 0, "failures": 0}
+
+    async def load(self):
+        """DB에서 다시 읽어 스냅샷 교체 (실패하면 기존 스냅샷 유지)"""
+        async with self._lock:
+            try:
+                async with get_db_connection() as conn:
+                    rows = await conn.fetch(CATEGORY_SQL)
+            except Exception as e:
+                self._stats["failures"] += 1
+                logger.exception(f"[RefData] 카테고리 로드 실패: {e}")
+                return
+            self.categories = CategorySnapshot((row["nm"] for row in rows), self.categories.version + 1)
+            self._stats["loads"] += 1
+            logger.info(f"[RefData] 카테고리 로드 완료: {len(self.categories.names)}개 (v{self.categories.version})")
+
+    async def on_notify(self, payload: Optional[str] = None):
+        await self.load()
+
+    async def on_reconnect(self):
+        await self.load()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "category_version": self.categories.version,
+            "category_count": len(self.categories.names),
+        }
+
+
+refdata = RefDataRegistry()
@@ -0,0 +1,99 @@
+"""
+검색 결과 캐시
+- 키 : 정규화한 검색 조건 (requirements 제외) + 추가 키
+- jobs1_changed 알림(sql/005_jobs1_changed_notify.sql)을 받으면 전체 무효화 (버전 증가)
+- 알림 커넥션이 재연결되면 그 사이 변경을 놓쳤을 수 있으므로 무효화
+- 항목 수와 대략적인 메모리(바이트) 상한을 넘으면 LRU 축출
+- max_age는 알림이 오지 않는 환경을 위한 안전장치
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from common_fastapi.shared.logger import logger
+from service.config import settings
+
+
+def condition_key(condition: Dict[str, Any], *extra: Any) -> str:
+    """검색 조건을 캐시 키 문자열로 정규화 (빈 값과 requirements 제외, 키 정렬)"""
+    canonical = {
+        k: v for k, v in (condition or {}).items()
+        if k != "requirements" and v not in (None, "", [])
+    }
+    return json.dumps([canonical, *extra], ensure_ascii=False, sort_keys=True, default=str)
+
+
+class ResultCache:
+
+    def __init__(self, name: str, max_entries: int, max_bytes: int, max_age: float):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.max_age = max_age
+        self.version = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (stored_at, size, value)
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and self.max_age and entry[0] + self.max_age < time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry[2]
+
+    def put(self, key: str, value: Any, version: Optional[int] = None):
+        """
+        version : 조회 시작 시점의 버전 - 조회 중에 무효화되었다면 오래된 결과이므로 저장하지 않음
+        """
+        if version is not None and version != self.version:
+            return
+        size = len(json.dumps(value, ensure_ascii=False, default=str))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic(), size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def invalidate(self):
+        self.version += 1
+        self._entries.clear()
+        self._bytes = 0
+        self._stats["invalidations"] += 1
+
+    async def on_notify(self, payload: str):
+        logger.info(f"[ResultCache:{self.name}] jobs1 변경({payload}) - 캐시 무효화")
+        self.invalidate()
+
+    async def on_reconnect(self):
+        self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "version": self.version,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+sql_result_cache = ResultCache(
+    "sql_search", settings.SQL_CACHE_MAX_ENTRIES, settings.SQL_CACHE_MAX_BYTES, settings.SQL_CACHE_MAX_AGE
+)
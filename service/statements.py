@@ -0,0 +1,102 @@
+"""
+자주 쓰는 검색 쿼리 형태(prepared statement) 등록, 워밍업, 문장 캐시 통계
+- asyncpg는 커넥션마다 최근 실행한 쿼리 문자열의 prepared statement를 LRU로 보관 (statement_cache_size, 기본 100)
+  쿼리 문자열이 조건 조합마다 달라지면 캐시에서 밀려나 parse/plan을 반복하게 됨
+- 검색 노드가 모듈 로드 시 대표 조건으로 만든 쿼리를 등록하고,
+  시작 시 풀의 모든 커넥션에서 LIMIT 0으로 한 번씩 실행해 문장 캐시를 채워 둠
+- 적중/미적중은 커넥션(서버 pid)별로 asyncpg와 같은 크기의 LRU로 추정
+  (추적하는 커넥션 수는 풀 최대 크기의 2배까지 - 재생성되어 더 쓰이지 않는 커넥션은 오래된 순으로 제거)
+"""
+import asyncio
+from collections import Counter, OrderedDict
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Tuple
+from common_fastapi.shared.db import get_db_connection
+from common_fastapi.shared.logger import logger
+from service.config import settings
+from service.metrics import stage_timer
+
+
+class StatementRegistry:
+
+    def __init__(self, cache_size: int, max_connections: int = 64):
+        self.cache_size = max(1, cache_size)
+        self.max_connections = max(1, max_connections)  # warm()에서 풀 최대 크기의 2배로 맞춤
+        self._hot: List[Tuple[str, str, Tuple[Any, ...]]] = []  # (이름, 쿼리, LIMIT 0 실행용 파라미터)
+        self._seen: "OrderedDict[int, OrderedDict[str, None]]" = OrderedDict()  # 서버 pid -> 실행한 쿼리 문자열 (LRU)
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+        self._warmed = 0
+
+    def register(self, name: str, query: str, *args: Any):
+        """워밍업할 쿼리 등록 (args는 결과가 0건이 되도록 LIMIT 0을 넣어 전달)"""
+        self._hot.append((name, query, args))
+
+    def record(self, conn, name: str, query: str):
+        """쿼리 실행 전에 호출 : 이 커넥션에서 같은 문자열을 최근에 실행했으면 적중"""
+        try:
+            pid = conn.get_server_pid()
+        except Exception:
+            return
+        seen = self._seen.get(pid)
+        if seen is None:
+            seen = self._seen[pid] = OrderedDict()
+            while len(self._seen) > self.max_connections: # 풀에서 닫힌 커넥션
+                self._seen.popitem(last=False)
+        else:
+            self._seen.move_to_end(pid)
+        if query in seen:
+            seen.move_to_end(query)
+            self._hits[name] += 1
+            return
+        self._misses[name] += 1
+        seen[query] = None
+        while len(seen) > self.cache_size:
+            seen.popitem(last=False)
+
+    async def fetch(self, conn, name: str, query: str, *args: Any):
+        self.record(conn, name, query)
+        with stage_timer("db_query", name.split(":", 1)[0]): # 형태별이 아닌 쿼리 종류별 (라벨 수 제한)
+            return await conn.fetch(query, *args)
+
+    async def _warm_connection(self, conn) -> int:
+        warmed = 0
+        for name, query, args in self._hot:
+            try:
+                await self.fetch(conn, name, query, *args)
+                warmed += 1
+            except Exception as e:
+                logger.warning(f"[StatementRegistry] 워밍업 실패 ({name}): {e}")
+        return warmed
+
+    async def warm(self, pool):
+        """풀에 열려 있는 커넥션을 모두 잡고 각 커넥션에서 등록된 쿼리를 실행 (이후 새로 열리는 커넥션은 첫 실행 때 준비됨)"""
+        if pool is not None and hasattr(pool, "get_max_size"):
+            self.max_connections = max(1, 2 * pool.get_max_size())
+        if not self._hot:
+            return
+        size = pool.get_size() if pool is not None and hasattr(pool, "get_size") else 1
+        async with AsyncExitStack() as stack:
+            conns = [await stack.enter_async_context(get_db_connection()) for _ in range(max(1, size))]
+            results = await asyncio.gather(*(self._warm_connection(conn) for conn in conns))
+        self._warmed += sum(results)
+        logger.info(f"[StatementRegistry] 워밍업 완료 : 커넥션 {len(conns)}개 x 쿼리 {len(self._hot)}개")
+
+    def stats(self) -> Dict[str, Any]:
+        hits, misses = sum(self._hits.values()), sum(self._misses.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "warmed": self._warmed,
+            "registered": len(self._hot),
+            "connections": len(self._seen),
+            "cache_size": self.cache_size,
+            "shapes": {
+                name: {"hits": self._hits[name], "misses": self._misses[name]}
+                for name in sorted(set(self._hits) | set(self._misses))
+            },
+        }
+
+
+statement_registry = StatementRegistry(settings.DB_STATEMENT_CACHE_SIZE)
@@ -0,0 +1,669 @@
+"""
+프로세스 내 벡터 인덱스 복제본 (ACTIVE jobs1 행의 임베딩 + 필터 컬럼)
+- VECTOR_REPLICA에 지정한 임베딩 컬럼별로 정규화한 벡터 행렬(float16/float32)과 id, 필터 컬럼 배열을 스냅샷 파일(.npy)로 저장
+  워커는 파일을 mmap으로 열므로 여러 uvicorn 워커가 같은 페이지(OS 페이지 캐시)를 공유하고, 재시작해도 DB에서 다시 읽지 않음
+- 필터 컬럼은 search_conditions._PREDICATES와 같은 의미로 NumPy에서 평가
+  문자열 컬럼은 사전 코드(int32), 문자열 배열 컬럼(age, work_days)은 라벨별 비트(uint64), 시각은 0시부터의 초
+- 변경 반영 (sql/009_vector_replica.sql)
+  jobs1_vector 알림으로 받은 id를 모아서 다시 읽고 워커 메모리의 변경분(delta)에 반영 (스냅샷의 기존 행은 가림)
+  재연결 시에는 스냅샷 시각(vec_changed_at) 이후 바뀐 행 + ACTIVE id 목록으로 보정
+  변경분이 VECTOR_REPLICA_REBUILD_ROWS를 넘거나 스냅샷이 VECTOR_REPLICA_MAX_AGE보다 오래되면 새 세대 스냅샷 생성
+  (파일 잠금으로 한 워커만 생성하고 나머지 워커는 CURRENT 파일이 바뀐 것을 보고 새 세대로 교체)
+- 유사도는 정규화한 벡터의 내적 (float16이면 소수점 셋째 자리 정도 오차, 임계값 경계의 행 포함 여부가 드물게 달라짐)
+- 검색은 스레드에서 실행 : 변경분 반영은 배열을 새로 만들어 통째로 교체하므로 실행 중인 검색과 섞이지 않음
+"""
+import asyncio
+import fcntl
+import json
+import re
+import shutil
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from common_fastapi.shared.db import get_db_connection
+from common_fastapi.shared.logger import logger
+from graph.nodes.search_conditions import condition_parts
+from service.config import settings
+from service.metrics import stage_timer
+from service import vector_rerank
+
+CODE_COLUMNS = ("gender", "category", "loc_sido", "loc_sigungu", "loc_norm")  # 문자열 -> 사전 코드
+LABEL_COLUMNS = ("age", "work_days")  # 문자열 배열 -> 라벨 비트
+ARRAY_TYPES = {
+    "ids": np.int64,
+    **{column: np.int32 for column in CODE_COLUMNS},
+    **{column: np.uint64 for column in LABEL_COLUMNS},
+    "wage": np.int32,
+    "start": np.int32,
+    "end": np.int32,
+}
+NULL_CODE = -1  # NULL 문자열
+UNKNOWN_CODE = -2  # 사전에 없는 검색 값 (어떤 행과도 같지 않음)
+NULL_BIT = 1 << 63  # NULL 배열 또는 NULL 원소 (검색 조건 쪽에는 절대 들어가지 않음)
+MAX_LABELS = 63
+INT32_MAX = int(np.iinfo(np.int32).max)
+NO_WAGE = int(np.iinfo(np.int32).min)
+NO_TIME = -1
+DAY_SECONDS = 24 * 3600
+SUPERSEDED = "SUPERSEDED"  # 세대 디렉터리 안 : 새 세대로 교체된 시각 (mtime)
+SCORE_CHUNK_ROWS = 8192  # float16 -> float32 변환을 이 행 수씩 나눠서 (임시 메모리 제한)
+_TIME_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*$")
+
+ROW_COLUMNS = """
+    id, status, gender, category, loc_sido, loc_sigungu, loc_norm, age, work_days, hourly_wage, start_time, end_time
+"""
+
+
+class UnsupportedCondition(Exception):
+    """복제본에서 평가할 수 없는 조건 : DB 검색으로 대체"""
+
+
+class LabelOverflow(Exception):
+    """문자열 배열 컬럼의 라벨 종류가 비트 수(63)를 넘음"""
+
+
+def _parse_time(value: Any) -> Optional[int]:
+    """'HH:MM[:SS]' -> 0시부터의 초 (형식이 다르면 None)"""
+    match = _TIME_RE.match(value) if isinstance(value, str) else None
+    if not match:
+        return None
+    hours, minutes, seconds = int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+    total = hours * 3600 + minutes * 60 + seconds
+    return total if minutes < 60 and seconds < 60 and total <= DAY_SECONDS else None
+
+
+def _like_prefix(pattern: str) -> Optional[str]:
+    """search_conditions가 만든 '이스케이프된 접두어%' LIKE 패턴 -> 접두어 (다른 형태면 None)"""
+    prefix, escaped = [], False
+    for i, ch in enumerate(pattern):
+        if escaped:
+            prefix.append(ch)
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == "%":
+            return "".join(prefix) if i == len(pattern) - 1 else None
+        elif ch == "_":
+            return None
+        else:
+            prefix.append(ch)
+    return None
+
+
+class _Encoder:
+    """문자열 사전 (워커별로 변경분의 새 값을 이어 붙임 - 코드는 같은 사전 안에서만 비교하므로 스냅샷과 섞여도 됨)"""
+
+    def __init__(self, codes: Dict[str, List[str]], labels: Dict[str, List[str]]):
+        self.codes = {column: list(codes.get(column, [])) for column in CODE_COLUMNS}
+        self.labels = {column: list(labels.get(column, [])) for column in LABEL_COLUMNS}
+        self._code_index = {column: {v: i for i, v in enumerate(values)} for column, values in self.codes.items()}
+        self._label_index = {column: {v: i for i, v in enumerate(values)} for column, values in self.labels.items()}
+
+    def code(self, column: str, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_CODE
+        index = self._code_index[column]
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(self.codes[column])
+            self.codes[column].append(value)
+        return code
+
+    def mask(self, column: str, values: Optional[Iterable[Optional[str]]]) -> int:
+        if values is None:
+            return NULL_BIT
+        index, mask = self._label_index[column], 0
+        for value in values:
+            if value is None:
+                mask |= NULL_BIT
+                continue
+            bit = index.get(value)
+            if bit is None:
+                if len(self.labels[column]) >= MAX_LABELS:
+                    raise LabelOverflow(column)
+                bit = index[value] = len(self.labels[column])
+                self.labels[column].append(value)
+            mask |= 1 << bit
+        return mask
+
+    def lookup(self, column: str, value: Any) -> int:
+        return self._code_index[column].get(value, UNKNOWN_CODE)
+
+    def bits(self, column: str, values: Iterable[Any]) -> int:
+        index = self._label_index[column]
+        return sum({1 << index[value] for value in values if value in index})
+
+    def codes_with_prefix(self, column: str, prefix: str) -> List[int]:
+        return [code for code, value in enumerate(list(self.codes[column])) if value.startswith(prefix)]
+
+    def to_meta(self) -> Dict[str, Any]:
+        return {"codes": self.codes, "labels": self.labels}
+
+
+def _encode(encoder: _Encoder, row, field: str) -> Optional[Tuple[np.ndarray, Dict[str, int]]]:
+    """DB 행 -> (정규화한 float32 벡터, 필터 컬럼 값) / 복제본에 넣지 않는 행(ACTIVE 아님, 벡터 없음)은 None"""
+    if row["status"] != "ACTIVE" or row["vector"] is None:
+        return None
+    dims = int(field.replace("embedding", ""))
+    vector = vector_rerank.decode_vectors([row["vector"]], dims)[0]
+    norm = float(np.linalg.norm(vector))
+    if not norm or not np.isfinite(norm):
+        return None
+    start, end = _parse_time(row["start_time"]), _parse_time(row["end_time"])
+    values = {column: encoder.code(column, row[column]) for column in CODE_COLUMNS}
+    values.update({column: encoder.mask(column, row[column]) for column in LABEL_COLUMNS})
+    values["wage"] = NO_WAGE if row["hourly_wage"] is None else min(max(int(row["hourly_wage"]), NO_WAGE + 1), INT32_MAX)
+    values["start"] = NO_TIME if start is None else start
+    values["end"] = NO_TIME if end is None else end
+    return vector / norm, values
+
+
+def _filter(columns: Dict[str, np.ndarray], encoder: _Encoder, parts) -> np.ndarray:
+    """공통 검색 조건(condition_parts)을 배열에 적용한 bool 마스크 (search_conditions._PREDICATES와 같은 의미)"""
+    mask = np.ones(len(columns["ids"]), dtype=bool)
+    for name, values in parts:
+        if name == "gender": # gender IN ('무관', $1)
+            mask &= np.isin(columns["gender"], [encoder.lookup("gender", "무관"), encoder.lookup("gender", values[0])])
+        elif name == "age": # $1 = ANY(age)
+            mask &= (columns["age"] & np.uint64(encoder.bits("age", values))) != 0
+        elif name == "sido":
+            mask &= columns["loc_sido"] == encoder.lookup("loc_sido", values[0])
+        elif name == "sigungu":
+            mask &= columns["loc_sigungu"] == encoder.lookup("loc_sigungu", values[0])
+        elif name == "loc_prefix": # loc_norm LIKE '접두어%'
+            prefix = _like_prefix(values[0])
+            if prefix is None:
+                raise UnsupportedCondition(f"loc_prefix {values[0]}")
+            mask &= np.isin(columns["loc_norm"], encoder.codes_with_prefix("loc_norm", prefix))
+        elif name == "work_days": # $1 @> work_days : 행의 모든 요일이 조건에 포함 (NULL 배열/원소는 항상 제외)
+            outside = np.uint64(~encoder.bits("work_days", values[0]) & ((1 << 64) - 1))
+            mask &= (columns["work_days"] & outside) == 0
+        elif name == "time": # 시작/종료 시각 각각 전후 1시간 (time 연산처럼 자정을 넘으면 돌아감)
+            for column, value in zip(("start", "end"), values):
+                seconds = _parse_time(value)
+                if seconds is None:
+                    raise UnsupportedCondition(f"time {value}")
+                low, high = (seconds - 3600) % DAY_SECONDS, (seconds + 3600) % DAY_SECONDS
+                mask &= (columns[column] >= low) & (columns[column] <= high)
+        elif name == "wage":
+            if values[0] > INT32_MAX:
+                mask[:] = False
+            else:
+                mask &= columns["wage"] >= values[0]
+        elif name == "category":
+            mask &= columns["category"] == encoder.lookup("category", values[0])
+        else:
+            raise UnsupportedCondition(name)
+    return mask
+
+
+def _scores(vectors: np.ndarray, index: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """선택한 행과 정규화한 쿼리 벡터의 내적 (float16은 덩어리별로 float32로 변환)"""
+    scores = np.empty(len(index), dtype=np.float64)
+    for start in range(0, len(index), SCORE_CHUNK_ROWS):
+        chunk = index[start:start + SCORE_CHUNK_ROWS]
+        scores[start:start + len(chunk)] = vectors[chunk].astype(np.float32) @ query
+    return scores
+
+
+class _View:
+    """검색 1회가 보는 상태 (스냅샷 배열 + 가려진 행 + 변경분 배열) - 변경분 반영 시 새 객체로 교체"""
+
+    def __init__(self, base: Dict[str, np.ndarray], removed: np.ndarray, delta: Dict[str, np.ndarray]):
+        self.base = base
+        self.removed = removed
+        self.delta = delta
+
+    def search(self, encoder: _Encoder, query: np.ndarray, parts, threshold: float, limit: int, after):
+        ids, scores = [], []
+        for columns, hidden in ((self.base, self.removed), (self.delta, None)):
+            if not len(columns["ids"]):
+                continue
+            mask = _filter(columns, encoder, parts)
+            if hidden is not None:
+                mask &= ~hidden
+            index = np.flatnonzero(mask)
+            if len(index):
+                ids.append(np.asarray(columns["ids"][index]))
+                scores.append(_scores(columns["vectors"], index, query))
+        if not ids:
+            return [], 0
+        ids, scores = np.concatenate(ids), np.concatenate(scores)
+        order, matched = vector_rerank.select(ids, scores, threshold, limit, after)
+        return [(int(ids[i]), float(scores[i])) for i in order], matched
+
+
+def _empty_columns(dims: int) -> Dict[str, np.ndarray]:
+    columns = {name: np.empty(0, dtype=dtype) for name, dtype in ARRAY_TYPES.items()}
+    columns["vectors"] = np.empty((0, dims), dtype=np.float32)
+    return columns
+
+
+class FieldReplica:
+    """임베딩 컬럼 1개의 복제본 (스냅샷 세대 관리 + 워커별 변경분)"""
+
+    def __init__(self, root: Path, field: str, dtype: str):
+        self.field = field
+        self.dims = int(field.replace("embedding", ""))
+        self.dtype = np.dtype(dtype)
+        self.directory = root / field
+        self.generation: Optional[str] = None
+        self.watermark: Optional[float] = None  # 스냅샷 기준 시각 (epoch 초)
+        self.built_at: Optional[float] = None
+        self._encoder = _Encoder({}, {})
+        self._view: Optional[_View] = None
+        self._delta: Dict[int, Tuple[np.ndarray, Dict[str, int]]] = {}
+        self._loading_ids: Optional[Set[int]] = None  # 세대 교체 중에 들어온 변경 id (교체 후 다시 반영)
+        self._error: Optional[str] = None
+        self._stats = {"searches": 0, "unsupported": 0, "applied": 0, "builds": 0, "loads": 0}
+
+    # ---------- 스냅샷 파일 ----------
+
+    def _current_path(self) -> Path:
+        return self.directory / "CURRENT"
+
+    def current_generation(self) -> Optional[str]:
+        try:
+            generation = self._current_path().read_text().strip()
+        except FileNotFoundError:
+            return None
+        return generation if (self.directory / generation / "meta.json").exists() else None
+
+    def _read_meta(self, generation: str) -> Dict[str, Any]:
+        return json.loads((self.directory / generation / "meta.json").read_text(encoding="utf-8"))
+
+    def _usable(self, generation: Optional[str]) -> bool:
+        """설정(차원, dtype)이 같고 최대 보관 시간이 지나지 않은 세대"""
+        if generation is None:
+            return False
+        meta = self._read_meta(generation)
+        if meta["dims"] != self.dims or meta["dtype"] != self.dtype.name:
+            return False
+        return not settings.VECTOR_REPLICA_MAX_AGE or time.time() - meta["built_at"] < settings.VECTOR_REPLICA_MAX_AGE
+
+    @asynccontextmanager
+    async def _build_lock(self):
+        """세대 생성 파일 잠금 (워커 프로세스 간) - 이벤트 루프를 막지 않도록 비차단 잠금을 반복 시도"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".lock", "w") as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(0.5)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _snapshot_sql(self) -> str:
+        return f"""
+            SELECT {ROW_COLUMNS}, vector_send({self.field}) AS vector
+              FROM public.jobs1
+             WHERE status = 'ACTIVE' AND {self.field} IS NOT NULL AND vector_norm({self.field}) > 0
+             ORDER BY id
+        """
+
+    async def build(self) -> str:
+        """DB에서 ACTIVE 행을 읽어 새 세대 스냅샷 생성 (반복 읽기 트랜잭션 : 건수와 내용이 같은 시점)"""
+        started = time.monotonic()
+        generation = f"g{int(time.time() * 1000)}"
+        tmp = self.directory / f"{generation}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        encoder = _Encoder({}, {})
+        side: Dict[str, List[int]] = {name: [] for name in ARRAY_TYPES}
+        try:
+            async with get_db_connection() as conn:
+                async with conn.transaction(isolation="repeatable_read", readonly=True):
+                    watermark = await conn.fetchval("SELECT extract(epoch FROM now())::float8")
+                    total = await conn.fetchval(
+                        f"SELECT count(*) FROM public.jobs1 WHERE status = 'ACTIVE' "
+                        f"AND {self.field} IS NOT NULL AND vector_norm({self.field}) > 0"
+                    )
+                    vectors = np.lib.format.open_memmap(
+                        tmp / "vectors.npy", mode="w+", dtype=self.dtype, shape=(total, self.dims)
+                    )
+                    count = 0
+                    async for row in conn.cursor(self._snapshot_sql(), prefetch=1000):
+                        encoded = _encode(encoder, row, self.field)
+                        if encoded is None or count >= total:
+                            continue
+                        vectors[count] = encoded[0]
+                        side["ids"].append(row["id"])
+                        for name, value in encoded[1].items():
+                            side[name].append(value)
+                        count += 1
+                    if count != total:
+                        raise RuntimeError(f"스냅샷 행 수 불일치 (count {total}, 읽음 {count})")
+            vectors.flush()
+            del vectors
+            for name, dtype in ARRAY_TYPES.items():
+                np.save(tmp / f"{name}.npy", np.array(side[name], dtype=dtype))
+            meta = {
+                "field": self.field, "dims": self.dims, "dtype": self.dtype.name, "rows": total,
+                "watermark": watermark, "built_at": time.time(), **encoder.to_meta(),
+            }
+            (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+            previous = self.current_generation()
+            tmp.rename(self.directory / generation)
+            current_tmp = self.directory / "CURRENT.tmp"
+            current_tmp.write_text(generation)
+            current_tmp.replace(self._current_path())
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self._stats["builds"] += 1
+        if previous is not None: # 교체된 시각 기록 (다른 워커가 옮겨 갈 때까지 보관)
+            (self.directory / previous / SUPERSEDED).touch()
+        self._cleanup(keep={generation, self.generation})
+        logger.info(f"[VectorReplica] {self.field} 스냅샷 생성 : {generation}, {total}행, {time.monotonic() - started:.1f}초")
+        return generation
+
+    def _cleanup(self, keep: Set[Optional[str]]):
+        """
+        이전 세대 삭제 (다른 워커가 mmap으로 열고 있어도 리눅스에서는 닫을 때까지 유지됨)
+        교체된 지 VECTOR_REPLICA_CHECK_INTERVAL의 2배가 지나지 않은 세대는 남김
+        (아직 옮겨 가지 않은 워커가 재연결 보정(catch_up) 때 meta.json을 다시 읽음)
+        """
+        grace = 2 * settings.VECTOR_REPLICA_CHECK_INTERVAL
+        for path in self.directory.glob("g*"):
+            if not path.is_dir() or path.name in keep:
+                continue
+            try:
+                if time.time() - (path / SUPERSEDED).stat().st_mtime < grace:
+                    continue
+            except FileNotFoundError: # 교체 기록이 없는 세대(생성 중 중단된 임시 디렉터리 등)
+                pass
+            shutil.rmtree(path, ignore_errors=True)
+
+    # ---------- 로드 / 세대 교체 ----------
+
+    async def load(self, force_build: bool = False, replace: Optional[str] = None):
+        """
+        사용할 수 있는 세대가 있으면 mmap으로 열고, 없으면 (한 워커만) 생성
+        - force_build : 항상 새 세대 생성 (/admin/vector_replica/rebuild)
+        - replace : 이 세대를 대체할 새 세대가 필요함 (rebuild_due) - 다른 워커가 이미 더 새 세대를 만들었으면
+          생성하지 않고 그 세대로 교체 (모든 워커가 같은 시점에 rebuild_due가 되므로 한 워커만 생성)
+        """
+        try:
+            generation = self.current_generation()
+            stale = replace is not None and generation == replace
+            if force_build or stale or not self._usable(generation):
+                async with self._build_lock():
+                    latest = self.current_generation()
+                    # 잠금을 기다리는 동안 다른 워커가 새 세대를 만들었으면 그대로 사용
+                    if latest != generation and self._usable(latest):
+                        generation = latest
+                    elif force_build or (replace is not None and latest == replace) or not self._usable(latest):
+                        generation = await self.build()
+                    else:
+                        generation = latest
+            if generation != self.generation:
+                await self._switch(generation)
+            self._error = None
+        except Exception as e:
+            self._error = str(e)
+            logger.exception(f"[VectorReplica] {self.field} 로드 실패: {e}")
+
+    async def _switch(self, generation: str):
+        meta = self._read_meta(generation)
+        directory = self.directory / generation
+        base = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in ARRAY_TYPES}
+        base["vectors"] = np.load(directory / "vectors.npy", mmap_mode="r")
+        encoder = _Encoder(meta["codes"], meta["labels"])
+        removed = np.zeros(len(base["ids"]), dtype=bool)
+
+        self._loading_ids = set()
+        try:
+            # 스냅샷 이후 바뀐 행 (트랜잭션 시작~커밋 사이 변경을 놓치지 않도록 여유를 두고 다시 읽음)
+            since = meta["watermark"] - settings.VECTOR_REPLICA_CATCHUP_MARGIN
+            async with get_db_connection() as conn:
+                changed = await conn.fetch(
+                    f"SELECT {ROW_COLUMNS}, vector_send({self.field}) AS vector FROM public.jobs1 "
+                    f"WHERE vec_changed_at > to_timestamp($1)", since
+                )
+                active = await self._active_ids(conn)
+            delta: Dict[int, Tuple[np.ndarray, Dict[str, int]]] = {}
+            removed |= ~np.isin(base["ids"], active)  # 삭제된 행
+            self._apply_rows(base["ids"], removed, delta, encoder, changed)
+
+            self._encoder, self._delta = encoder, delta
+            self._view = _View(base, removed, self._delta_columns(delta))
+            self.generation, self.watermark, self.built_at = generation, meta["watermark"], meta["built_at"]
+            self._stats["loads"] += 1
+            logger.info(f"[VectorReplica] {self.field} 세대 {generation} 사용 (스냅샷 {len(base['ids'])}행, 변경분 {len(delta)}행)")
+        finally:
+            pending, self._loading_ids = self._loading_ids, None
+        if pending:
+            await self.refresh_ids(pending)
+
+    async def _active_ids(self, conn) -> np.ndarray:
+        rows = await conn.fetch(
+            f"SELECT id FROM public.jobs1 WHERE status = 'ACTIVE' AND {self.field} IS NOT NULL"
+        )
+        return np.fromiter((row["id"] for row in rows), dtype=np.int64, count=len(rows))
+
+    # ---------- 변경분 ----------
+
+    def _apply_rows(self, base_ids, removed, delta, encoder, rows, missing: Iterable[int] = ()):
+        """행 변경 반영 : 스냅샷의 같은 id는 가리고, 넣을 수 있는 행이면 변경분에 추가"""
+        def hide(row_id: int):
+            position = int(np.searchsorted(base_ids, row_id))
+            if position < len(base_ids) and base_ids[position] == row_id:
+                removed[position] = True
+
+        for row in rows:
+            hide(row["id"])
+            encoded = _encode(encoder, row, self.field)
+            if encoded is None:
+                delta.pop(row["id"], None)
+            else:
+                delta[row["id"]] = encoded
+        for row_id in missing: # 삭제된 행
+            hide(row_id)
+            delta.pop(row_id, None)
+
+    def _delta_columns(self, delta) -> Dict[str, np.ndarray]:
+        if not delta:
+            return _empty_columns(self.dims)
+        ids = sorted(delta)
+        columns = {"ids": np.array(ids, dtype=np.int64)}
+        for name, dtype in ARRAY_TYPES.items():
+            if name != "ids":
+                columns[name] = np.array([delta[row_id][1][name] for row_id in ids], dtype=dtype)
+        columns["vectors"] = np.stack([delta[row_id][0] for row_id in ids]).astype(np.float32)
+        return columns
+
+    async def refresh_ids(self, ids: Set[int]):
+        """알림으로 받은 id들을 다시 읽어 반영"""
+        if self._loading_ids is not None:
+            self._loading_ids |= ids
+        view = self._view
+        if view is None:
+            return
+        async with get_db_connection() as conn:
+            rows = await conn.fetch(
+                f"SELECT {ROW_COLUMNS}, vector_send({self.field}) AS vector FROM public.jobs1 WHERE id = ANY($1::bigint[])",
+                list(ids)
+            )
+        if self._view is not view: # 읽는 동안 세대가 바뀌었으면 새 세대에 다시 반영
+            await self.refresh_ids(ids)
+            return
+        removed, delta = view.removed.copy(), dict(self._delta)
+        found = {row["id"] for row in rows}
+        try:
+            self._apply_rows(view.base["ids"], removed, delta, self._encoder, rows, missing=ids - found)
+        except LabelOverflow as e:
+            self._error = f"라벨 종류 초과 : {e}"
+            self._view = None
+            logger.error(f"[VectorReplica] {self.field} {self._error} - 복제본 사용 중지")
+            return
+        self._delta = delta
+        self._view = _View(view.base, removed, self._delta_columns(delta))
+        self._stats["applied"] += len(ids)
+
+    async def catch_up(self):
+        """
+        알림을 놓쳤을 수 있을 때 (재연결) : 현재 세대를 다시 보정
+        사용 중인 세대가 이미 정리되었으면 최신 세대로 교체
+        """
+        if self.generation is None:
+            return
+        try:
+            await self._switch(self.generation)
+        except FileNotFoundError:
+            logger.info(f"[VectorReplica] {self.field} 세대 {self.generation} 정리됨 - 최신 세대 로드")
+            await self.load()
+
+    def rebuild_due(self) -> bool:
+        view = self._view
+        if view is None:
+            return False
+        pending = len(self._delta) + int(view.removed.sum())
+        too_old = settings.VECTOR_REPLICA_MAX_AGE and time.time() - (self.built_at or 0) >= settings.VECTOR_REPLICA_MAX_AGE
+        return pending >= settings.VECTOR_REPLICA_REBUILD_ROWS or bool(too_old)
+
+    # ---------- 검색 ----------
+
+    @property
+    def ready(self) -> bool:
+        return self._view is not None
+
+    async def search(self, embedding: Sequence[float], condition: Dict[str, Any], threshold: float, limit: int, after):
+        """
+        조건 + 임계값 + 키셋 커서를 적용한 (similarity, id) 내림차순 상위 limit개
+        Returns: ([(id, similarity), ...], 임계값을 넘은 전체 건수) / 복제본이 준비되지 않았거나 평가할 수 없는 조건이면 None
+        """
+        view = self._view
+        if view is None:
+            return None
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if not norm:
+            return None
+        self._stats["searches"] += 1
+        try:
+            with stage_timer("replica", self.field):
+                return await asyncio.to_thread(
+                    view.search, self._encoder, query / norm, condition_parts(condition), threshold, limit, after
+                )
+        except UnsupportedCondition as e:
+            self._stats["unsupported"] += 1
+            logger.info(f"[VectorReplica] 복제본에서 평가할 수 없는 조건 ({e}) - DB 검색")
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        view = self._view
+        return {
+            **self._stats,
+            "ready": view is not None,
+            "generation": self.generation,
+            "dtype": self.dtype.name,
+            "snapshot_rows": len(view.base["ids"]) if view else 0,
+            "hidden_rows": int(view.removed.sum()) if view else 0,
+            "delta_rows": len(self._delta),
+            "built_at": self.built_at,
+            "error": self._error,
+        }
+
+
+class VectorReplica:
+    """VECTOR_REPLICA에 지정한 임베딩 컬럼별 복제본 + 알림 처리 + 세대 확인 루프"""
+
+    def __init__(self, root: str, fields: Sequence[str], dtype: str, delay: float, check_interval: float):
+        self.replicas = {field: FieldReplica(Path(root), field, dtype) for field in fields}
+        self.delay = delay
+        self.check_interval = check_interval
+        self._pending: Set[int] = set()
+        self._rebuild_requested = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def covers(self, field: Optional[str]) -> bool:
+        replica = self.replicas.get(field)
+        return replica is not None and replica.ready
+
+    async def search(self, field: str, embedding, condition, threshold: float, limit: int, after=None):
+        replica = self.replicas.get(field)
+        return None if replica is None else await replica.search(embedding, condition, threshold, limit, after)
+
+    async def start(self):
+        """lifespan에서 백그라운드로 호출 : 스냅샷 로드(없으면 생성) 후 세대 확인 루프 시작"""
+        for replica in self.replicas.values():
+            await replica.load()
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        for task in (self._task, self._flush_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._task = self._flush_task = None
+
+    async def _watch(self):
+        """다른 워커가 만든 새 세대로 교체, 변경분이 많거나 오래됐으면 새 세대 생성"""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            for replica in self.replicas.values():
+                try:
+                    force = self._rebuild_requested
+                    replace = replica.generation if replica.rebuild_due() else None
+                    if force or replace or not replica.ready or replica.current_generation() != replica.generation:
+                        await replica.load(force_build=force, replace=replace)
+                except Exception as e:
+                    logger.exception(f"[VectorReplica] {replica.field} 세대 확인 오류: {e}")
+            self._rebuild_requested = False
+
+    async def rebuild(self):
+        """/admin/vector_replica/rebuild : 이 워커에서 새 세대 생성 (다른 워커는 세대 확인 루프에서 교체)"""
+        for replica in self.replicas.values():
+            await replica.load(force_build=True)
+
+    async def on_notify(self, payload: str):
+        if payload == "*": # TRUNCATE
+            self._rebuild_requested = True
+            return
+        try:
+            self._pending.add(int(payload))
+        except ValueError:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        while self._pending: # 처리 중에 들어온 id도 이어서 처리
+            await asyncio.sleep(self.delay)
+            ids = set(self._pending)
+            self._pending.clear()
+            for replica in self.replicas.values():
+                try:
+                    await replica.refresh_ids(ids)
+                except Exception as e:
+                    logger.exception(f"[VectorReplica] {replica.field} 변경 반영 실패: {e}")
+
+    async def on_reconnect(self):
+        for replica in self.replicas.values():
+            try:
+                await replica.catch_up()
+            except Exception as e:
+                logger.exception(f"[VectorReplica] {replica.field} 보정 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {field: replica.stats() for field, replica in self.replicas.items()}
+
+
+vector_replica = VectorReplica(
+    settings.VECTOR_REPLICA_PATH,
+    [field.strip() for field in settings.VECTOR_REPLICA.split(",") if field.strip()],
+    settings.VECTOR_REPLICA_DTYPE,
+    settings.VECTOR_REPLICA_DELAY,
+    settings.VECTOR_REPLICA_CHECK_INTERVAL,
+)
@@ -0,0 +1,84 @@
+"""
+하이브리드 검색 prefilter 모드의 프로세스 내 벡터 유사도 계산 (NumPy)
+- 구조화 조건으로 줄인 후보 행의 원본 벡터를 vector_send() 바이너리(bytea)로 받아 한 번에 행렬로 변환
+  (형식 : int16 차원 수 + int16 예비 + big-endian float32 x 차원 수)
+- 코사인 유사도 계산, 임계값/키셋 커서 적용, (similarity, id) 내림차순 정렬을 벡터 연산으로 처리
+- pgvector와 계산 순서가 달라 유사도는 소수점 끝자리에서 다를 수 있음 (임계값 경계의 행 포함 여부가 드물게 달라짐)
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+def decode_vectors(blobs: Sequence[bytes], dims: int) -> np.ndarray:
+    """vector_send() 결과 목록 -> (행 수, dims) float32 행렬"""
+    if not blobs:
+        return np.empty((0, dims), dtype=np.float32)
+    # 행마다 4바이트 헤더가 float32 1개 크기이므로 (dims + 1)열로 보고 첫 열을 버림
+    matrix = np.frombuffer(b"".join(blobs), dtype=">f4").reshape(len(blobs), dims + 1)
+    return matrix[:, 1:].astype(np.float32)
+
+
+def cosine_similarity(query: Sequence[float], matrix: np.ndarray) -> np.ndarray:
+    """1 - 코사인 거리 (pgvector <=> 와 같은 정의, 크기가 0인 벡터는 -inf로 두어 결과에서 제외)"""
+    q = np.asarray(query, dtype=np.float32)
+    dots = (matrix @ q).astype(np.float64)
+    norms = np.linalg.norm(matrix, axis=1).astype(np.float64) * float(np.linalg.norm(q))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarity = dots / norms
+    similarity[~np.isfinite(similarity)] = -np.inf
+    return similarity
+
+
+def select(
+    ids: np.ndarray,
+    similarity: np.ndarray,
+    threshold: float,
+    limit: int,
+    after: Optional[Tuple[float, Any]] = None,
+) -> Tuple[np.ndarray, int]:
+    """
+    임계값/키셋 커서 적용 후 (similarity, id) 내림차순 상위 limit개의 위치
+    Returns: (위치 배열, 임계값을 넘은 전체 건수)
+    """
+    keep = similarity >= threshold
+    matched = int(keep.sum())
+    if after is not None: # 키셋 커서 : (similarity, id) < (after_similarity, after_id)
+        after_similarity, after_id = after
+        keep &= (similarity < after_similarity) | ((similarity == after_similarity) & (ids < int(after_id)))
+
+    candidates = np.flatnonzero(keep)
+    if limit <= 0:
+        return candidates[:0], matched
+    if len(candidates) > limit: # 전체 정렬 대신 상위 limit개를 먼저 고르고 그것만 정렬 (경계 동점은 id 순서를 위해 모두 포함)
+        values = similarity[candidates]
+        kth = values[np.argpartition(-values, limit - 1)[:limit]].min()
+        candidates = candidates[values >= kth]
+    order = candidates[np.lexsort((-ids[candidates], -similarity[candidates]))][:limit]
+    return order, matched
+
+
+def rank(
+    rows: Sequence[Any],
+    query: Sequence[float],
+    dims: int,
+    threshold: float,
+    limit: int,
+    after: Optional[Tuple[float, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    후보 행(vector 컬럼 포함)을 유사도로 거르고 정렬
+    Returns: (상위 limit개 행 - vector 대신 similarity 포함, 임계값을 넘은 전체 건수)
+    """
+    if not rows:
+        return [], 0
+    similarity = cosine_similarity(query, decode_vectors([row["vector"] for row in rows], dims))
+    ids = np.fromiter((row["id"] for row in rows), dtype=np.int64, count=len(rows))
+    order, matched = select(ids, similarity, threshold, limit, after)
+
+    results = []
+    for i in order:
+        row = dict(rows[i])
+        del row["vector"]
+        row["similarity"] = float(similarity[i])
+        results.append(row)
+    return results, matched
@@ -0,0 +1,22 @@
+-- 임베딩 원문 해시 컬럼 : 원문(company/title/description/qualifications)이 바뀐 행만 다시 임베딩하기 위함
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS embedding768_hash text;
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS embedding1536_hash text;
+
+-- 임베딩 원문 : 파이썬의 ' '.join(빈 값 제외)과 동일한 결과
+CREATE OR REPLACE FUNCTION public.jobs1_embed_text(company text, title text, description text, qualifications text)
+RETURNS text LANGUAGE sql IMMUTABLE AS $$
+    SELECT concat_ws(' ', NULLIF(company, ''), NULLIF(title, ''), NULLIF(description, ''), NULLIF(qualifications, ''))
+$$;
+
+-- 등록/수정된 일자리 id를 알림 : 앱에서 LISTEN 하여 자동 재임베딩 (EMBED_AUTO_REFRESH)
+CREATE OR REPLACE FUNCTION public.jobs1_notify_embed() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('jobs1_embed', NEW.id::text);
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS jobs1_notify_embed ON public.jobs1;
+CREATE TRIGGER jobs1_notify_embed
+    AFTER INSERT OR UPDATE OF company, title, description, qualifications ON public.jobs1
+    FOR EACH ROW EXECUTE FUNCTION public.jobs1_notify_embed();
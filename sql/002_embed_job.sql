@@ -0,0 +1,18 @@
+-- 관리자 임베딩 재생성 백그라운드 작업 : 진행률/체크포인트 저장 (여러 워커에서 조회/취소/재개 가능)
+CREATE TABLE IF NOT EXISTS public.embed_job (
+    id          text PRIMARY KEY,
+    model       text NOT NULL,                    -- '768' 또는 '1536'
+    full_run    boolean NOT NULL DEFAULT false,
+    status      text NOT NULL DEFAULT 'PENDING',  -- PENDING, RUNNING, CANCELLING, CANCELLED, DONE, FAILED
+    total       integer NOT NULL DEFAULT 0,
+    processed   integer NOT NULL DEFAULT 0,
+    updated     integer NOT NULL DEFAULT 0,
+    failed_ids  integer[] NOT NULL DEFAULT '{}',
+    last_id     integer,                          -- 마지막으로 커밋된 배치의 최대 id (재개 지점)
+    run_base    integer NOT NULL DEFAULT 0,       -- 이번 실행 시작 시점의 processed (처리 속도 계산용)
+    error       text,
+    created_at  timestamptz NOT NULL DEFAULT now(),
+    started_at  timestamptz,
+    updated_at  timestamptz NOT NULL DEFAULT now(),
+    finished_at timestamptz
+);
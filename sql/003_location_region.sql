@@ -0,0 +1,17 @@
+-- 지역(place) 검색용 정규화 컬럼 : 검색할 때마다 REGEXP_REPLACE로 location을 변환하지 않고 저장 시점에 한 번만 계산
+-- 파이썬 search_conditions.normalize_region과 같은 순서로 치환해야 함
+CREATE OR REPLACE FUNCTION public.normalize_region(region text)
+RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT replace(replace(replace(replace(btrim(region), '특별자치도', '도'), '특별자치시', '시'), '특별시', '시'), '광역시', '시')
+$$;
+
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS loc_norm text
+    GENERATED ALWAYS AS (public.normalize_region(location)) STORED;            -- 예) 서울시 강남구 역삼동
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS loc_sido text
+    GENERATED ALWAYS AS (split_part(public.normalize_region(location), ' ', 1)) STORED;  -- 예) 서울시
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS loc_sigungu text
+    GENERATED ALWAYS AS (split_part(public.normalize_region(location), ' ', 2)) STORED; -- 예) 강남구
+
+CREATE INDEX IF NOT EXISTS jobs1_loc_sido_sigungu_idx ON public.jobs1 (loc_sido, loc_sigungu) WHERE status = 'ACTIVE';
+CREATE INDEX IF NOT EXISTS jobs1_loc_norm_idx ON public.jobs1 (loc_norm text_pattern_ops) WHERE status = 'ACTIVE';
+ANALYZE public.jobs1;
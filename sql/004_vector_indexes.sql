@@ -0,0 +1,8 @@
+-- 하이브리드 검색 ann 모드(HYBRID_SEARCH_MODE=ann)용 HNSW 인덱스 (코사인 거리 <=>)
+-- 검색 쿼리와 같은 조건(status = 'ACTIVE')의 부분 인덱스
+CREATE INDEX IF NOT EXISTS jobs1_embedding768_hnsw_idx ON public.jobs1
+    USING hnsw (embedding768 vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE status = 'ACTIVE';
+CREATE INDEX IF NOT EXISTS jobs1_embedding1536_hnsw_idx ON public.jobs1
+    USING hnsw (embedding1536 vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE status = 'ACTIVE';
@@ -0,0 +1,20 @@
+-- jobs1 변경 알림 : 검색 결과 캐시(sql_search) 무효화용
+-- 검색 결과에 영향을 주는 컬럼만 대상 (임베딩 재생성 UPDATE로는 캐시를 비우지 않음)
+CREATE OR REPLACE FUNCTION public.jobs1_notify_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('jobs1_changed', TG_OP);
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS jobs1_notify_changed ON public.jobs1;
+CREATE TRIGGER jobs1_notify_changed
+    AFTER INSERT OR DELETE OR UPDATE OF company, title, location, hourly_wage, work_days, start_time, end_time,
+                                        category, gender, age, description, deadline, status, created_at
+    ON public.jobs1
+    FOR EACH STATEMENT EXECUTE FUNCTION public.jobs1_notify_changed();
+
+DROP TRIGGER IF EXISTS jobs1_notify_truncated ON public.jobs1;
+CREATE TRIGGER jobs1_notify_truncated
+    AFTER TRUNCATE ON public.jobs1
+    FOR EACH STATEMENT EXECUTE FUNCTION public.jobs1_notify_changed();
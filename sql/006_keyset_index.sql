@@ -0,0 +1,2 @@
+-- sql_search 키셋 페이지네이션 정렬(created_at DESC, id DESC)용 인덱스
+CREATE INDEX IF NOT EXISTS jobs1_active_created_id_idx ON public.jobs1 (created_at DESC, id DESC) WHERE status = 'ACTIVE';
@@ -0,0 +1,17 @@
+-- category 변경 알림 : 워커별 참조 데이터 레지스트리(service/refdata.py) 다시 로드용
+CREATE OR REPLACE FUNCTION public.category_notify_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('category_changed', TG_OP);
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS category_notify_changed ON public.category;
+CREATE TRIGGER category_notify_changed
+    AFTER INSERT OR UPDATE OR DELETE ON public.category
+    FOR EACH STATEMENT EXECUTE FUNCTION public.category_notify_changed();
+
+DROP TRIGGER IF EXISTS category_notify_truncated ON public.category;
+CREATE TRIGGER category_notify_truncated
+    AFTER TRUNCATE ON public.category
+    FOR EACH STATEMENT EXECUTE FUNCTION public.category_notify_changed();
@@ -0,0 +1,44 @@
+-- 양자화 임베딩 사본 (pgvector 0.7 이상) : VECTOR_STORAGE=halfvec 또는 bit 일 때 하이브리드 검색 1단계(후보 추출)에 사용
+-- halfvec : float16 (인덱스 크기 절반), bit : 부호만 남긴 이진 양자화 (인덱스 크기 1/32, 해밍 거리)
+-- 후보를 뽑은 뒤 원본 vector 컬럼으로 정확한 유사도를 다시 계산(rerank)하므로 원본 컬럼은 그대로 유지
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS embedding768_half halfvec(768);
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS embedding768_bit bit(768);
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS embedding1536_half halfvec(1536);
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS embedding1536_bit bit(1536);
+
+-- 원본 임베딩이 저장될 때마다 사본 갱신 (관리자 재임베딩, 자동 재임베딩, 외부 UPDATE 모두 해당)
+CREATE OR REPLACE FUNCTION public.jobs1_quantize_embeddings() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.embedding768_half := NEW.embedding768::halfvec(768);
+    NEW.embedding768_bit := binary_quantize(NEW.embedding768)::bit(768);
+    NEW.embedding1536_half := NEW.embedding1536::halfvec(1536);
+    NEW.embedding1536_bit := binary_quantize(NEW.embedding1536)::bit(1536);
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS jobs1_quantize_embeddings ON public.jobs1;
+CREATE TRIGGER jobs1_quantize_embeddings
+    BEFORE INSERT OR UPDATE OF embedding768, embedding1536 ON public.jobs1
+    FOR EACH ROW EXECUTE FUNCTION public.jobs1_quantize_embeddings();
+
+-- 기존 행 채우기 (이미 채워진 행은 건너뜀)
+UPDATE public.jobs1
+   SET embedding768 = embedding768, embedding1536 = embedding1536
+ WHERE (embedding768 IS NOT NULL AND embedding768_half IS NULL)
+    OR (embedding1536 IS NOT NULL AND embedding1536_half IS NULL);
+
+-- 사본별 HNSW 인덱스 (검색 쿼리와 같은 status = 'ACTIVE' 부분 인덱스)
+-- 양자화 모드만 쓴다면 004의 원본 vector HNSW 인덱스는 삭제해도 됨 (rerank는 후보 행만 읽음)
+CREATE INDEX IF NOT EXISTS jobs1_embedding768_half_hnsw_idx ON public.jobs1
+    USING hnsw (embedding768_half halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE status = 'ACTIVE';
+CREATE INDEX IF NOT EXISTS jobs1_embedding1536_half_hnsw_idx ON public.jobs1
+    USING hnsw (embedding1536_half halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE status = 'ACTIVE';
+CREATE INDEX IF NOT EXISTS jobs1_embedding768_bit_hnsw_idx ON public.jobs1
+    USING hnsw (embedding768_bit bit_hamming_ops) WITH (m = 16, ef_construction = 64)
+    WHERE status = 'ACTIVE';
+CREATE INDEX IF NOT EXISTS jobs1_embedding1536_bit_hnsw_idx ON public.jobs1
+    USING hnsw (embedding1536_bit bit_hamming_ops) WITH (m = 16, ef_construction = 64)
+    WHERE status = 'ACTIVE';
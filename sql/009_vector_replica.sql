@@ -0,0 +1,50 @@
+-- 프로세스 내 벡터 인덱스 복제본(service/vector_replica.py) 갱신용
+-- vec_changed_at : 복제본에 들어가는 컬럼(벡터, 필터 컬럼, 상태)이 바뀐 시각 - 알림을 놓쳤을 때 이 시각 이후 행만 다시 읽음
+-- jobs1_vector 알림 : 바뀐 행 id (복제본이 행 단위로 바로 반영)
+ALTER TABLE public.jobs1 ADD COLUMN IF NOT EXISTS vec_changed_at timestamptz NOT NULL DEFAULT now();
+CREATE INDEX IF NOT EXISTS jobs1_vec_changed_at_idx ON public.jobs1 (vec_changed_at);
+
+CREATE OR REPLACE FUNCTION public.jobs1_touch_vec_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.vec_changed_at := clock_timestamp();
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS jobs1_touch_vec_changed ON public.jobs1;
+CREATE TRIGGER jobs1_touch_vec_changed
+    BEFORE UPDATE OF embedding768, embedding1536, status, location, hourly_wage, work_days,
+                     start_time, end_time, category, gender, age
+    ON public.jobs1
+    FOR EACH ROW EXECUTE FUNCTION public.jobs1_touch_vec_changed();
+
+CREATE OR REPLACE FUNCTION public.jobs1_notify_vector() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('jobs1_vector', OLD.id::text);
+    ELSE
+        PERFORM pg_notify('jobs1_vector', NEW.id::text);
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS jobs1_notify_vector ON public.jobs1;
+CREATE TRIGGER jobs1_notify_vector
+    AFTER INSERT OR DELETE OR UPDATE OF embedding768, embedding1536, status, location, hourly_wage, work_days,
+                                        start_time, end_time, category, gender, age
+    ON public.jobs1
+    FOR EACH ROW EXECUTE FUNCTION public.jobs1_notify_vector();
+
+-- TRUNCATE는 행 단위 알림이 없으므로 복제본 전체를 다시 만듦 (payload '*')
+CREATE OR REPLACE FUNCTION public.jobs1_notify_vector_truncated() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('jobs1_vector', '*');
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS jobs1_notify_vector_truncated ON public.jobs1;
+CREATE TRIGGER jobs1_notify_vector_truncated
+    AFTER TRUNCATE ON public.jobs1
+    FOR EACH STATEMENT EXECUTE FUNCTION public.jobs1_notify_vector_truncated();
@@ -0,0 +1,8 @@
+-- jobs1_changed 알림 대상 컬럼에 qualifications 추가 : 일자리 상세 조회 캐시(service/job_detail.py) 무효화용
+-- (검색 결과 목록에는 없는 컬럼이지만 상세 응답에는 포함됨)
+DROP TRIGGER IF EXISTS jobs1_notify_changed ON public.jobs1;
+CREATE TRIGGER jobs1_notify_changed
+    AFTER INSERT OR DELETE OR UPDATE OF company, title, location, hourly_wage, work_days, start_time, end_time,
+                                        category, gender, age, description, qualifications, deadline, status, created_at
+    ON public.jobs1
+    FOR EACH STATEMENT EXECUTE FUNCTION public.jobs1_notify_changed();